@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark der Kodierungen für die Datendatei.
+
+Misst Speichern (kodieren + schreiben), Laden (lesen + dekodieren) und
+Dateigröße für jede Kodierung aus storage_encoding.
+
+Aufruf:
+    python benchmarks/bench_encodings.py [--wiederholungen N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import erzeuge_daten
+
+from storage_encoding import ENCODINGS, encode, read_file
+
+GROESSEN = (10, 1_000, 50_000)
+
+
+def messe(funktion, wiederholungen):
+    """Bester Wert in Millisekunden aus mehreren Läufen."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wiederholungen", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for anzahl in GROESSEN:
+            daten = erzeuge_daten(anzahl)
+            print(f"\n{anzahl} Anlagen ({len(daten['kunden'])} Kunden)")
+            print(f"{'Kodierung':<14}{'Speichern ms':>14}{'Laden ms':>12}{'Größe KiB':>12}{'Faktor':>9}")
+
+            basis = None
+            for encoding in ENCODINGS:
+                pfad = Path(tmp) / f"daten_{encoding}"
+
+                def speichern():
+                    pfad.write_bytes(encode(daten, encoding))
+
+                speichern_ms = messe(speichern, args.wiederholungen)
+                laden_ms = messe(lambda: read_file(pfad), args.wiederholungen)
+                groesse = pfad.stat().st_size
+                basis = basis or groesse
+                assert read_file(pfad) == daten
+
+                print(f"{encoding:<14}{speichern_ms:>14.2f}{laden_ms:>12.2f}"
+                      f"{groesse / 1024:>12.1f}{groesse / basis:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
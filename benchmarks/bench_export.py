@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: ODS-Exporte pro Sekunde für viele Anlagen mit gleichen Settings.
+
+Gemessen wird nur das Schreiben der ODS-Datei (ods_manual.write_ods) in
+einen verwerfenden Stream. Validierung und Zeilenmodell werden vorher
+einmal erzeugt, Export-Manifest und Validierungs-Cache sind damit in
+keinem der beiden Durchläufe beteiligt:
+
+"kalt"  – Cache der statischen ODF-Teile vor jedem Export geleert
+          (Manifest, styles.xml-Rahmen und automatische Styles werden
+          jedes Mal neu erzeugt und serialisiert)
+"warm"  – statische Teile kommen ab dem zweiten Export aus dem Cache
+
+Aufruf:
+    python benchmarks/bench_export.py [--anlagen N] [--wiederholungen N]
+"""
+
+import argparse
+import random
+import time
+
+from synthetic import erzeuge_text_inhalt
+
+import ods_manual
+from odf_exporter import _anlage_daten, _anlage_footer
+
+SETTINGS = {'spalten_breite': 1.75, 'zellen_umrandung': True, 'linebreak_char': ';'}
+
+
+def erzeuge_anlagen(anzahl, seed=42):
+    rng = random.Random(seed)
+    return [{
+        'id': str(i),
+        'beschreibung': f'Verteiler {i}',
+        'code': f'V{i:04d}',
+        'felder': 3,
+        'reihen': 7,
+        'text_inhalt': erzeuge_text_inhalt(rng, 3, 7),
+    } for i in range(1, anzahl + 1)]
+
+
+class Verwerfen:
+    """Binärer Stream, der nur die Länge zählt."""
+
+    def __init__(self):
+        self.laenge = 0
+
+    def write(self, daten):
+        self.laenge += len(daten)
+        return len(daten)
+
+    def flush(self):
+        pass
+
+
+def exportiere(vorbereitet, kalt):
+    for data, footer_data in vorbereitet:
+        if kalt:
+            ods_manual._statische_teile.clear()
+        ods_manual.write_ods(Verwerfen(), data, SETTINGS, footer_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--anlagen', type=int, default=200)
+    parser.add_argument('--wiederholungen', type=int, default=3)
+    args = parser.parse_args()
+
+    vorbereitet = [(_anlage_daten(anlage), _anlage_footer(anlage, 'Benchmark', 'Projekt', ''))
+                   for anlage in erzeuge_anlagen(args.anlagen)]
+    print(f"{args.anlagen} Anlagen (3 Felder × 7 Reihen)")
+    print(f"{'':<8}{'ms':>10}{'Exporte/s':>14}")
+    zeiten = {}
+    for name, kalt in (('kalt', True), ('warm', False)):
+        beste = float('inf')
+        for _ in range(args.wiederholungen):
+            start = time.perf_counter()
+            exportiere(vorbereitet, kalt)
+            beste = min(beste, time.perf_counter() - start)
+        zeiten[name] = beste
+        print(f"{name:<8}{beste * 1000:>10.1f}{args.anlagen / beste:>14,.0f}")
+    ersparnis = 1 - zeiten['warm'] / zeiten['kalt']
+    print(f"Ersparnis durch den Cache der statischen Teile: {ersparnis:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: Zeilen pro Sekunde beim Parsen von Beschriftungen.
+
+"alt"  – bisheriges Paar parse_zeile + parse_spalten (re.match ohne
+         vorkompiliertes Muster, split() und int() mit Ausnahmen)
+"neu"  – label_parser.tokenize_zeile (ein kompilierter Ausdruck pro Zeile)
+
+Die Eingabe besteht aus synthetischen Beschriftungen mit einem Anteil
+fehlerhafter Zeilen (--fehleranteil).
+
+Aufruf:
+    python benchmarks/bench_label_parser.py [--zeilen N] [--fehleranteil X] [--wiederholungen N]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from synthetic import erzeuge_text_inhalt
+
+from label_parser import tokenize_zeile
+
+FEHLERZEILEN = ("Licht ohne Spalte", "5-3 Rückwärts", "1+2+3 Doppelt", "-4 Negativ", "7- offen")
+
+
+def parse_zeile_alt(zeile):
+    zeile = zeile.strip()
+    if not zeile:
+        return None
+    match = re.match(r'([\d\-\+]+)[\s\t;]*(.*)', zeile)
+    if match:
+        spalten_str = match.group(1).strip()
+        beschreibung = match.group(2).strip()
+        if spalten_str:
+            return {'spalten': spalten_str, 'beschreibung': beschreibung}
+    return None
+
+
+def parse_spalten_alt(spalten_str):
+    try:
+        if '+' in spalten_str:
+            start, anzahl = map(int, spalten_str.split('+'))
+            return range(start, start + anzahl + 1)
+        elif '-' in spalten_str:
+            start, ende = map(int, spalten_str.split('-'))
+            return range(start, ende + 1) if start <= ende else None
+        else:
+            start = int(spalten_str)
+            return range(start, start + 1)
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_alt(zeilen):
+    ergebnis = []
+    for zeile in zeilen:
+        parsed = parse_zeile_alt(zeile)
+        ergebnis.append(parse_spalten_alt(parsed['spalten']) if parsed else None)
+    return ergebnis
+
+
+def parse_neu(zeilen):
+    ergebnis = []
+    for zeile in zeilen:
+        eintrag = tokenize_zeile(zeile)
+        ergebnis.append(eintrag.spalten if eintrag else None)
+    return ergebnis
+
+
+def erzeuge_zeilen(anzahl, fehleranteil, seed=42):
+    rng = random.Random(seed)
+    zeilen = []
+    while len(zeilen) < anzahl:
+        for zeile in erzeuge_text_inhalt(rng, 4, 7).split('\n'):
+            zeilen.append(rng.choice(FEHLERZEILEN) if rng.random() < fehleranteil else zeile)
+    return zeilen[:anzahl]
+
+
+def messe(funktion, wiederholungen):
+    beste = float('inf')
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--zeilen', type=int, default=100_000)
+    parser.add_argument('--fehleranteil', type=float, default=0.02)
+    parser.add_argument('--wiederholungen', type=int, default=5)
+    args = parser.parse_args()
+
+    zeilen = erzeuge_zeilen(args.zeilen, args.fehleranteil)
+    assert parse_alt(zeilen) == [s or None for s in parse_neu(zeilen)]
+
+    print(f"{args.zeilen} Zeilen, Fehleranteil {args.fehleranteil:.0%}")
+    print(f"{'':<8}{'ms':>10}{'Zeilen/s':>14}")
+    for name, funktion in (('alt', parse_alt), ('neu', parse_neu)):
+        dauer = messe(lambda: funktion(zeilen), args.wiederholungen)
+        print(f"{name:<8}{dauer * 1000:>10.1f}{args.zeilen / dauer:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
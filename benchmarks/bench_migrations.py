@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: Laden einer großen Datendatei vor und nach der Schema-Versionierung.
+
+"alt"  – bisheriger Ablauf: JSON laden, bei jedem Kunden next_anlage_id
+         prüfen, bei jeder Anlage teile_text/teile_parsed entfernen (Kopie).
+"neu"  – Datei mit aktueller schema_version: laden, Versionsvergleich,
+         keine Prüfungen pro Datensatz.
+
+Beide Varianten werden einmal ohne und einmal mit Hydrierung in
+Kunde/Anlage-Dataclasses gemessen.
+
+Aufruf:
+    python benchmarks/bench_migrations.py [--anlagen N] [--wiederholungen N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import erzeuge_daten
+
+from migrations import SCHEMA_VERSION, migrate
+from models import Anlage, Kunde
+from storage_encoding import encode, read_file
+
+
+def laden_alt(pfad):
+    with open(pfad, 'r', encoding='utf-8') as f:
+        all_data = json.load(f)
+    all_customers = all_data.get('kunden', {})
+    for customer_data in all_customers.values():
+        if 'next_anlage_id' not in customer_data:
+            max_id = max((a.get('id', 0) for a in customer_data.get('anlagen', [])), default=0)
+            customer_data['next_anlage_id'] = max_id + 1
+    return all_customers
+
+
+def hydrieren_alt(all_customers):
+    kunden = {}
+    for name, d in all_customers.items():
+        anlagen = []
+        for a in d.get('anlagen', []):
+            a = a.copy()
+            a.pop('teile_text', None)
+            a.pop('teile_parsed', None)
+            anlagen.append(Anlage(**a))
+        kunden[name] = Kunde(**{k: v for k, v in d.items() if k != 'anlagen'}, anlagen=anlagen)
+    return kunden
+
+
+def laden_neu(pfad):
+    all_data = read_file(pfad)
+    migrate(all_data)  # aktuelle Version: sofortige Rückkehr
+    return all_data.get('kunden', {})
+
+
+def hydrieren_neu(all_customers):
+    return {
+        name: Kunde(**{k: v for k, v in d.items() if k != 'anlagen'},
+                    anlagen=[Anlage(**a) for a in d.get('anlagen', [])])
+        for name, d in all_customers.items()
+    }
+
+
+def messe(funktion, wiederholungen):
+    beste = float('inf')
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--anlagen', type=int, default=50_000)
+    parser.add_argument('--wiederholungen', type=int, default=3)
+    args = parser.parse_args()
+
+    daten = erzeuge_daten(args.anlagen)
+    alt = {'kunden': daten['kunden'], 'next_kunden_id': daten['next_kunden_id']}
+    neu = dict(alt, schema_version=SCHEMA_VERSION)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pfad_alt = Path(tmp) / 'alt.json'
+        pfad_neu = Path(tmp) / 'neu.json'
+        pfad_alt.write_bytes(encode(alt))
+        pfad_neu.write_bytes(encode(neu))
+
+        print(f"{args.anlagen} Anlagen ({len(daten['kunden'])} Kunden), Schema-Version {SCHEMA_VERSION}")
+        print(f"{'':<22}{'alt ms':>10}{'neu ms':>10}")
+        print(f"{'Laden':<22}{messe(lambda: laden_alt(pfad_alt), args.wiederholungen):>10.1f}"
+              f"{messe(lambda: laden_neu(pfad_neu), args.wiederholungen):>10.1f}")
+        print(f"{'Laden + Hydrieren':<22}"
+              f"{messe(lambda: hydrieren_alt(laden_alt(pfad_alt)), args.wiederholungen):>10.1f}"
+              f"{messe(lambda: hydrieren_neu(laden_neu(pfad_neu)), args.wiederholungen):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
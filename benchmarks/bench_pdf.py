@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: PDF-Streifen für alle Anlagen eines Kunden (pdf_renderer).
+
+Misst Validierung + Zeilenmodell + PDF-Erzeugung für einen Kunden mit
+--anlagen Anlagen, geschrieben in einen verwerfenden Stream.
+
+Aufruf:
+    python benchmarks/bench_pdf.py [--anlagen N] [--felder N] [--reihen N] [--wiederholungen N]
+"""
+
+import argparse
+import random
+import time
+
+from synthetic import erzeuge_text_inhalt
+
+from constants import DEFAULT_SETTINGS
+from odf_exporter import _kunde_sheets, validierungs_cache
+from pdf_renderer import write_pdf
+
+
+class Verwerfen:
+    """Binärer Stream, der nur die Länge zählt."""
+
+    def __init__(self):
+        self.laenge = 0
+
+    def write(self, daten):
+        self.laenge += len(daten)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--anlagen', type=int, default=30)
+    parser.add_argument('--felder', type=int, default=3)
+    parser.add_argument('--reihen', type=int, default=7)
+    parser.add_argument('--wiederholungen', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    kunde = {'projekt': 'Projekt', 'anlagen': [{
+        'id': str(i),
+        'beschreibung': f'Verteiler {i}',
+        'code': f'V{i:04d}',
+        'felder': args.felder,
+        'reihen': args.reihen,
+        'text_inhalt': erzeuge_text_inhalt(rng, args.felder, args.reihen),
+    } for i in range(1, args.anlagen + 1)]}
+
+    beste, groesse = float('inf'), 0
+    for _ in range(args.wiederholungen):
+        validierungs_cache.invalidate()
+        out = Verwerfen()
+        start = time.perf_counter()
+        write_pdf(out, _kunde_sheets(kunde, 'Benchmark', 'Kunde_Benchmark.pdf'), DEFAULT_SETTINGS)
+        beste = min(beste, time.perf_counter() - start)
+        groesse = out.laenge
+
+    print(f"{args.anlagen} Anlagen ({args.felder} Felder × {args.reihen} Reihen)")
+    print(f"{beste * 1000:.1f} ms, {groesse / 1024:,.0f} KiB PDF")
+
+
+if __name__ == '__main__':
+    main()
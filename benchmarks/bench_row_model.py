@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: Zeilenmodell für den ODS-Export großer Anlagen.
+
+"alt"  – bisheriges Modell: komplette Liste mit einem Dict je Zeile und
+         je Zelle, beim Schreiben mit .get nachgeschlagen
+"neu"  – odf_exporter.convert_anlage_to_manual_format (Generator von
+         (ist_kopf, zellen) mit Zellen als Tupel)
+
+Gemessen wird Modell erzeugen + content.xml schreiben (in einen
+verwerfenden Stream): beste Zeit und Spitzen-Speicher (tracemalloc).
+
+Aufruf:
+    python benchmarks/bench_row_model.py [--felder N] [--reihen N] [--wiederholungen N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from synthetic import erzeuge_text_inhalt
+
+import ods_manual
+from constants import COLUMNS_PER_UNIT
+from odf_exporter import _validiere_anlage, convert_anlage_to_manual_format
+from xml_stream import XmlStreamWriter
+
+SETTINGS = {'spalten_breite': 1.75, 'zellen_umrandung': True, 'linebreak_char': ';'}
+
+
+class Verwerfen:
+    """Binärer Stream, der nur die Länge zählt."""
+
+    def __init__(self):
+        self.laenge = 0
+
+    def write(self, daten):
+        self.laenge += len(daten)
+
+
+def convert_alt(anlage, gueltige_eintraege, felder, reihen):
+    spalten_map = {}
+    for beschr in gueltige_eintraege:
+        spalten_map[beschr['spalten_liste'][0]] = {
+            'beschreibung': beschr['beschreibung'],
+            'anzahl': len(beschr['spalten_liste'])
+        }
+    rows = []
+    globale_spalten_start = 1
+    for _feld in range(felder):
+        for _reihe in range(reihen):
+            rows.append({
+                'is_header': True,
+                'cells': [{'text': str(globale_spalten_start + i), 'style': 'ce1', 'colspan': 1}
+                          for i in range(COLUMNS_PER_UNIT)],
+            })
+            inhalt_cells = []
+            zaehler = 0
+            while zaehler < COLUMNS_PER_UNIT:
+                nr = globale_spalten_start + zaehler
+                if nr in spalten_map:
+                    eintrag = spalten_map[nr]
+                    anzahl = min(eintrag['anzahl'], COLUMNS_PER_UNIT - zaehler)
+                    inhalt_cells.append({'text': eintrag['beschreibung'], 'style': 'ce2',
+                                         'colspan': anzahl})
+                    zaehler += anzahl
+                else:
+                    inhalt_cells.append({'text': '', 'style': 'ce3', 'colspan': 1})
+                    zaehler += 1
+            rows.append({'is_header': False, 'cells': inhalt_cells})
+            globale_spalten_start += COLUMNS_PER_UNIT
+    return {'name': anlage['beschreibung'], 'num_cols': COLUMNS_PER_UNIT, 'rows': rows}
+
+
+def write_table_alt(w, data, settings):
+    """Zeilen-Schleife von _write_table auf dem Dict-Modell (ohne Watermark)."""
+    w.start('table:table', {'table:name': data.get('name', 'Tabelle1'), 'table:style-name': 'ta1'})
+    for _i in range(data.get('num_cols', 12)):
+        w.element('table:table-column', {'table:style-name': 'co1'})
+    linebreak_char = settings.get('linebreak_char', ';')
+    for row_data in data.get('rows', []):
+        w.start('table:table-row', {'table:style-name': 'ro1' if row_data.get('is_header', False) else 'ro2'})
+        for cell_data in row_data.get('cells', []):
+            cell_attribs = {'table:style-name': cell_data.get('style', 'ce3')}
+            colspan = cell_data.get('colspan', 1)
+            if colspan > 1:
+                cell_attribs['table:number-columns-spanned'] = str(colspan)
+            w.start('table:table-cell', cell_attribs)
+            cell_text = cell_data.get('text')
+            if cell_text:
+                if linebreak_char and linebreak_char in cell_text:
+                    for line in cell_text.split(linebreak_char):
+                        w.element('text:p', text=line.strip())
+                else:
+                    w.element('text:p', text=cell_text)
+            w.end()
+            for _i in range(colspan - 1):
+                w.element('table:covered-table-cell')
+        w.end()
+    w.end()
+
+
+def lauf_alt(anlage, gueltige):
+    data = convert_alt(anlage, gueltige, anlage['felder'], anlage['reihen'])
+    w = XmlStreamWriter(Verwerfen())
+    write_table_alt(w, data, SETTINGS)
+    w.close()
+
+
+def lauf_neu(anlage, gueltige):
+    data = convert_anlage_to_manual_format(anlage, gueltige, anlage['felder'], anlage['reihen'])
+    w = XmlStreamWriter(Verwerfen())
+    ods_manual._write_table(w, data, SETTINGS)
+    w.close()
+
+
+def messe(lauf, anlage, gueltige, wiederholungen):
+    beste = float('inf')
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        lauf(anlage, gueltige)
+        beste = min(beste, time.perf_counter() - start)
+    tracemalloc.start()
+    lauf(anlage, gueltige)
+    _aktuell, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return beste, spitze
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--felder', type=int, default=40)
+    parser.add_argument('--reihen', type=int, default=50)
+    parser.add_argument('--wiederholungen', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    anlage = {
+        'id': '1',
+        'beschreibung': 'Großverteiler',
+        'felder': args.felder,
+        'reihen': args.reihen,
+        'text_inhalt': erzeuge_text_inhalt(rng, args.felder, args.reihen),
+    }
+    _ok, gueltige = _validiere_anlage(anlage)
+
+    print(f"{args.felder} Felder × {args.reihen} Reihen ({2 * args.felder * args.reihen} Zeilen)")
+    print(f"{'':<6}{'ms':>10}{'Spitze KiB':>14}")
+    for name, lauf in (('alt', lauf_alt), ('neu', lauf_neu)):
+        beste, spitze = messe(lauf, anlage, gueltige, args.wiederholungen)
+        print(f"{name:<6}{beste * 1000:>10.1f}{spitze / 1024:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
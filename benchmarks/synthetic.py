@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Synthetische Datensätze für die Benchmarks (Struktur wie Verteiler_Daten.json)."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from models import Anlage, Kunde, kunde_to_dict  # noqa: E402
+
+BEZEICHNUNGEN = ["Licht", "Steckdosen", "Herd", "Backofen", "Waschmaschine",
+                 "Trockner", "Spülmaschine", "Heizung", "Außenbeleuchtung", "Reserve"]
+
+
+def erzeuge_text_inhalt(rng, felder, reihen):
+    """Beschriftungszeilen im Format 'Spalten Beschreibung'."""
+    zeilen = []
+    spalte = 1
+    # Verteiler sind selten voll belegt
+    max_spalte = int(felder * reihen * 12 * rng.uniform(0.2, 0.6))
+    while spalte <= max_spalte:
+        breite = rng.choice((1, 1, 1, 2, 3))
+        ende = min(spalte + breite - 1, max_spalte)
+        spalten = str(spalte) if ende == spalte else f"{spalte}-{ende}"
+        zeilen.append(f"{spalten} {rng.choice(BEZEICHNUNGEN)} {rng.randint(1, 99)}")
+        spalte = ende + 1 + rng.choice((0, 0, 1))
+    return "\n".join(zeilen)
+
+
+def erzeuge_daten(anzahl_anlagen, anlagen_pro_kunde=50, seed=42):
+    """Erzeugt Kundendaten mit insgesamt anzahl_anlagen Anlagen.
+
+    Returns:
+        dict: {'kunden': {...}, 'next_kunden_id': int}
+    """
+    rng = random.Random(seed)
+    kunden = {}
+    kunde_id = 1
+    rest = anzahl_anlagen
+    while rest > 0:
+        anzahl = min(rest, anlagen_pro_kunde)
+        anlagen = []
+        for anlage_id in range(1, anzahl + 1):
+            felder, reihen = rng.choice(((2, 4), (3, 7), (4, 7)))
+            anlagen.append(Anlage(
+                id=anlage_id,
+                beschreibung=f"Verteiler {anlage_id}",
+                raum=f"Raum {rng.randint(1, 30)}",
+                gebaeude=rng.choice(("Haus A", "Haus B", "Halle")),
+                geschoss=rng.choice(("KG", "EG", "OG1", "OG2")),
+                zaehlernummer=f"{rng.randint(10**7, 10**8 - 1)}",
+                code=f"UV-{kunde_id}-{anlage_id}",
+                felder=felder,
+                reihen=reihen,
+                text_inhalt=erzeuge_text_inhalt(rng, felder, reihen),
+            ))
+        kunde = Kunde(id=kunde_id, projekt=f"Projekt {kunde_id}", datum="2026-01-01",
+                      ort="Musterstadt", anlagen=anlagen, next_anlage_id=anzahl + 1)
+        kunden[f"Kunde {kunde_id}"] = kunde_to_dict(kunde)
+        kunde_id += 1
+        rest -= anzahl
+    return {'kunden': kunden, 'next_kunden_id': kunde_id}
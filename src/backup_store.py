@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Inhaltsadressierter Backup-Speicher mit Deduplizierung.
+
+Layout im Backup-Verzeichnis:
+
+    objekte/<2 Zeichen>/<sha256>   # Ein Kunde bzw. die Einstellungen, gzip-JSON
+    sicherungen/<id>.json          # Manifest: Kundenname → Hash, next_kunden_id, ...
+
+Ein Backup schreibt nur Objekte, deren Inhalt es noch nicht gibt, plus ein
+kleines Manifest. Unveränderte Kunden kosten damit weder Platz noch (dank
+Cache über die Dict-Identität, siehe models.kunde_to_dict_cached) Zeit.
+prune() löscht Sicherungen nach Aufbewahrungsregeln, gc() danach alle
+nicht mehr referenzierten Objekte.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+from storage_encoding import ENCODING_GZIP, encode, read_file
+from storage_sharded import atomic_write_bytes, atomic_write_json
+
+OBJEKT_DIRNAME = 'objekte'
+MANIFEST_DIRNAME = 'sicherungen'
+
+_HASH_MUSTER = re.compile(r'[0-9a-f]{64}')
+
+
+class BackupStore:
+    """Sicherungen als Manifeste über deduplizierte Objekte."""
+
+    def __init__(self, backup_dir):
+        """Initialisiert den Speicher.
+
+        Args:
+            backup_dir (Path): Backup-Verzeichnis (wird bei Bedarf angelegt)
+        """
+        self.backup_dir = Path(backup_dir)
+        self.objekt_dir = self.backup_dir / OBJEKT_DIRNAME
+        self.manifest_dir = self.backup_dir / MANIFEST_DIRNAME
+        self._hash_cache = {}  # Name → (Daten-Objekt, Hash) der letzten Sicherung
+
+    # ==================== Sichern ====================
+
+    def create(self, all_customers, next_customer_id, settings=None, schema_version=None):
+        """Legt eine Sicherung an.
+
+        Args:
+            all_customers (dict): Alle Kundendaten (Name → dict)
+            next_customer_id (int): Nächste freie Kunden-ID
+            settings (dict, optional): Einstellungen, die mitgesichert werden
+            schema_version (int, optional): Schema-Version der Kundendaten
+
+        Returns:
+            dict: Manifest der Sicherung, zusätzlich mit 'neue_objekte' und
+                'neue_bytes' (Umfang dieser Sicherung)
+        """
+        self.objekt_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        statistik = {'neue_objekte': 0, 'neue_bytes': 0}
+
+        hash_cache = {}
+        kunden = []
+        for name, customer_data in all_customers.items():
+            eintrag = self._hash_cache.get(name)
+            if eintrag is None or eintrag[0] is not customer_data:
+                eintrag = (customer_data, self._put(customer_data, statistik))
+            hash_cache[name] = eintrag
+            kunden.append([name, eintrag[1]])
+        self._hash_cache = hash_cache
+
+        jetzt = datetime.now()
+        manifest = {
+            'id': self._neue_id(jetzt),
+            'erstellt': jetzt.isoformat(timespec='seconds'),
+            'kunden': kunden,
+            'next_kunden_id': next_customer_id,
+            'einstellungen': self._put(settings, statistik) if settings is not None else None,
+        }
+        if schema_version is not None:
+            manifest['schema_version'] = schema_version
+
+        atomic_write_json(self.manifest_dir / f"{manifest['id']}.json", manifest)
+        return dict(manifest, **statistik)
+
+    def _put(self, obj, statistik):
+        """Speichert ein Objekt unter seinem Inhalts-Hash (falls neu)."""
+        kanonisch = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(kanonisch).hexdigest()
+        pfad = self._objekt_pfad(digest)
+        if not pfad.exists():
+            pfad.parent.mkdir(parents=True, exist_ok=True)
+            daten = encode(obj, ENCODING_GZIP)
+            atomic_write_bytes(pfad, daten)
+            statistik['neue_objekte'] += 1
+            statistik['neue_bytes'] += len(daten)
+        return digest
+
+    def _objekt_pfad(self, digest):
+        return self.objekt_dir / digest[:2] / digest
+
+    def _neue_id(self, jetzt):
+        basis = jetzt.strftime('%Y%m%d_%H%M%S')
+        sicherung_id, zaehler = basis, 2
+        while (self.manifest_dir / f'{sicherung_id}.json').exists():
+            sicherung_id = f'{basis}_{zaehler}'
+            zaehler += 1
+        return sicherung_id
+
+    # ==================== Auflisten & Wiederherstellen ====================
+
+    def list(self):
+        """Listet alle Sicherungen, neueste zuerst.
+
+        Returns:
+            list: Manifeste (dict mit 'id', 'erstellt', 'kunden', ...)
+        """
+        if not self.manifest_dir.exists():
+            return []
+        manifeste = []
+        for pfad in self.manifest_dir.glob('*.json'):
+            try:
+                with open(pfad, 'r', encoding='utf-8') as f:
+                    manifeste.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Beschädigtes Manifest überspringen
+        manifeste.sort(key=lambda m: (m.get('erstellt', ''), m.get('id', '')), reverse=True)
+        return manifeste
+
+    def get_manifest(self, sicherung_id):
+        """Lädt das Manifest einer Sicherung."""
+        with open(self.manifest_dir / f'{sicherung_id}.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, sicherung_id):
+        """Lädt den Inhalt einer Sicherung.
+
+        Args:
+            sicherung_id (str): ID aus list()
+
+        Returns:
+            tuple: (all_customers: dict, next_customer_id: int, settings: dict oder None)
+        """
+        manifest = self.get_manifest(sicherung_id)
+        all_customers = {
+            name: read_file(self._objekt_pfad(digest)) for name, digest in manifest['kunden']
+        }
+        settings = None
+        if manifest.get('einstellungen'):
+            settings = read_file(self._objekt_pfad(manifest['einstellungen']))
+        return all_customers, manifest.get('next_kunden_id', 1), settings
+
+    # ==================== Aufräumen ====================
+
+    def prune(self, keep_last=10, keep_daily=7, keep_weekly=4):
+        """Löscht Sicherungen nach Aufbewahrungsregeln und räumt Objekte auf.
+
+        Behalten werden die keep_last neuesten Sicherungen, die jeweils neueste
+        der letzten keep_daily Tage und der letzten keep_weekly Wochen (jeweils
+        Tage/Wochen, an denen es Sicherungen gibt).
+
+        Returns:
+            list: IDs der gelöschten Sicherungen
+        """
+        manifeste = self.list()
+        behalten = {m['id'] for m in manifeste[:keep_last]}
+        for anzahl, schluessel in ((keep_daily, self._tag), (keep_weekly, self._woche)):
+            gesehen = []
+            for manifest in manifeste:
+                periode = schluessel(manifest)
+                if periode not in gesehen:
+                    gesehen.append(periode)
+                    if len(gesehen) > anzahl:
+                        break
+                    behalten.add(manifest['id'])
+
+        geloescht = []
+        for manifest in manifeste:
+            if manifest['id'] not in behalten:
+                (self.manifest_dir / f"{manifest['id']}.json").unlink()
+                geloescht.append(manifest['id'])
+        if geloescht:
+            self.gc()
+        return geloescht
+
+    def gc(self):
+        """Löscht Objekte, die von keiner Sicherung mehr referenziert werden.
+
+        Aus einem beschädigten Manifest gelten alle darin lesbaren Hashes als
+        referenziert, damit die Sicherung reparierbar bleibt. Lässt sich ein
+        Manifest gar nicht lesen, wird nichts gelöscht.
+
+        Returns:
+            int: Anzahl gelöschter Objekte
+        """
+        if not self.objekt_dir.exists():
+            return 0
+        referenziert = set()
+        for pfad in self.manifest_dir.glob('*.json'):
+            try:
+                roh = pfad.read_bytes()
+            except OSError:
+                return 0
+            referenziert.update(self._referenzen(roh))
+
+        geloescht = 0
+        for pfad in self.objekt_dir.glob('*/*'):
+            if pfad.name not in referenziert:
+                pfad.unlink()
+                geloescht += 1
+        self._hash_cache = {
+            name: eintrag for name, eintrag in self._hash_cache.items() if eintrag[1] in referenziert
+        }
+        return geloescht
+
+    @staticmethod
+    def _referenzen(roh):
+        """Hashes der Objekte, auf die ein Manifest (Rohdaten) verweist."""
+        try:
+            manifest = json.loads(roh)
+            referenziert = {digest for _name, digest in manifest.get('kunden', [])}
+            if manifest.get('einstellungen'):
+                referenziert.add(manifest['einstellungen'])
+            return referenziert
+        except (ValueError, TypeError, AttributeError):
+            # Beschädigt: alles übernehmen, was wie ein SHA-256-Hash aussieht
+            return set(_HASH_MUSTER.findall(roh.decode('utf-8', 'replace')))
+
+    @staticmethod
+    def _tag(manifest):
+        return manifest.get('erstellt', '')[:10]
+
+    @staticmethod
+    def _woche(manifest):
+        try:
+            jahr, woche, _tag = datetime.fromisoformat(manifest.get('erstellt', '')).isocalendar()
+            return jahr, woche
+        except ValueError:
+            return None
+
+
+if __name__ == "__main__":
+    pass
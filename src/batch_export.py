@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Stapel-Export aller Kunden (ODT je Kunde) und Anlagen (ODS je Anlage).
+
+Auf Wunsch zusätzlich PDF je Anlage sowie ODS/PDF mit allen Anlagen eines
+Kunden in einer Datei (z.B. für den Export über die Kommandozeile,
+siehe verteiler.py).
+
+Jede Datei ist ein unabhängiger Auftrag auf reinen Dicts (kunde_to_dict /
+anlage_to_dict). Die Aufträge werden auf einen ProcessPoolExecutor mit so
+vielen Prozessen wie CPU-Kernen verteilt; die Worker führen nur die
+Export-Module (odf_exporter, ods_manual, odt_manual) aus. Gestartet werden
+sie über 'forkserver' bzw. 'spawn', nie per fork aus der laufenden App:
+ein geforkter Worker erbte sonst Locks, die SaveService- oder Flet-Threads
+gerade halten.
+
+Ergebnisse und Fehler aller Dateien werden in einer Zusammenfassung
+gesammelt – ein fehlerhafter Auftrag bricht den Stapel nicht ab. Wo keine
+Prozesse gestartet werden können (z.B. Android) oder sich Parallelität
+nicht lohnt, läuft derselbe Stapel sequentiell.
+"""
+
+import os
+import time
+from functools import partial
+
+from constants import BATCH_EXPORT_MIN_PARALLEL, ts
+from odf_exporter import (
+    exportiere_anlage_ods,
+    exportiere_anlage_pdf,
+    exportiere_kunde_odt,
+    exportiere_kunde_ods,
+    exportiere_kunde_pdf,
+)
+
+# Auftragsarten
+ART_ODT = 'odt'              # Kunde als Text (ODT)
+ART_ODS = 'ods'              # Anlage als Tabelle (ODS)
+ART_PDF = 'pdf'              # Anlage als PDF-Streifen
+ART_ODS_KUNDE = 'ods-kunde'  # alle Anlagen eines Kunden als eine ODS
+ART_PDF_KUNDE = 'pdf-kunde'  # alle Anlagen eines Kunden als eine PDF
+ARTEN = (ART_ODS, ART_ODT, ART_PDF, ART_ODS_KUNDE, ART_PDF_KUNDE)
+
+
+def erstelle_auftraege(kunden, odt=True, ods=True, pdf=False, ods_kunde=False, pdf_kunde=False):
+    """Zerlegt den Export in unabhängige Aufträge.
+
+    Anlagen ohne Beschriftungen werden beim ODS-/PDF-Export übersprungen,
+    Kunden ganz ohne Beschriftungen bei ods_kunde/pdf_kunde.
+
+    Args:
+        kunden (dict): {kundenname: kunde_dict}
+        odt (bool): ODT je Kunde erzeugen
+        ods (bool): ODS je Anlage erzeugen
+        pdf (bool): PDF je Anlage erzeugen
+        ods_kunde (bool): Eine ODS mit allen Anlagen je Kunde erzeugen
+        pdf_kunde (bool): Eine PDF mit allen Anlagen je Kunde erzeugen
+
+    Returns:
+        list: Aufträge (art, kundenname, daten, projekt)
+    """
+    auftraege = []
+    for kundenname, kunde in kunden.items():
+        if odt:
+            auftraege.append((ART_ODT, kundenname, kunde, ''))
+        projekt = kunde.get('projekt', '')
+        beschriftet = [anlage for anlage in kunde.get('anlagen', [])
+                       if anlage.get('text_inhalt', '').strip()]
+        for art, aktiv in ((ART_ODS, ods), (ART_PDF, pdf)):
+            if aktiv:
+                auftraege.extend((art, kundenname, anlage, projekt) for anlage in beschriftet)
+        for art, aktiv in ((ART_ODS_KUNDE, ods_kunde), (ART_PDF_KUNDE, pdf_kunde)):
+            if aktiv and beschriftet:
+                auftraege.append((art, kundenname, kunde, ''))
+    return auftraege
+
+
+def fuehre_aus(auftrag, settings, export_base_path, force=False):
+    """Führt einen Auftrag aus (im Worker oder sequentiell).
+
+    Unveränderte Dateien werden übernommen (siehe export_manifest),
+    außer mit force.
+
+    Returns:
+        tuple: (ok, auftrag_beschreibung, pfad bzw. Fehlermeldung)
+    """
+    art, kundenname, daten, projekt = auftrag
+    if art in (ART_ODS, ART_PDF):
+        beschreibung = f"{kundenname} / {daten.get('beschreibung') or daten.get('id', '?')}"
+    else:
+        beschreibung = kundenname
+    try:
+        if art == ART_ODT:
+            pfad = exportiere_kunde_odt(daten, kundenname, export_base_path, force)
+        elif art == ART_ODS:
+            pfad = exportiere_anlage_ods(daten, settings, export_base_path, kundenname, projekt, force)
+        elif art == ART_PDF:
+            pfad = exportiere_anlage_pdf(daten, settings, export_base_path, kundenname, projekt, force)
+        elif art == ART_ODS_KUNDE:
+            pfad = exportiere_kunde_ods(daten, settings, export_base_path, kundenname, force)
+        else:
+            pfad = exportiere_kunde_pdf(daten, settings, export_base_path, kundenname, force)
+        return True, beschreibung, str(pfad)
+    except Exception as e:
+        return False, beschreibung, str(e)
+
+
+def _init_worker(locale_code):
+    """Übernimmt die Sprache der App (Fehlermeldungen im Worker)."""
+    if locale_code and locale_code != ts.get_locale():
+        ts.set_locale(locale_code)
+
+
+def exportiere_stapel(kunden, settings, export_base_path, odt=True, ods=True, max_workers=None,
+                      force=False, pdf=False, ods_kunde=False, pdf_kunde=False):
+    """Exportiert alle Kunden und Anlagen, parallel wo möglich.
+
+    Args:
+        kunden (dict): {kundenname: kunde_dict} (reine Dicts)
+        settings (dict): Settings-Dictionary
+        export_base_path (Path): Basis-Pfad für Export-Verzeichnis
+        odt (bool): ODT je Kunde erzeugen
+        ods (bool): ODS je Anlage erzeugen
+        max_workers (int, optional): Anzahl Prozesse (Standard: CPU-Kerne,
+            1 = sequentiell)
+        force (bool): Auch unveränderte Dateien neu erzeugen
+        pdf, ods_kunde, pdf_kunde (bool): Weitere Formate (siehe erstelle_auftraege)
+
+    Returns:
+        dict: {'dateien': [pfad, ...], 'fehler': [(beschreibung, meldung), ...],
+            'auftraege': int, 'prozesse': int, 'dauer': Sekunden}
+    """
+    start = time.perf_counter()
+    auftraege = erstelle_auftraege(kunden, odt=odt, ods=ods, pdf=pdf,
+                                   ods_kunde=ods_kunde, pdf_kunde=pdf_kunde)
+    ausfuehren = partial(fuehre_aus, settings=settings, export_base_path=str(export_base_path),
+                         force=force)
+
+    prozesse = max_workers or os.cpu_count() or 1
+    ergebnisse = None
+    if prozesse > 1 and len(auftraege) >= BATCH_EXPORT_MIN_PARALLEL:
+        ergebnisse = _parallel(ausfuehren, auftraege, prozesse)
+    if ergebnisse is None:
+        prozesse = 1
+        ergebnisse = [ausfuehren(auftrag) for auftrag in auftraege]
+
+    zusammenfassung = {
+        'dateien': [],
+        'fehler': [],
+        'auftraege': len(auftraege),
+        'prozesse': prozesse,
+        'dauer': 0.0,
+    }
+    for ok, beschreibung, ergebnis in ergebnisse:
+        if ok:
+            zusammenfassung['dateien'].append(ergebnis)
+        else:
+            zusammenfassung['fehler'].append((beschreibung, ergebnis))
+    zusammenfassung['dauer'] = time.perf_counter() - start
+    return zusammenfassung
+
+
+def _parallel(ausfuehren, auftraege, prozesse):
+    """Verteilt die Aufträge auf einen ProcessPoolExecutor.
+
+    Returns:
+        list: Ergebnisse in Auftragsreihenfolge, oder None wenn keine
+            Prozesse gestartet werden können (dann sequentiell)
+    """
+    # Erst hier: multiprocessing kostet beim Start der Kommandozeile spürbar Zeit
+    try:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+    except ImportError:
+        return None
+
+    # Mehrere Aufträge pro Übergabe sparen Pickle-/IPC-Aufwand
+    chunksize = max(1, len(auftraege) // (prozesse * 4))
+    try:
+        # Kein fork: der aufrufende Prozess hat bereits Threads mit Locks
+        methode = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=prozesse, mp_context=multiprocessing.get_context(methode),
+                                 initializer=_init_worker,
+                                 initargs=(ts.get_locale(),)) as executor:
+            return list(executor.map(ausfuehren, auftraege, chunksize=chunksize))
+    except (NotImplementedError, OSError, ImportError, ValueError, BrokenProcessPool):
+        # Plattform ohne Prozesse/Semaphoren; bereits geschriebene Dateien
+        # übernimmt der sequentielle Lauf über das Export-Manifest
+        return None
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Spaltenbelegung als Intervalle statt als Listen/Mengen einzelner Spalten.
+
+Eine Beschriftung belegt immer einen zusammenhängenden Spaltenbereich
+(parse_spalten liefert ein range). Speicher und Laufzeit hängen damit nur
+von der Anzahl der Einträge ab, nicht von ihrer Breite – "1-99999999 Test"
+kostet so viel wie "1 Test".
+
+    SpaltenBelegung   Disjunkte Intervalle (belegte Spalten), Konflikte in O(log n)
+    IntervallIndex    Sich überlappende Intervalle (z.B. alle Kandidaten im Editor)
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+
+def _grenzen(spalten):
+    """(von, bis) eines nicht leeren range mit Schrittweite 1."""
+    return spalten.start, spalten.stop - 1
+
+
+def ausserhalb_bereich(spalten, max_spalten):
+    """Teile eines Spaltenbereichs außerhalb 1..max_spalten.
+
+    Args:
+        spalten (range): Spaltenbereich
+        max_spalten (int): Höchste gültige Spalte
+
+    Returns:
+        list: [(von, bis), ...] – leer, wenn alles im Bereich liegt
+    """
+    von, bis = _grenzen(spalten)
+    teile = []
+    if von < 1:
+        teile.append((von, min(bis, 0)))
+    if bis > max_spalten:
+        teile.append((max(von, max_spalten + 1), bis))
+    return teile
+
+
+def format_bereiche(bereiche):
+    """Formatiert [(von, bis), ...] für Fehlermeldungen, z.B. "1-3, 7"."""
+    return ', '.join(str(von) if von == bis else f'{von}-{bis}' for von, bis in bereiche)
+
+
+class SpaltenBelegung:
+    """Belegte Spalten als sortierte, disjunkte Intervalle.
+
+    Verhält sich für len() und 'in' wie die frühere Menge belegter Spalten.
+    Jedes Intervall kann einen Wert tragen (z.B. die belegende Zeile).
+    """
+
+    def __init__(self, intervalle=None):
+        """Initialisiert die Belegung.
+
+        Args:
+            intervalle (iterable, optional): Disjunkte (von, bis)-Paare
+        """
+        self._von = []
+        self._bis = []
+        self._wert = []
+        self._anzahl = 0
+        for von, bis in intervalle or ():
+            self.belegen(range(von, bis + 1))
+
+    def ueberlappungen(self, spalten):
+        """Überschneidungen eines Spaltenbereichs mit der Belegung.
+
+        Args:
+            spalten (range): Spaltenbereich
+
+        Returns:
+            list: [(von, bis, wert), ...] – von/bis auf die Überschneidung
+                begrenzt, aufsteigend sortiert
+        """
+        von, bis = _grenzen(spalten)
+        # Intervalle sind disjunkt → auch die Enden sind sortiert
+        i = bisect_right(self._von, bis) - 1
+        treffer = []
+        while i >= 0 and self._bis[i] >= von:
+            treffer.append((max(self._von[i], von), min(self._bis[i], bis), self._wert[i]))
+            i -= 1
+        treffer.reverse()
+        return treffer
+
+    def konflikte(self, spalten):
+        """Bereits belegte Teile eines Spaltenbereichs als [(von, bis), ...]."""
+        return [(von, bis) for von, bis, _wert in self.ueberlappungen(spalten)]
+
+    def belegen(self, spalten, wert=None):
+        """Belegt einen freien Spaltenbereich.
+
+        Raises:
+            ValueError: Wenn sich der Bereich mit der Belegung überschneidet
+        """
+        von, bis = _grenzen(spalten)
+        i = bisect_left(self._von, von)
+        if (i < len(self._von) and self._von[i] <= bis) or (i > 0 and self._bis[i - 1] >= von):
+            raise ValueError(f'Spalten {von}-{bis} überschneiden sich mit der Belegung')
+        self._von.insert(i, von)
+        self._bis.insert(i, bis)
+        self._wert.insert(i, wert)
+        self._anzahl += bis - von + 1
+
+    def freigeben(self, spalten, wert=None):
+        """Gibt einen zuvor belegten Bereich frei (sofern vorhanden).
+
+        Args:
+            spalten (range): Exakt der belegte Bereich
+            wert (optional): Nur freigeben, wenn das Intervall diesen Wert trägt
+
+        Returns:
+            bool: True, wenn freigegeben wurde
+        """
+        von, bis = _grenzen(spalten)
+        i = bisect_left(self._von, von)
+        if (i == len(self._von) or self._von[i] != von or self._bis[i] != bis
+                or (wert is not None and self._wert[i] is not wert)):
+            return False
+        del self._von[i], self._bis[i], self._wert[i]
+        self._anzahl -= bis - von + 1
+        return True
+
+    def freie_bereiche(self, max_spalten, nach_groesse=False):
+        """Freie zusammenhängende Bereiche innerhalb 1..max_spalten.
+
+        Laufzeit hängt nur von der Anzahl belegter Intervalle ab.
+
+        Args:
+            max_spalten (int): Höchste gültige Spalte
+            nach_groesse (bool): Größte Bereiche zuerst statt nach Position
+
+        Returns:
+            list: [(von, bis), ...]
+        """
+        frei = []
+        naechste = 1
+        for von, bis in zip(self._von, self._bis):
+            if naechste > max_spalten:
+                break
+            if von > naechste:
+                frei.append((naechste, min(von - 1, max_spalten)))
+            naechste = max(naechste, bis + 1)
+        if naechste <= max_spalten:
+            frei.append((naechste, max_spalten))
+        if nach_groesse:
+            frei.sort(key=lambda bereich: (bereich[0] - bereich[1], bereich[0]))
+        return frei
+
+    def passende_positionen(self, breite, max_spalten, reihenlaenge=None, limit=None):
+        """Positionen, an denen ein Gerät mit breite Spalten Platz hat.
+
+        Je freiem Bereich (und je Reihe darin) wird die erste passende
+        Position geliefert, aufsteigend. Mit reihenlaenge darf das Gerät
+        keine Reihengrenze überschreiten (Reihen beginnen bei 1,
+        reihenlaenge + 1, ...).
+
+        Args:
+            breite (int): Anzahl benötigter Spalten
+            max_spalten (int): Höchste gültige Spalte
+            reihenlaenge (int, optional): Spalten pro Reihe (z.B. COLUMNS_PER_UNIT)
+            limit (int, optional): Höchstens so viele Vorschläge
+
+        Returns:
+            list: Spaltenbereiche (range), der erste ist der nächste freie Platz
+        """
+        if breite < 1 or (reihenlaenge and breite > reihenlaenge):
+            return []
+        vorschlaege = []
+        for von, bis in self.freie_bereiche(max_spalten):
+            start = von
+            while start + breite - 1 <= bis:
+                if reihenlaenge:
+                    reihen_ende = ((start - 1) // reihenlaenge + 1) * reihenlaenge
+                    if start + breite - 1 > reihen_ende:
+                        start = reihen_ende + 1
+                        continue
+                vorschlaege.append(range(start, start + breite))
+                if limit and len(vorschlaege) >= limit:
+                    return vorschlaege
+                if not reihenlaenge:
+                    break
+                start = reihen_ende + 1  # Nächste Reihe im selben freien Bereich
+        return vorschlaege
+
+    def copy(self):
+        """Kopie der Belegung ohne die Werte der Intervalle."""
+        kopie = SpaltenBelegung()
+        kopie._von = self._von.copy()
+        kopie._bis = self._bis.copy()
+        kopie._wert = [None] * len(self._von)
+        kopie._anzahl = self._anzahl
+        return kopie
+
+    def intervalle(self):
+        """Alle belegten Intervalle als [(von, bis), ...], aufsteigend."""
+        return list(zip(self._von, self._bis))
+
+    def __len__(self):
+        return self._anzahl
+
+    def __contains__(self, spalte):
+        i = bisect_right(self._von, spalte) - 1
+        return i >= 0 and self._bis[i] >= spalte
+
+    def __iter__(self):
+        for von, bis in zip(self._von, self._bis):
+            yield from range(von, bis + 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, SpaltenBelegung):
+            return NotImplemented
+        return self._von == other._von and self._bis == other._bis
+
+    def __repr__(self):
+        return f'SpaltenBelegung({self.intervalle()!r})'
+
+
+class IntervallIndex:
+    """Menge sich möglicherweise überlappender Intervalle mit Wert.
+
+    Sortiert nach Startspalte; Überlappungsabfragen suchen nur Starts im
+    Fenster [von - längstes Intervall + 1, bis].
+    """
+
+    def __init__(self):
+        self._eintraege = []   # (von, bis, id(wert), wert), sortiert
+        self._max_laenge = 0   # Obere Schranke der Intervall-Längen
+
+    def add(self, spalten, wert):
+        von, bis = _grenzen(spalten)
+        insort(self._eintraege, (von, bis, id(wert), wert))
+        self._max_laenge = max(self._max_laenge, bis - von + 1)
+
+    def remove(self, spalten, wert):
+        von, bis = _grenzen(spalten)
+        i = bisect_left(self._eintraege, (von, bis, id(wert)))
+        if i < len(self._eintraege) and self._eintraege[i][3] is wert:
+            del self._eintraege[i]
+
+    def ueberlappende(self, spalten):
+        """Werte aller Intervalle, die sich mit dem Bereich überschneiden."""
+        von, bis = _grenzen(spalten)
+        i = bisect_left(self._eintraege, (von - self._max_laenge + 1,))
+        ende = bisect_left(self._eintraege, (bis + 1,))
+        return [wert for _von, e_bis, _key, wert in self._eintraege[i:ende] if e_bis >= von]
+
+    def __len__(self):
+        return len(self._eintraege)
+
+
+if __name__ == "__main__":
+    pass
@@ -15,6 +15,52 @@ APP_ID = "com.vohegg.verteiler_beschriften"
 # Dateinamen
 DATA_FILENAME = 'Verteiler_Daten.json'
 SETTINGS_FILENAME = 'Verteiler_Einstellungen.json'
+JOURNAL_FILENAME = 'Verteiler_Daten.journal'
+SQLITE_FILENAME = 'Verteiler_Daten.sqlite'
+
+# Journal-Kompaktierung (Speicher-Layout 'journal')
+JOURNAL_MAX_BYTES = 256 * 1024  # ab dieser Größe in den Snapshot falten
+JOURNAL_MAX_ALTER = 300  # in Sekunden seit dem ersten Journal-Eintrag
+
+# Backups (inhaltsadressiert, siehe backup_store.py)
+BACKUP_DIRNAME = 'Backups'
+BACKUP_BEHALTEN_LETZTE = 10  # die neuesten Sicherungen
+BACKUP_BEHALTEN_TAGE = 7  # je Tag die neueste
+BACKUP_BEHALTEN_WOCHEN = 4  # je Woche die neueste
+
+# Beschriftungs-Audit (label_audit.py)
+AUDIT_FAST_VOLL_PROZENT = 90  # ab dieser Auslastung gilt ein Verteiler als fast voll
+AUDIT_DATEIPRAEFIX = 'Audit_Beschriftungen'
+
+# Validierungs-Cache (validation_cache.py): so viele Ergebnisse werden gemerkt
+VALIDIERUNG_CACHE_MAX = 64
+
+# Detailansicht: so viele freie Bereiche/Platzvorschläge werden angezeigt
+PLATZ_VORSCHLAEGE_ANZAHL = 5
+
+# Beschriftungen anordnen: exakte Suche bis zu so vielen zu verschiebenden
+# Einträgen, mit höchstens so vielen Suchknoten (danach gilt die Heuristik)
+PACKING_EXAKT_MAX = 12
+PACKING_EXAKT_KNOTEN = 200000
+
+# Export: XML wird in Blöcken dieser Größe (Zeichen) in die ZIP-Datei geschrieben
+XML_STREAM_PUFFER = 64 * 1024
+
+# Stapel-Export: erst ab so vielen Dateien lohnen sich Worker-Prozesse
+BATCH_EXPORT_MIN_PARALLEL = 8
+
+# Export-Manifest je Kunden-Exportverzeichnis (unveränderte Exporte überspringen)
+EXPORT_MANIFEST_DATEI = '.export_manifest.json'
+
+# ODS-Tabellennamen (Kunden-Export mit einer Tabelle je Anlage)
+TABELLENNAME_MAX = 31
+TABELLENNAME_VERBOTEN = "[]*?:/\\'"
+
+# Export: so viele serialisierte statische ODF-Teile (je Settings) werden gemerkt
+ODF_TEIL_CACHE_MAX = 16
+
+# Lazy Loading: maximal so viele Kunden gleichzeitig als Dataclasses im Speicher
+KUNDEN_CACHE_MAX = 8
 
 # Internationalization (i18n)
 # def _(astring, size=14)->str:
@@ -44,8 +90,12 @@ DEFAULT_SETTINGS = {
     'beschriftung_row_hoehe': 0.5,  # in cm
     'inhalt_row_hoehe': 1.5,  # in cm
     'zellen_umrandung': True,  # Umrandung aktiviert
+    'export_immer_neu': False,  # Auch unveränderte Anlagen/Kunden neu exportieren
     'linebreak_char': ';',  # Zeichen für neue Zeile (max 3 Zeichen)
     'selected_locale': 'de_DE',  # Standard-Sprache
+    'speicher_intervall': 1.0,  # in Sekunden, Änderungen werden gesammelt gespeichert
+    'speicher_modus': 'json',  # 'json' = eine Datei, 'sharded' = pro Kunde, 'journal' = Änderungsjournal, 'sqlite'
+    'speicher_kodierung': 'json',  # Datendatei: 'json', 'json_kompakt', 'gzip', 'pickle'
     # Page Layout Einstellungen
     'seite_breite': 29.7,  # A4 Querformat Breite in cm
     'seite_hoehe': 21.0,  # A4 Querformat Höhe in cm
@@ -6,9 +6,27 @@ Funktionen zum Laden, Speichern und Verwalten von Daten und Einstellungen.
 """
 
 import json
+import shutil
 from pathlib import Path
 
-from constants import DEFAULT_SETTINGS, DATA_FILENAME, SETTINGS_FILENAME
+from constants import (
+    DEFAULT_SETTINGS, DATA_FILENAME, SETTINGS_FILENAME,
+    JOURNAL_FILENAME, JOURNAL_MAX_BYTES, JOURNAL_MAX_ALTER, SQLITE_FILENAME,
+    BACKUP_DIRNAME, BACKUP_BEHALTEN_LETZTE, BACKUP_BEHALTEN_TAGE, BACKUP_BEHALTEN_WOCHEN,
+)
+from backup_store import BackupStore
+from migrations import SCHEMA_VERSION, migrate, needs_migration
+from storage_encoding import ENCODING_JSON, ENCODINGS, FragmentCache, encode, read_file
+from storage_journal import JournalStorage
+from storage_sharded import ShardedStorage, atomic_write_bytes
+from storage_sqlite import SqliteStorage
+
+# Verfügbare Speicher-Layouts (Setting 'speicher_modus')
+STORAGE_JSON = 'json'        # Eine Datei Verteiler_Daten.json (Standard, Austauschformat)
+STORAGE_SHARDED = 'sharded'  # Eine Datei pro Kunde + Index
+STORAGE_JOURNAL = 'journal'  # Snapshot + Änderungsjournal auf Feldebene
+STORAGE_SQLITE = 'sqlite'    # SQLite-Datenbank mit normalisierten Tabellen
+STORAGE_MODES = (STORAGE_JSON, STORAGE_SHARDED, STORAGE_JOURNAL, STORAGE_SQLITE)
 
 
 class DataManager:
@@ -22,6 +40,10 @@ class DataManager:
         """
         self.data_path = Path(data_path)
         self.settings = DEFAULT_SETTINGS.copy()
+        self._backend = None
+        self._backend_mode = None
+        self._fragment_cache = FragmentCache()  # kodierte Kunden der Datendatei
+        self._backup_store = None
 
     def get_data_file_path(self):
         """Gibt den vollständigen Pfad zur Datendatei zurück.
@@ -40,6 +62,49 @@ class DataManager:
         """
         return self.data_path / SETTINGS_FILENAME
 
+    def get_storage_mode(self):
+        """Gibt das aktive Speicher-Layout zurück (siehe STORAGE_MODES)."""
+        mode = self.settings.get('speicher_modus', STORAGE_JSON)
+        return mode if mode in STORAGE_MODES else STORAGE_JSON
+
+    def get_storage_encoding(self):
+        """Gibt die Kodierung der Datendatei zurück (siehe storage_encoding.ENCODINGS)."""
+        encoding = self.settings.get('speicher_kodierung', ENCODING_JSON)
+        return encoding if encoding in ENCODINGS else ENCODING_JSON
+
+    def get_storage_path(self):
+        """Gibt die Datei zurück, die das aktive Layout repräsentiert.
+
+        Returns:
+            Path: Datendatei (json, journal), Index-Datei (sharded) bzw. Datenbank (sqlite)
+        """
+        if self.get_storage_mode() == STORAGE_SHARDED:
+            return self._get_backend().index_path
+        if self.get_storage_mode() == STORAGE_SQLITE:
+            return self._get_backend().db_path
+        return self.get_data_file_path()
+
+    def _get_backend(self):
+        """Liefert das Backend für das aktive Layout (None = Einzeldatei)."""
+        mode = self.get_storage_mode()
+        if mode != self._backend_mode:
+            if mode == STORAGE_SHARDED:
+                self._backend = ShardedStorage(self.data_path)
+            elif mode == STORAGE_JOURNAL:
+                self._backend = JournalStorage(
+                    self.get_data_file_path(),
+                    self.data_path / JOURNAL_FILENAME,
+                    max_bytes=JOURNAL_MAX_BYTES,
+                    max_age=JOURNAL_MAX_ALTER,
+                    encoding=self.get_storage_encoding(),
+                )
+            elif mode == STORAGE_SQLITE:
+                self._backend = SqliteStorage(self.data_path / SQLITE_FILENAME)
+            else:
+                self._backend = None
+            self._backend_mode = mode
+        return self._backend
+
     # ==================== Settings Management ====================
 
     def validate_setting_value(self, key, value, default_value):
@@ -125,48 +190,184 @@ class DataManager:
 
     # ==================== Daten Management ====================
 
-    def load_data(self):
-        """Lädt alle Kundendaten aus der JSON-Datei.
+    def load_data(self, read_only=False):
+        """Lädt alle Kundendaten im aktiven Speicher-Layout.
+
+        In den Layouts 'sharded' und 'sqlite' wird eine vorhandene
+        Verteiler_Daten.json beim ersten Laden automatisch übernommen. Im Layout 'journal' wird
+        das Journal auf den Snapshot angewendet.
+
+        Daten älterer Schema-Versionen werden einmalig migriert und sofort
+        gespeichert (siehe migrations.py).
+
+        Args:
+            read_only (bool): Nichts schreiben – Migration und Übernahme nur
+                im Speicher (Kommandozeile neben der laufenden App)
 
         Returns:
             tuple: (all_customers: dict, next_customer_id: int)
         """
-        data_path = self.get_data_file_path()
+        backend = self._get_backend()
+        if backend is None:
+            all_customers, next_customer_id, migriert = self._load_single_file(self.get_data_file_path())
+            if migriert and not read_only:
+                self.save_data(all_customers, next_customer_id)
+            return all_customers, next_customer_id
 
-        if not data_path.exists():
+        try:
+            if not backend.exists():
+                all_customers, next_customer_id, _migriert = self._load_single_file(self.get_data_file_path())
+                if all_customers and not read_only:
+                    backend.save(all_customers, next_customer_id)
+                return all_customers, next_customer_id
+
+            if read_only and isinstance(backend, JournalStorage):
+                all_customers, next_customer_id = backend.load(read_only=True)
+            else:
+                all_customers, next_customer_id = backend.load()
+            if needs_migration(backend.schema_version):
+                migrate({
+                    'kunden': all_customers,
+                    'next_kunden_id': next_customer_id,
+                    'schema_version': backend.schema_version,
+                })
+                if not read_only:
+                    backend.save(all_customers, next_customer_id)
+            return all_customers, next_customer_id
+
+        except Exception as e:
             return {}, 1
 
+    def has_customer_index(self):
+        """Gibt zurück, ob das aktive Layout Kunden einzeln laden kann.
+
+        Returns:
+            bool: True für 'sharded' und 'sqlite' (Index + Laden pro Kunde)
+        """
+        return hasattr(self._get_backend(), 'load_index')
+
+    def load_index(self):
+        """Lädt nur die Kopfdaten aller Kunden (Lazy Loading).
+
+        Eine vorhandene Verteiler_Daten.json wird beim ersten Laden wie in
+        load_data übernommen.
+
+        Returns:
+            tuple: (index: dict Name → {'id', 'projekt', 'anlagen', ...},
+                next_customer_id: int)
+        """
+        backend = self._get_backend()
+        if not self.has_customer_index():
+            all_customers, next_customer_id = self.load_data()
+            index = {
+                name: {
+                    'id': customer_data.get('id', 0),
+                    'projekt': customer_data.get('projekt', ''),
+                    'anlagen': len(customer_data.get('anlagen', [])),
+                }
+                for name, customer_data in all_customers.items()
+            }
+            return index, next_customer_id
+
         try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                all_data = json.load(f)
+            if not backend.exists():
+                self.load_data()
+            index, next_customer_id = backend.load_index()
+            if needs_migration(backend.schema_version):
+                # Einmalig alles laden, migrieren und speichern
+                self.load_data()
+                index, next_customer_id = backend.load_index()
+            return dict(index), next_customer_id
+
+        except Exception as e:
+            return {}, 1
+
+    def load_customer(self, name):
+        """Lädt die Daten eines einzelnen Kunden.
+
+        Args:
+            name (str): Kundenname
+
+        Returns:
+            dict: Kundendaten
+
+        Raises:
+            KeyError: Kunde existiert nicht
+        """
+        backend = self._get_backend()
+        if self.has_customer_index():
+            # load_index hat das Backend bereits auf die aktuelle Schema-Version gebracht
+            return backend.load_customer(name)
+        return self.load_data()[0][name]
+
+    def _load_single_file(self, data_path):
+        """Lädt Kundendaten aus einer Datei im Einzeldatei-Format.
+
+        Die Kodierung (JSON, gzip, pickle) wird automatisch erkannt, ältere
+        Schema-Versionen werden migriert (nur im Speicher).
+
+        Args:
+            data_path (Path): Pfad zur Datendatei
+
+        Returns:
+            tuple: (all_customers: dict, next_customer_id: int, migriert: bool)
+        """
+        if not data_path.exists():
+            return {}, 1, False
+
+        try:
+            all_data = read_file(data_path)
+            migriert = migrate(all_data)
 
             all_customers = all_data.get('kunden', {})
             next_customer_id = all_data.get('next_kunden_id', 1)
 
-            # Migration: Füge next_anlage_id zu alten Kunden hinzu falls nicht vorhanden
-            for customer_data in all_customers.values():
-                if 'next_anlage_id' not in customer_data:
-                    # Finde höchste Anlagen-ID + 1
-                    max_id = max((a.get('id', 0) for a in customer_data.get('anlagen', [])), default=0)
-                    customer_data['next_anlage_id'] = max_id + 1
-
-            return all_customers, next_customer_id
+            return all_customers, next_customer_id, migriert
 
         except Exception as e:
-            return {}, 1
+            return {}, 1, False
 
-    def save_data(self, all_customers, next_customer_id):
-        """Speichert alle Kundendaten in die JSON-Datei.
+    def save_data(self, all_customers, next_customer_id, dirty_keys=None):
+        """Speichert Kundendaten im aktiven Speicher-Layout.
 
         Args:
             all_customers (dict): Dictionary mit allen Kundendaten
             next_customer_id (int): Nächste freie Kunden-ID
+            dirty_keys (set, optional): Namen der geänderten Kunden. Im Layout
+                'sharded' werden nur deren Dateien neu geschrieben, im Layout
+                'journal' nur deren Feldänderungen angehängt, im Layout 'sqlite'
+                nur deren Zeilen ersetzt. None = alle.
 
         Returns:
             tuple: (erfolg: bool, fehler_nachricht: str oder None)
         """
-        data_path = self.get_data_file_path()
+        backend = self._get_backend()
+        if backend is None:
+            return self._save_single_file(self.get_data_file_path(), all_customers, next_customer_id,
+                                          self._fragment_cache)
+
+        try:
+            self.data_path.mkdir(parents=True, exist_ok=True)
+            backend.save(all_customers, next_customer_id, dirty_keys)
+            return True, None
+
+        except Exception as e:
+            return False, str(e)
+
+    def _save_single_file(self, data_path, all_customers, next_customer_id, fragment_cache=None):
+        """Schreibt alle Kundendaten in eine Datei im Einzeldatei-Format.
+
+        Kodiert wird gemäß Setting 'speicher_kodierung'.
+
+        Args:
+            data_path (Path): Zieldatei
+            all_customers (dict): Dictionary mit allen Kundendaten
+            next_customer_id (int): Nächste freie Kunden-ID
+            fragment_cache (FragmentCache, optional): Nur geänderte Kunden neu kodieren
 
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
         try:
             data_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -174,16 +375,176 @@ class DataManager:
                 'kunden': all_customers,
                 'next_kunden_id': next_customer_id,
                 # next_anlage_id nicht mehr global - ist jetzt pro Kunde
+                'schema_version': SCHEMA_VERSION,
             }
 
-            with open(data_path, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, indent=4, ensure_ascii=False)  # type: ignore[arg-type]
+            encoder = fragment_cache.encode if fragment_cache is not None else encode
+            atomic_write_bytes(data_path, encoder(all_data, self.get_storage_encoding()))
 
             return True, None
 
         except Exception as e:
             return False, str(e)
 
+    # ==================== Layout-Wechsel & Austausch ====================
+
+    def set_storage_mode(self, mode):
+        """Wechselt das Speicher-Layout und überträgt alle Daten verlustfrei.
+
+        Args:
+            mode (str): Neues Layout (siehe STORAGE_MODES)
+
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
+        if mode not in STORAGE_MODES:
+            return False, f'Unbekanntes Speicher-Layout: {mode}'
+        if mode == self.get_storage_mode():
+            return True, None
+
+        all_customers, next_customer_id = self.load_data()
+        old_mode = self.get_storage_mode()
+        old_backend = self._get_backend()
+        self.settings['speicher_modus'] = mode
+        ok, fehler = self.save_data(all_customers, next_customer_id)
+        if not ok:
+            self.settings['speicher_modus'] = old_mode
+        elif old_mode == STORAGE_JOURNAL:
+            # Snapshot ist aktuell, ein altes Journal darf nicht erneut angewendet werden
+            old_backend.discard_journal()
+        elif old_mode == STORAGE_SQLITE:
+            old_backend.close()
+        return ok, fehler
+
+    def set_storage_encoding(self, encoding):
+        """Wechselt die Kodierung der Datendatei und schreibt sie neu.
+
+        Args:
+            encoding (str): Neue Kodierung (siehe storage_encoding.ENCODINGS)
+
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
+        if encoding not in ENCODINGS:
+            return False, f'Unbekannte Kodierung: {encoding}'
+        if encoding == self.get_storage_encoding():
+            return True, None
+
+        all_customers, next_customer_id = self.load_data()
+        old_encoding = self.get_storage_encoding()
+        self.settings['speicher_kodierung'] = encoding
+        if self.get_storage_mode() == STORAGE_JOURNAL:
+            self._get_backend().encoding = encoding
+        ok, fehler = self.save_data(all_customers, next_customer_id)
+        if not ok:
+            self.settings['speicher_kodierung'] = old_encoding
+            if self.get_storage_mode() == STORAGE_JOURNAL:
+                self._get_backend().encoding = old_encoding
+        return ok, fehler
+
+    def export_single_file(self, dst):
+        """Schreibt alle Daten im Einzeldatei-Format (Handy↔PC-Austausch).
+
+        Args:
+            dst (Path): Zieldatei
+
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
+        if self._get_backend() is None:
+            try:
+                shutil.copy(self.get_data_file_path(), dst)
+                return True, None
+            except Exception as e:
+                return False, str(e)
+
+        all_customers, next_customer_id = self.load_data()
+        return self._save_single_file(Path(dst), all_customers, next_customer_id)
+
+    def import_single_file(self, src):
+        """Ersetzt alle Daten durch eine Datei im Einzeldatei-Format.
+
+        Args:
+            src (Path): Quelldatei
+
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
+        if self._get_backend() is None:
+            try:
+                shutil.copy(src, self.get_data_file_path())
+                return True, None
+            except Exception as e:
+                return False, str(e)
+
+        all_customers, next_customer_id, _migriert = self._load_single_file(Path(src))
+        return self.save_data(all_customers, next_customer_id)
+
+    # ==================== Backups ====================
+
+    def get_backup_store(self):
+        """Gibt den Backup-Speicher im Datenverzeichnis zurück."""
+        if self._backup_store is None:
+            self._backup_store = BackupStore(self.data_path / BACKUP_DIRNAME)
+        return self._backup_store
+
+    def create_backup(self, all_customers, next_customer_id):
+        """Sichert Kundendaten und Einstellungen und räumt alte Sicherungen auf.
+
+        Args:
+            all_customers (dict): Alle Kundendaten (Name → dict)
+            next_customer_id (int): Nächste freie Kunden-ID
+
+        Returns:
+            tuple: (manifest: dict oder None, fehler_nachricht: str oder None)
+        """
+        try:
+            store = self.get_backup_store()
+            manifest = store.create(all_customers, next_customer_id,
+                                    settings=self.settings, schema_version=SCHEMA_VERSION)
+            store.prune(keep_last=BACKUP_BEHALTEN_LETZTE, keep_daily=BACKUP_BEHALTEN_TAGE,
+                        keep_weekly=BACKUP_BEHALTEN_WOCHEN)
+            return manifest, None
+        except Exception as e:
+            return None, str(e)
+
+    def list_backups(self):
+        """Listet alle Sicherungen, neueste zuerst (siehe BackupStore.list)."""
+        try:
+            return self.get_backup_store().list()
+        except Exception as e:
+            return []
+
+    def restore_backup(self, sicherung_id, mit_einstellungen=False):
+        """Ersetzt alle Daten durch eine Sicherung.
+
+        Args:
+            sicherung_id (str): ID der Sicherung
+            mit_einstellungen (bool): Auch die Einstellungen zurückholen
+                (Speicher-Layout und Kodierung bleiben wie aktuell)
+
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
+        try:
+            store = self.get_backup_store()
+            all_customers, next_customer_id, settings = store.load(sicherung_id)
+            migrate({
+                'kunden': all_customers,
+                'next_kunden_id': next_customer_id,
+                'schema_version': store.get_manifest(sicherung_id).get('schema_version', 0),
+            })
+        except Exception as e:
+            return False, str(e)
+
+        ok, fehler = self.save_data(all_customers, next_customer_id)
+        if ok and mit_einstellungen and settings:
+            for key in ('speicher_modus', 'speicher_kodierung'):
+                settings[key] = self.settings.get(key, DEFAULT_SETTINGS[key])
+            self.settings.update(settings)
+            ok, fehler = self.save_settings()
+        return ok, fehler
+
     # ==================== Helper-Funktionen ====================
 
     def convert_kunde_to_dict(self, customer_data, active_data_fields):
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Export-Manifest: unveränderte Exporte nicht neu erzeugen.
+
+Pro Kunden-Exportverzeichnis (Export/<kunde>/) liegt eine kleine JSON-Datei
+mit einem Eintrag je exportiertem Objekt:
+
+    {"version": 1,
+     "eintraege": {"ods:<anlage_id>": {"hash": ..., "datei": ..., "zeit": ...},
+                   "odt": {...}, "ods-kunde": {...}}}
+
+Der Hash umfasst alle Eingaben des Exports: die Daten der Anlage bzw. des
+Kunden, die relevanten Settings, Kundenname/Projekt, Sprache und
+App-Version. Stimmt er überein und existiert die Datei noch, liefert der
+Export sie sofort zurück; force erzwingt die Neuerzeugung.
+
+Gleichzeitige Exporte desselben Kunden (Stapel-Export) schreiben jeweils
+vollständige Manifeste; geht dabei ein Eintrag verloren, wird die Datei
+beim nächsten Mal einfach neu erzeugt.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from constants import EXPORT_MANIFEST_DATEI, TOOL_FLET_VERSION, ts
+from ods_manual import CONTENT_STYLE_SETTINGS, STYLES_SETTINGS
+
+MANIFEST_VERSION = 1
+
+# Settings, die in eine ODS-Datei eingehen (ODT hängt von keinen Settings ab)
+ODS_SETTINGS = STYLES_SETTINGS + CONTENT_STYLE_SETTINGS + ('linebreak_char',)
+
+
+def eingabe_hash(art, daten, settings=None, setting_keys=(), **kontext):
+    """Hash über alle Eingaben eines Exports.
+
+    Args:
+        art (str): Art des Exports (z.B. 'ods', 'odt')
+        daten (dict): Anlagen- bzw. Kunden-Dictionary
+        settings (dict, optional): Settings Dictionary
+        setting_keys (tuple): Davon relevante Settings
+        **kontext: Weitere Eingaben (z.B. kundenname, projekt)
+
+    Returns:
+        str: Hex-Digest
+    """
+    settings = settings or {}
+    eingaben = {
+        'art': art,
+        'daten': daten,
+        'settings': [settings.get(key) for key in setting_keys],
+        'kontext': kontext,
+        'locale': ts.get_locale(),
+        'version': TOOL_FLET_VERSION,
+    }
+    text = json.dumps(eingaben, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _manifest_pfad(verzeichnis):
+    return Path(verzeichnis) / EXPORT_MANIFEST_DATEI
+
+
+def lade(verzeichnis):
+    """Liest die Einträge des Manifests (leer, wenn fehlend oder unlesbar)."""
+    try:
+        with open(_manifest_pfad(verzeichnis), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    eintraege = manifest.get('eintraege')
+    return eintraege if isinstance(eintraege, dict) else {}
+
+
+def vorhandene_datei(verzeichnis, schluessel, hash_wert):
+    """Bereits exportierte Datei mit identischen Eingaben.
+
+    Args:
+        verzeichnis (Path): Exportverzeichnis des Kunden
+        schluessel (str): Eintrag (z.B. 'ods:<anlage_id>')
+        hash_wert (str): Aktueller eingabe_hash
+
+    Returns:
+        Path: Pfad der Datei, oder None wenn neu exportiert werden muss
+    """
+    eintrag = lade(verzeichnis).get(schluessel)
+    if not isinstance(eintrag, dict) or eintrag.get('hash') != hash_wert:
+        return None
+    pfad = Path(verzeichnis) / str(eintrag.get('datei', ''))
+    return pfad if eintrag.get('datei') and pfad.is_file() else None
+
+
+def eintragen(verzeichnis, schluessel, hash_wert, pfad):
+    """Vermerkt einen Export im Manifest (atomar geschrieben).
+
+    Args:
+        verzeichnis (Path): Exportverzeichnis des Kunden
+        schluessel (str): Eintrag (z.B. 'ods:<anlage_id>')
+        hash_wert (str): eingabe_hash des Exports
+        pfad (Path): Erzeugte Datei (im Verzeichnis)
+    """
+    eintraege = lade(verzeichnis)
+    eintraege[schluessel] = {
+        'hash': hash_wert,
+        'datei': Path(pfad).name,
+        'zeit': datetime.now().isoformat(timespec='seconds'),
+    }
+    text = json.dumps({'version': MANIFEST_VERSION, 'eintraege': eintraege},
+                      indent=2, ensure_ascii=False)
+
+    # Eigene temporäre Datei je Schreibvorgang: parallele Worker kommen sich nicht in die Quere
+    fd, tmp_pfad = tempfile.mkstemp(dir=verzeichnis, prefix=EXPORT_MANIFEST_DATEI, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_pfad, _manifest_pfad(verzeichnis))
+    except OSError:
+        # Manifest ist nur eine Abkürzung – ohne Eintrag wird neu exportiert
+        try:
+            os.remove(tmp_pfad)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    pass
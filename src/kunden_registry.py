@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kunden-Registry mit Lazy Loading.
+
+Beim Start wird nur ein leichter Index (Name, ID, Projekt, Anzahl Anlagen)
+bzw. die rohen Dicts gehalten. Ein Kunde wird erst beim Zugriff in
+Kunde/Anlage-Dataclasses umgewandelt. Höchstens max_hydrated Kunden bleiben
+als Dataclasses im Speicher; ältere werden wieder zu rohen Dicts (nichts geht
+verloren, auch keine ungespeicherten Änderungen).
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from constants import KUNDEN_CACHE_MAX
+from models import Kunde, kunde_from_dict, kunde_to_dict_cached
+
+_NICHT_GELADEN = object()  # Kunde liegt nur im Speicher-Backend
+
+
+class KundenRegistry(MutableMapping):
+    """Dict-artiger Zugriff Name → Kunde mit Hydrierung bei Bedarf."""
+
+    def __init__(self, raw=None, index=None, loader=None, max_hydrated=KUNDEN_CACHE_MAX):
+        """Initialisiert die Registry.
+
+        Args:
+            raw (dict, optional): Rohe Kundendaten (Name → dict)
+            index (dict, optional): Index (Name → {'id', 'projekt', 'anlagen'}),
+                die Kunden werden bei Bedarf über loader geladen
+            loader: Callable(name) → dict, lädt einen Kunden aus dem Backend
+            max_hydrated (int): Maximale Anzahl gleichzeitig hydrierter Kunden
+        """
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._index = {}
+        self._hydrated = OrderedDict()  # LRU-Reihenfolge der hydrierten Kunden
+        self._loader = loader
+        self._pinned = None
+        self.max_hydrated = max(1, max_hydrated)
+
+        for name, entry in (index or {}).items():
+            self._entries[name] = _NICHT_GELADEN
+            self._index[name] = entry
+        for name, customer_data in (raw or {}).items():
+            self._entries[name] = customer_data
+
+    # ==================== Mapping ====================
+
+    def __getitem__(self, name):
+        with self._lock:
+            entry = self._entries[name]
+            if not isinstance(entry, Kunde):
+                if entry is _NICHT_GELADEN:
+                    entry = self._loader(name)
+                entry = kunde_from_dict(entry)
+                self._entries[name] = entry
+                self._index.pop(name, None)
+            self._touch(name)
+            return entry
+
+    def __setitem__(self, name, kunde):
+        with self._lock:
+            self._entries[name] = kunde
+            self._index.pop(name, None)
+            if isinstance(kunde, Kunde):
+                self._touch(name)
+
+    def __delitem__(self, name):
+        with self._lock:
+            del self._entries[name]
+            self._index.pop(name, None)
+            self._hydrated.pop(name, None)
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    # ==================== Lazy Loading ====================
+
+    def pin(self, name):
+        """Schützt einen Kunden (den aktiven) vor dem Verdrängen."""
+        with self._lock:
+            self._pinned = name
+
+    def is_hydrated(self, name):
+        """Gibt zurück, ob der Kunde gerade als Dataclass vorliegt."""
+        return isinstance(self._entries.get(name), Kunde)
+
+    def anlagen_count(self, name):
+        """Anzahl der Anlagen eines Kunden, ohne ihn zu hydrieren."""
+        with self._lock:
+            entry = self._entries[name]
+            if isinstance(entry, Kunde):
+                return len(entry.anlagen)
+            if entry is _NICHT_GELADEN:
+                return self._index[name].get('anlagen', 0)
+            return len(entry.get('anlagen', []))
+
+    def to_dict(self, name):
+        """Speicherbares Dict eines Kunden, ohne ihn zu hydrieren.
+
+        Für unveränderte Kunden wird dasselbe Dict-Objekt wie beim letzten
+        Aufruf geliefert (nicht verändern).
+        """
+        with self._lock:
+            entry = self._entries[name]
+            if isinstance(entry, Kunde):
+                return kunde_to_dict_cached(entry)
+            if entry is _NICHT_GELADEN:
+                return self._loader(name)
+            return entry
+
+    def snapshot(self, dirty_keys=None, bekannt=()):
+        """Liefert alle Kunden als speicherbare Dicts (für den SaveService).
+
+        Nicht geladene Kunden, die nicht in dirty_keys stehen, sind unverändert
+        und erscheinen nur mit ihrem Index-Eintrag; die Backends mit Index
+        ('sharded', 'sqlite') schreiben sie ohnehin nicht neu.
+
+        Args:
+            dirty_keys (set, optional): Geänderte Kundennamen. None = alle
+                Kunden werden vollständig geliefert.
+            bekannt (set, optional): Kunden, deren Daten der Aufrufer schon
+                hat; ohne Eintrag in dirty_keys erscheinen sie mit None
+
+        Returns:
+            dict: Name → Kundendaten (bzw. None)
+        """
+        with self._lock:
+            out = {}
+            for name, entry in self._entries.items():
+                if dirty_keys is not None and name not in dirty_keys and name in bekannt:
+                    out[name] = None
+                elif entry is _NICHT_GELADEN and dirty_keys is not None and name not in dirty_keys:
+                    out[name] = self._index[name]
+                else:
+                    out[name] = self.to_dict(name)
+            return out
+
+    def _touch(self, name):
+        """Markiert einen Kunden als zuletzt benutzt und verdrängt alte."""
+        self._hydrated[name] = True
+        self._hydrated.move_to_end(name)
+        while len(self._hydrated) > self.max_hydrated:
+            alt = next((n for n in self._hydrated if n not in (name, self._pinned)), None)
+            if alt is None:
+                break
+            del self._hydrated[alt]
+            entry = self._entries.get(alt)
+            if isinstance(entry, Kunde):
+                self._entries[alt] = kunde_to_dict_cached(entry)
+
+
+if __name__ == "__main__":
+    pass
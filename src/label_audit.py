@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Flottenweite Prüfung der Beschriftungen (z.B. vor einer Wartungskampagne).
+
+Für jede Anlage aller Kunden werden ermittelt:
+
+    fehler                  wie im Editor (ungültiges Format, Spalten nicht
+                            erkennbar, außerhalb Bereich, bereits belegt)
+    mehrfach_spalten        Spalten, die von mehr als einer Zeile beansprucht werden
+    belegt / frei           Spalten der gültigen Zeilen
+    auslastung_prozent      belegt / (felder × reihen × COLUMNS_PER_UNIT)
+    volle_einheiten         Einheiten (COLUMNS_PER_UNIT Spalten) ohne freie Spalte
+    groesster_freier_block  längster zusammenhängender freier Bereich
+    fast_voll               Auslastung ≥ Schwelle
+
+Die Zeilen werden einmal zerlegt (label_parser). Die Statistik rechnet mit
+NumPy auf einer Belegungs-Bitmap aller Anlagen gleichzeitig (jede Anlage
+ein Abschnitt felder × reihen × COLUMNS_PER_UNIT, getrennt durch eine leere
+Einheit). Ohne NumPy wird dieselbe Statistik über die Intervalle berechnet.
+
+Aufruf (Bericht als CSV im Export-Ordner des Datenverzeichnisses):
+    python label_audit.py DATENPFAD [--schwelle PROZENT] [--ohne-numpy]
+"""
+
+import argparse
+import csv
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+
+# NumPy optional für die vektorisierte Statistik
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from column_intervals import SpaltenBelegung, ausserhalb_bereich
+from constants import AUDIT_DATEIPRAEFIX, AUDIT_FAST_VOLL_PROZENT, COLUMNS_PER_UNIT
+from label_parser import FEHLER_FORMAT, FEHLER_SPALTEN, tokenize_text
+
+REPORT_FELDER = (
+    'kunde', 'anlage_id', 'code', 'beschreibung', 'felder', 'reihen', 'max_spalten',
+    'zeilen', 'fehler', 'ungueltiges_format', 'spalten_unlesbar', 'ausserhalb', 'doppelt',
+    'mehrfach_spalten', 'belegt', 'frei', 'auslastung_prozent',
+    'volle_einheiten', 'einheiten', 'groesster_freier_block', 'fast_voll',
+)
+
+
+# ==================== Zerlegen ====================
+
+def _zerlege(kundenname, anlage):
+    """Prüft die Zeilen einer Anlage.
+
+    Returns:
+        tuple: (zeile: dict, kandidaten: list, gueltige: list) – Intervalle
+            der Zeilen im Bereich bzw. der gültigen Zeilen, flach als
+            [start, stop, start, stop, ...] (halboffen)
+    """
+    felder = anlage.get('felder', 3)
+    reihen = anlage.get('reihen', 7)
+    max_spalten = max(0, felder * reihen * COLUMNS_PER_UNIT)
+    zeile = {
+        'kunde': kundenname,
+        'anlage_id': anlage.get('id', ''),
+        'code': anlage.get('code', ''),
+        'beschreibung': anlage.get('beschreibung', ''),
+        'felder': felder,
+        'reihen': reihen,
+        'max_spalten': max_spalten,
+        'zeilen': 0,
+        'ungueltiges_format': 0,
+        'spalten_unlesbar': 0,
+        'ausserhalb': 0,
+        'doppelt': 0,
+    }
+
+    belegung = SpaltenBelegung()
+    kandidaten = []
+    for eintrag in tokenize_text(anlage.get('text_inhalt') or ''):
+        zeile['zeilen'] += 1
+        if eintrag.fehler == FEHLER_FORMAT:
+            zeile['ungueltiges_format'] += 1
+        elif eintrag.fehler == FEHLER_SPALTEN:
+            zeile['spalten_unlesbar'] += 1
+        elif ausserhalb_bereich(eintrag.spalten, max_spalten):
+            zeile['ausserhalb'] += 1
+        else:
+            kandidaten += (eintrag.spalten.start, eintrag.spalten.stop)
+            # Wer zuerst kommt, belegt – wie validiere_eintraege
+            if belegung.konflikte(eintrag.spalten):
+                zeile['doppelt'] += 1
+            else:
+                belegung.belegen(eintrag.spalten)
+
+    zeile['fehler'] = (zeile['ungueltiges_format'] + zeile['spalten_unlesbar']
+                       + zeile['ausserhalb'] + zeile['doppelt'])
+    gueltige = [grenze for von, bis in belegung.intervalle() for grenze in (von, bis + 1)]
+    return zeile, kandidaten, gueltige
+
+
+# ==================== Statistik ====================
+
+def _statistik_numpy(zerlegt):
+    """Belegungsstatistik aller Anlagen auf einer gemeinsamen Bitmap."""
+    groessen = np.array([z['max_spalten'] for z, _k, _g in zerlegt], dtype=np.int64)
+    abschnitte = groessen + COLUMNS_PER_UNIT  # plus leere Trenn-Einheit
+    offsets = np.concatenate(([0], np.cumsum(abschnitte)[:-1]))
+    gesamt = int(abschnitte.sum())
+
+    def abdeckung(listen):
+        """Anzahl Zeilen pro Spalte (Differenz-Array + kumulierte Summe)."""
+        basis = np.repeat(offsets - 1, [len(l) // 2 for l in listen])  # Spalte 1 am Abschnittsanfang
+        intervalle = np.fromiter(chain.from_iterable(listen), dtype=np.int64).reshape(-1, 2)
+        diff = (np.bincount(basis + intervalle[:, 0], minlength=gesamt + 1)
+                - np.bincount(basis + intervalle[:, 1], minlength=gesamt + 1))
+        return np.cumsum(diff[:-1])
+
+    belegt = abdeckung([g for _z, _k, g in zerlegt]) > 0
+    mehrfach = abdeckung([k for _z, k, _g in zerlegt]) > 1
+
+    # Einheiten: alle Abschnitte sind Vielfache von COLUMNS_PER_UNIT
+    einheit_offsets = offsets // COLUMNS_PER_UNIT
+    voll = belegt.reshape(-1, COLUMNS_PER_UNIT).all(axis=1)
+
+    # Freie Blöcke: Trenn-Einheiten zählen nicht als frei
+    position = np.arange(gesamt) - np.repeat(offsets, abschnitte)
+    frei = ~belegt & (position < np.repeat(groessen, abschnitte))
+    kanten = np.diff(np.concatenate(([0], frei.view(np.int8), [0])))
+    starts = np.flatnonzero(kanten == 1)
+    laengen = np.flatnonzero(kanten == -1) - starts
+    groesster = np.zeros(len(zerlegt), dtype=np.int64)
+    np.maximum.at(groesster, np.searchsorted(offsets, starts, side='right') - 1, laengen)
+
+    return [
+        {
+            'belegt': int(b),
+            'mehrfach_spalten': int(m),
+            'volle_einheiten': int(v),
+            'groesster_freier_block': int(g),
+        }
+        for b, m, v, g in zip(
+            np.add.reduceat(belegt, offsets, dtype=np.int64),
+            np.add.reduceat(mehrfach, offsets, dtype=np.int64),
+            np.add.reduceat(voll, einheit_offsets, dtype=np.int64),
+            groesster,
+        )
+    ]
+
+
+def _statistik_python(zerlegt):
+    """Dieselbe Statistik wie _statistik_numpy, über die Intervalle."""
+    ergebnisse = []
+    for zeile, kandidaten, gueltige in zerlegt:
+        max_spalten = zeile['max_spalten']
+        kandidaten = list(zip(kandidaten[::2], kandidaten[1::2]))
+        gueltige = list(zip(gueltige[::2], gueltige[1::2]))
+
+        pro_einheit = {}
+        for start, stop in gueltige:
+            for einheit in range((start - 1) // COLUMNS_PER_UNIT, (stop - 2) // COLUMNS_PER_UNIT + 1):
+                von = max(start, einheit * COLUMNS_PER_UNIT + 1)
+                bis = min(stop, (einheit + 1) * COLUMNS_PER_UNIT + 1)
+                pro_einheit[einheit] = pro_einheit.get(einheit, 0) + bis - von
+
+        groesster, naechste_freie = 0, 1
+        for start, stop in gueltige:  # sortiert und disjunkt
+            groesster = max(groesster, start - naechste_freie)
+            naechste_freie = stop
+        groesster = max(groesster, max_spalten + 1 - naechste_freie)
+
+        # Sweep über die Intervallgrenzen aller Kandidaten
+        ereignisse = sorted([(start, 1) for start, _stop in kandidaten]
+                            + [(stop, -1) for _start, stop in kandidaten])
+        mehrfach, anzahl, letzte = 0, 0, None
+        for position, delta in ereignisse:
+            if anzahl > 1:
+                mehrfach += position - letzte
+            anzahl += delta
+            letzte = position
+
+        ergebnisse.append({
+            'belegt': sum(stop - start for start, stop in gueltige),
+            'mehrfach_spalten': mehrfach,
+            'volle_einheiten': sum(1 for n in pro_einheit.values() if n == COLUMNS_PER_UNIT),
+            'groesster_freier_block': groesster,
+        })
+    return ergebnisse
+
+
+# ==================== API ====================
+
+def audit_anlagen(all_customers, schwelle=AUDIT_FAST_VOLL_PROZENT, use_numpy=None):
+    """Prüft alle Anlagen aller Kunden.
+
+    Args:
+        all_customers (dict): Kundenname → Kundendaten (dict mit 'anlagen')
+        schwelle (float): Auslastung in Prozent, ab der 'fast_voll' gilt
+        use_numpy (bool, optional): None = NumPy verwenden, falls installiert
+
+    Returns:
+        list: Ein dict pro Anlage mit den Schlüsseln aus REPORT_FELDER
+    """
+    zerlegt = [
+        _zerlege(kundenname, anlage)
+        for kundenname, customer_data in all_customers.items()
+        for anlage in customer_data.get('anlagen', [])
+    ]
+    if not zerlegt:
+        return []
+
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE
+    statistik = _statistik_numpy(zerlegt) if use_numpy else _statistik_python(zerlegt)
+
+    zeilen = []
+    for (zeile, _k, _g), werte in zip(zerlegt, statistik):
+        zeile.update(werte)
+        max_spalten = zeile['max_spalten']
+        zeile['frei'] = max_spalten - zeile['belegt']
+        zeile['einheiten'] = max_spalten // COLUMNS_PER_UNIT
+        zeile['auslastung_prozent'] = round(100.0 * zeile['belegt'] / max_spalten, 1) if max_spalten else 0.0
+        zeile['fast_voll'] = zeile['auslastung_prozent'] >= schwelle
+        zeilen.append(zeile)
+    return zeilen
+
+
+def zusammenfassung(zeilen):
+    """Kennzahlen über alle geprüften Anlagen.
+
+    Returns:
+        dict: anlagen, mit_fehlern, fehler, mit_mehrfachbelegung, fast_voll,
+            mittlere_auslastung_prozent
+    """
+    anzahl = len(zeilen)
+    return {
+        'anlagen': anzahl,
+        'mit_fehlern': sum(1 for z in zeilen if z['fehler']),
+        'fehler': sum(z['fehler'] for z in zeilen),
+        'mit_mehrfachbelegung': sum(1 for z in zeilen if z['mehrfach_spalten']),
+        'fast_voll': sum(1 for z in zeilen if z['fast_voll']),
+        'mittlere_auslastung_prozent': (
+            round(sum(z['auslastung_prozent'] for z in zeilen) / anzahl, 1) if anzahl else 0.0
+        ),
+    }
+
+
+def schreibe_report(zeilen, export_dir):
+    """Schreibt den Bericht als CSV (Semikolon, UTF-8 mit BOM für Tabellenkalkulationen).
+
+    Args:
+        zeilen (list): Ergebnis von audit_anlagen()
+        export_dir (Path): Export-Ordner
+
+    Returns:
+        Path: Pfad zur geschriebenen Datei
+    """
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    pfad = export_dir / f'{AUDIT_DATEIPRAEFIX}_{timestamp}.csv'
+    with open(pfad, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FELDER, delimiter=';')
+        writer.writeheader()
+        writer.writerows(zeilen)
+    return pfad
+
+
+def main(argv=None):
+    """Kommandozeile: Audit über das Datenverzeichnis, Bericht in <Datenpfad>/Export."""
+    from data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description='Prüft die Beschriftungen aller Anlagen.')
+    parser.add_argument('datenpfad', type=Path, help='Datenverzeichnis der App')
+    parser.add_argument('--schwelle', type=float, default=AUDIT_FAST_VOLL_PROZENT,
+                        help='Auslastung in Prozent, ab der ein Verteiler als fast voll gilt')
+    parser.add_argument('--ohne-numpy', action='store_true', help='NumPy nicht verwenden')
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.datenpfad)
+    data_manager.load_settings()
+    all_customers, _next_id = data_manager.load_data(read_only=True)
+
+    zeilen = audit_anlagen(all_customers, args.schwelle, use_numpy=False if args.ohne_numpy else None)
+    pfad = schreibe_report(zeilen, args.datenpfad / 'Export')
+
+    summe = zusammenfassung(zeilen)
+    print(f"{summe['anlagen']} Anlagen geprüft, {summe['mit_fehlern']} mit Fehlern "
+          f"({summe['fehler']} fehlerhafte Zeilen), {summe['mit_mehrfachbelegung']} mit Mehrfachbelegung")
+    print(f"{summe['fast_voll']} fast voll (≥ {args.schwelle:g} %), "
+          f"mittlere Auslastung {summe['mittlere_auslastung_prozent']} %")
+    print(f"Bericht: {pfad}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
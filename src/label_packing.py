@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Anordnung der Beschriftungen in Reihen ohne Reihenumbruch.
+
+Eine Reihe hat COLUMNS_PER_UNIT Spalten. Ein Eintrag über ein Reihenende
+hinweg (z.B. "11-14 Herd") wird im Export abgeschnitten. Dieses Modul legt
+nicht fixierte Einträge so in die freien Lücken, dass kein Eintrag eine
+Reihengrenze überschreitet und möglichst wenige Reihen belegt sind
+(Bin-Packing mit den Lücken als Behältern).
+
+    Heuristik  First-Fit-Decreasing: breiteste Einträge zuerst, jeweils in
+               die engste passende Lücke einer bereits belegten Reihe,
+               sonst in die erste leere Reihe
+    Exakt      Branch-and-Bound über die Zuordnung zu Lücken, minimiert die
+               Anzahl neu belegter Reihen; für kleine Tafeln
+               (bis PACKING_EXAKT_MAX Einträge), sonst die Heuristik
+
+Fixierte Einträge behalten ihre Spalten. Standard: alle Einträge, die
+bereits innerhalb einer Reihe liegen – dann werden nur die umbrechenden
+Einträge verschoben.
+"""
+
+from column_intervals import SpaltenBelegung, ausserhalb_bereich
+from constants import COLUMNS_PER_UNIT, PACKING_EXAKT_MAX, PACKING_EXAKT_KNOTEN
+from label_parser import tokenize_text
+
+
+def bricht_um(spalten, reihenlaenge=COLUMNS_PER_UNIT):
+    """Gibt zurück, ob ein Spaltenbereich über ein Reihenende läuft."""
+    return (spalten.start - 1) // reihenlaenge != (spalten.stop - 2) // reihenlaenge
+
+
+# ==================== Packen ====================
+
+def packe(eintraege, max_spalten, reihenlaenge=COLUMNS_PER_UNIT, fixiert=None, exakt=None):
+    """Ordnet nicht fixierte Einträge ohne Reihenumbruch an.
+
+    Args:
+        eintraege (list): Spaltenbereiche (range) der gültigen Einträge,
+            disjunkt (wie in validiere_eintraege)
+        max_spalten (int): felder × reihen × reihenlaenge
+        reihenlaenge (int): Spalten pro Reihe
+        fixiert (set, optional): Indizes, die ihre Position behalten.
+            None = alle Einträge ohne Reihenumbruch
+        exakt (bool, optional): None = exakt bis PACKING_EXAKT_MAX Einträge
+
+    Returns:
+        dict: {'spalten': [range je Eintrag], 'verschoben': [Indizes],
+            'reihen': belegte Reihen, 'exakt': bool} oder None, wenn die
+            Einträge nicht in die Tafel passen
+    """
+    if fixiert is None:
+        fixiert = {i for i, spalten in enumerate(eintraege) if not bricht_um(spalten, reihenlaenge)}
+    # Breiter als eine Reihe geht nie ohne Umbruch → bleibt, wo es ist
+    fixiert = set(fixiert) | {i for i, spalten in enumerate(eintraege) if len(spalten) > reihenlaenge}
+
+    belegung = SpaltenBelegung()
+    for i in fixiert:
+        belegung.belegen(eintraege[i])
+    benutzt = {(spalten.start - 1) // reihenlaenge for i, spalten in enumerate(eintraege) if i in fixiert}
+
+    # Lücken je Reihe: [reihe, nächste freie Spalte, letzte Spalte]
+    luecken = []
+    for von, bis in belegung.freie_bereiche(max_spalten):
+        while von <= bis:
+            reihe = (von - 1) // reihenlaenge
+            ende = min(bis, (reihe + 1) * reihenlaenge)
+            luecken.append((reihe, von, ende))
+            von = ende + 1
+
+    # Breiteste zuerst; bei gleicher Breite in Textreihenfolge
+    offen = sorted((i for i in range(len(eintraege)) if i not in fixiert),
+                   key=lambda i: (-len(eintraege[i]), i))
+    breiten = [len(eintraege[i]) for i in offen]
+
+    if exakt is None:
+        exakt = len(offen) <= PACKING_EXAKT_MAX
+    zuordnung = _first_fit_decreasing(breiten, luecken, benutzt)
+    if exakt:
+        zuordnung = _branch_and_bound(breiten, luecken, benutzt, zuordnung, reihenlaenge) or zuordnung
+    if zuordnung is None:
+        return None
+
+    # Lücken von links auffüllen, in der Reihenfolge der Zuordnung
+    naechste = [von for _reihe, von, _ende in luecken]
+    spalten = list(eintraege)
+    for i, luecke in zip(offen, zuordnung):
+        spalten[i] = range(naechste[luecke], naechste[luecke] + len(eintraege[i]))
+        naechste[luecke] += len(eintraege[i])
+
+    return {
+        'spalten': spalten,
+        'verschoben': sorted(i for i in offen if spalten[i] != eintraege[i]),
+        'reihen': len({(s.start - 1) // reihenlaenge for s in spalten}),
+        'exakt': exakt,
+    }
+
+
+def _first_fit_decreasing(breiten, luecken, benutzt):
+    """Heuristik: engste passende Lücke in belegten Reihen, sonst neue Reihe.
+
+    Returns:
+        list: Lücken-Index je Breite, oder None wenn kein Platz
+    """
+    frei = [ende - von + 1 for _reihe, von, ende in luecken]
+    benutzt = set(benutzt)
+    zuordnung = []
+    for breite in breiten:
+        beste = None
+        for j, (reihe, _von, _ende) in enumerate(luecken):
+            if reihe in benutzt and frei[j] >= breite and (beste is None or frei[j] < frei[beste]):
+                beste = j
+        if beste is None:
+            # Erste Lücke einer noch leeren Reihe
+            beste = next((j for j, (reihe, _v, _e) in enumerate(luecken)
+                          if reihe not in benutzt and frei[j] >= breite), None)
+            if beste is None:
+                return None
+            benutzt.add(luecken[beste][0])
+        frei[beste] -= breite
+        zuordnung.append(beste)
+    return zuordnung
+
+
+def _branch_and_bound(breiten, luecken, benutzt, obere_schranke, reihenlaenge):
+    """Exakte Zuordnung mit minimaler Anzahl neu belegter Reihen.
+
+    Args:
+        obere_schranke (list): Bekannte Lösung (Heuristik) oder None
+        reihenlaenge (int): Spalten pro Reihe (Kapazität einer leeren Reihe)
+
+    Returns:
+        list: Lücken-Index je Breite, oder None (keine bessere Lösung / Abbruch)
+    """
+    frei = [ende - von + 1 for _reihe, von, ende in luecken]
+    reihe_von = [reihe for reihe, _v, _e in luecken]
+    leere_reihen = sorted({r for r in reihe_von if r not in benutzt})
+    luecken_der_reihe = {}
+    for j, reihe in enumerate(reihe_von):
+        luecken_der_reihe.setdefault(reihe, []).append(j)
+
+    def neue_reihen(zuordnung):
+        return len({reihe_von[j] for j in zuordnung} - set(benutzt))
+
+    beste = {'kosten': neue_reihen(obere_schranke) if obere_schranke else len(leere_reihen) + 1,
+             'zuordnung': None}
+    rest = [sum(breiten[k:]) for k in range(len(breiten) + 1)]
+    knoten = [0]
+    zuordnung = []
+    offen_reihen = set(benutzt)
+
+    def suche(k, geoeffnet):
+        knoten[0] += 1
+        if knoten[0] > PACKING_EXAKT_KNOTEN:
+            return
+        if k == len(breiten):
+            if geoeffnet < beste['kosten']:
+                beste['kosten'] = geoeffnet
+                beste['zuordnung'] = list(zuordnung)
+            return
+        # Schranke: was nicht in offene Reihen passt, braucht neue volle Reihen
+        kapazitaet = sum(frei[j] for r in offen_reihen for j in luecken_der_reihe.get(r, ()))
+        fehlt = max(0, rest[k] - kapazitaet)
+        if geoeffnet + -(-fehlt // reihenlaenge) >= beste['kosten']:
+            return
+
+        breite = breiten[k]
+        versucht = set()
+        for r in sorted(offen_reihen):
+            for j in luecken_der_reihe.get(r, ()):
+                # Gleich große Lücken sind austauschbar
+                if frei[j] >= breite and frei[j] not in versucht:
+                    versucht.add(frei[j])
+                    frei[j] -= breite
+                    zuordnung.append(j)
+                    suche(k + 1, geoeffnet)
+                    zuordnung.pop()
+                    frei[j] += breite
+        # Neue Reihe öffnen: leere Reihen sind gleichwertig → nur die erste
+        reihe = next((r for r in leere_reihen if r not in offen_reihen), None)
+        if reihe is not None and geoeffnet + 1 < beste['kosten']:
+            j = luecken_der_reihe[reihe][0]
+            if frei[j] >= breite:
+                offen_reihen.add(reihe)
+                frei[j] -= breite
+                zuordnung.append(j)
+                suche(k + 1, geoeffnet + 1)
+                zuordnung.pop()
+                frei[j] += breite
+                offen_reihen.discard(reihe)
+
+    suche(0, 0)
+    return beste['zuordnung']
+
+
+# ==================== Text ====================
+
+def _spalten_text(spalten, vorlage):
+    """Spaltenangabe im Stil der ursprünglichen Angabe ("N", "A-B" oder "A+N")."""
+    if len(spalten) == 1 and '+' not in vorlage:
+        return str(spalten.start)
+    if '+' in vorlage:
+        return f'{spalten.start}+{len(spalten) - 1}'
+    return f'{spalten.start}-{spalten[-1]}'
+
+
+def packe_text(text_inhalt, felder, reihen, alle=False, exakt=None):
+    """Schlägt eine Anordnung für den Editortext einer Anlage vor.
+
+    Gültig sind die Zeilen wie in validiere_eintraege (wer zuerst kommt,
+    belegt); fehlerhafte Zeilen bleiben unverändert.
+
+    Args:
+        text_inhalt (str): Beschriftungen (zeilenweise)
+        felder (int): Anzahl Felder
+        reihen (int): Anzahl Reihen
+        alle (bool): Alle Einträge neu packen statt nur umbrechende
+        exakt (bool, optional): Siehe packe()
+
+    Returns:
+        dict: {'text': neuer Text, 'aenderungen': [(alt, neu), ...] Zeilen,
+            'reihen': belegte Reihen, 'exakt': bool} oder None, wenn kein
+            Platz ist
+    """
+    max_spalten = felder * reihen * COLUMNS_PER_UNIT
+    belegung = SpaltenBelegung()
+    gueltige = []  # LabelEintrag der gültigen Zeilen
+    for eintrag in tokenize_text(text_inhalt):
+        spalten = eintrag.spalten
+        if (spalten and not ausserhalb_bereich(spalten, max_spalten)
+                and not belegung.konflikte(spalten)):
+            belegung.belegen(spalten)
+            gueltige.append(eintrag)
+
+    ergebnis = packe([e.spalten for e in gueltige], max_spalten,
+                     fixiert=set() if alle else None, exakt=exakt)
+    if ergebnis is None:
+        return None
+
+    zeilen = text_inhalt.split('\n')
+    aenderungen = []
+    for i in ergebnis['verschoben']:
+        eintrag = gueltige[i]
+        alt = zeilen[eintrag.zeile - 1]
+        neu = alt[:eintrag.start] + _spalten_text(ergebnis['spalten'][i], eintrag.spalten_str) + alt[eintrag.ende:]
+        zeilen[eintrag.zeile - 1] = neu
+        aenderungen.append((alt.strip(), neu.strip()))
+
+    return {
+        'text': '\n'.join(zeilen),
+        'aenderungen': aenderungen,
+        'reihen': ergebnis['reihen'],
+        'exakt': ergebnis['exakt'],
+    }
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kompilierter Parser für Beschriftungszeilen.
+
+Grammatik einer Zeile (führende/abschließende Leerzeichen egal):
+
+    zeile      := spalten trenner* beschreibung
+    spalten    := N | A-B | A+N        (A+N = Spalten A bis A+N)
+    trenner    := Leerzeichen, Tab oder ';'
+    beschreibung := beliebiger Text; linebreak_char teilt ihn in Segmente
+                    (eine Textzeile pro Segment in der Zelle)
+
+Jede Zeile wird mit einem einzigen vorkompilierten Ausdruck zerlegt; die
+Spaltenangabe wird danach über Zeichenklassen (isdecimal, partition)
+ausgewertet – ohne split() und ohne Ausnahmen als Kontrollfluss. Das
+Ergebnis ist ein LabelEintrag mit Zeichenpositionen, bei Fehlern zeigen
+start/ende auf die fehlerhafte Stelle.
+
+Die Ergebnisse entsprechen exakt dem bisherigen parse_zeile/parse_spalten
+(siehe odf_exporter), die jetzt auf diesem Parser aufsetzen.
+"""
+
+import re
+from functools import partial
+from typing import NamedTuple, Optional
+
+# Fehlerarten
+FEHLER_FORMAT = 'format'      # Keine Spaltenangabe am Zeilenanfang
+FEHLER_SPALTEN = 'spalten'    # Spaltenangabe nicht auswertbar (z.B. "5-3", "1+2+3")
+
+# Spaltenangabe = Ziffern, '-' und '+' am Zeilenanfang; ihre Struktur prüft _bereich()
+_ZEILE = re.compile(r'\s*([\d+-]+)[\s;]*(.*)')
+
+
+class LabelEintrag(NamedTuple):
+    """Ergebnis für eine nicht leere Zeile."""
+    zeile: int                  # Zeilennummer (1-basiert)
+    spalten: Optional[range]    # Spaltenbereich, None bei Fehler
+    spalten_str: str            # Spaltenangabe wie eingegeben ('' bei FEHLER_FORMAT)
+    beschreibung: str
+    fehler: Optional[str]       # None, FEHLER_FORMAT oder FEHLER_SPALTEN
+    start: int                  # Zeichenposition der Spaltenangabe bzw. Fehlerstelle
+    ende: int                   # Position nach der Spaltenangabe bzw. Fehlerstelle
+
+    def segmente(self, linebreak_char=';'):
+        """Beschreibung aufgeteilt an linebreak_char (wie in der Zelle)."""
+        if linebreak_char and linebreak_char in self.beschreibung:
+            return [teil.strip() for teil in self.beschreibung.split(linebreak_char)]
+        return [self.beschreibung]
+
+
+# Direkter Konstruktor ohne die Argumentprüfung von LabelEintrag.__new__ (heißer Pfad)
+_neuer_eintrag = partial(tuple.__new__, LabelEintrag)
+
+
+def tokenize_zeile(zeile, zeilen_nr=1):
+    """Zerlegt eine Zeile in einem Durchgang.
+
+    Args:
+        zeile (str): Eingabezeile
+        zeilen_nr (int): Zeilennummer für das Ergebnis
+
+    Returns:
+        LabelEintrag: Ergebnis, oder None für leere Zeilen
+    """
+    m = _ZEILE.match(zeile)
+    if m is None:
+        if not zeile.strip():
+            return None
+        start = len(zeile) - len(zeile.lstrip())
+        return LabelEintrag(zeilen_nr, None, '', '', FEHLER_FORMAT, start, len(zeile.rstrip()))
+
+    spalten_str, text = m.groups()
+    start = m.start(1)
+    spalten = _bereich(spalten_str)
+    return _neuer_eintrag((zeilen_nr, spalten, spalten_str, text.strip(),
+                           None if spalten else FEHLER_SPALTEN, start, start + len(spalten_str)))
+
+
+def parse_spalten_str(spalten_str):
+    """Wertet eine einzelne Spaltenangabe aus ("1", "3-6", "7+5").
+
+    Returns:
+        range: Spaltenbereich oder None bei Fehler
+    """
+    return _bereich(spalten_str)
+
+
+def _ist_zahl(text):
+    """Ganzzahl mit optionalem Minus (wie int() sie für 'A+N' akzeptiert)."""
+    return text.isdecimal() or (text[:1] == '-' and text[1:].isdecimal())
+
+
+def _bereich(spalten_str):
+    """Spaltenbereich einer Spaltenangabe (None = ungültig)."""
+    if spalten_str.isdecimal():
+        wert = int(spalten_str)
+        return range(wert, wert + 1)
+    von, plus, anzahl = spalten_str.partition('+')
+    if plus:
+        if not (_ist_zahl(von) and _ist_zahl(anzahl)):
+            return None
+        # Bei 'X+Y' soll X bis X+Y gehen, also Y+1 Zahlen
+        von = int(von)
+        return range(von, von + int(anzahl) + 1) or None
+    von, minus, bis = spalten_str.partition('-')
+    if minus and von.isdecimal() and bis.isdecimal():
+        von, bis = int(von), int(bis)
+        return range(von, bis + 1) if von <= bis else None
+    return None
+
+
+def tokenize_text(text_inhalt):
+    """Zerlegt einen mehrzeiligen Text.
+
+    Args:
+        text_inhalt (str): Text mit einer Beschriftung pro Zeile
+
+    Returns:
+        list: LabelEintrag für jede nicht leere Zeile, in Textreihenfolge
+    """
+    eintraege = []
+    for zeilen_nr, zeile in enumerate(text_inhalt.split('\n'), 1):
+        eintrag = tokenize_zeile(zeile, zeilen_nr)
+        if eintrag is not None:
+            eintraege.append(eintrag)
+    return eintraege
+
+
+if __name__ == "__main__":
+    pass
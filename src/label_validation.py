@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Inkrementelle Validierung der Beschriftungszeilen im Editor.
+
+IncrementalValidator liefert dasselbe Ergebnis wie
+odf_exporter.validiere_eintraege, merkt sich aber den Stand des letzten
+Aufrufs. Bei einer Änderung werden nur die geänderten Zeilen (Diff über
+gemeinsamen Anfang und gemeinsames Ende) neu geparst. Die Spaltenbelegung
+wird als Intervalle mit der jeweils belegenden Zeile nachgeführt (siehe
+column_intervals): Ändert sich die Gültigkeit einer Zeile, werden nur die
+späteren Zeilen mit überlappenden Spalten neu geprüft (in Zeilenreihenfolge,
+"wer zuerst kommt").
+
+Pro geöffneter Anlage wird ein Validator gehalten; ändern sich Felder,
+Reihen oder die Sprache, rechnet er einmal komplett neu.
+"""
+
+import heapq
+
+from column_intervals import IntervallIndex, SpaltenBelegung, ausserhalb_bereich, format_bereiche
+from constants import COLUMNS_PER_UNIT, _, ts
+from label_parser import FEHLER_FORMAT, FEHLER_SPALTEN, tokenize_zeile
+
+# Zeilenarten (unabhängig von anderen Zeilen)
+_LEER = 0
+_FORMAT = 1      # parse_zeile fehlgeschlagen
+_SPALTEN = 2     # parse_spalten fehlgeschlagen
+_BEREICH = 3     # Spalte(n) außerhalb 1..max_spalten
+_KANDIDAT = 4    # Gültig, sofern keine frühere Zeile die Spalten belegt
+
+
+class _Zeile:
+    """Eine Editorzeile mit ihrem Parse- und Prüfergebnis."""
+
+    __slots__ = ('text', 'pos', 'art', 'spalten', 'eintrag', 'gueltig', 'fehler', 'entfernt')
+
+    def __init__(self, text, pos, max_spalten):
+        self.text = text
+        self.pos = pos
+        self.entfernt = False    # Aus dem Text gelöscht (nicht mehr prüfen)
+        self.spalten = None
+        self.eintrag = None
+        self.gueltig = False
+        self.fehler = None
+
+        eintrag = tokenize_zeile(text)
+        if eintrag is None:
+            self.art = _LEER
+            return
+        anzeige = f'"{text.strip()}"'
+        if eintrag.fehler == FEHLER_FORMAT:
+            self.art = _FORMAT
+            self.fehler = _('{zeile} - Ungültiges Format').format(zeile=anzeige)
+            return
+        spalten = eintrag.spalten
+        if eintrag.fehler == FEHLER_SPALTEN:
+            self.art = _SPALTEN
+            self.fehler = _('{zeile} - Spalten nicht erkennbar').format(zeile=anzeige)
+            return
+        ungueltige = ausserhalb_bereich(spalten, max_spalten)
+        if ungueltige:
+            self.art = _BEREICH
+            self.fehler = _('{zeile} - Spalte(n) {spalten} außerhalb Bereich (1-{max})').format(
+                zeile=anzeige,
+                spalten=format_bereiche(ungueltige),
+                max=max_spalten
+            )
+            return
+        self.art = _KANDIDAT
+        self.spalten = spalten
+        self.eintrag = {
+            'spalten_liste': spalten,
+            'beschreibung': eintrag.beschreibung,
+            'spalten_str': eintrag.spalten_str
+        }
+
+
+class IncrementalValidator:
+    """Validiert den Editortext einer Anlage inkrementell."""
+
+    def __init__(self):
+        self._zeilen = []        # _Zeile in Textreihenfolge
+        self._besitzer = SpaltenBelegung()   # Intervalle gültiger Zeilen (Wert: _Zeile)
+        self._anwaerter = IntervallIndex()   # Intervalle aller Kandidaten-Zeilen
+        self._max_spalten = None
+        self._locale = None
+        self.neu_geparst = 0     # Statistik: geparste Zeilen beim letzten Aufruf
+
+    def reset(self):
+        """Verwirft den gemerkten Stand (nächster Aufruf rechnet komplett)."""
+        self._zeilen = []
+        self._besitzer = SpaltenBelegung()
+        self._anwaerter = IntervallIndex()
+        self._max_spalten = None
+
+    def validate(self, text_inhalt, felder, reihen):
+        """Validiert den Text wie odf_exporter.validiere_eintraege.
+
+        Die Dicts in gueltige_eintraege werden zwischen Aufrufen geteilt und
+        dürfen nicht verändert werden.
+
+        Args:
+            text_inhalt (str): Text mit allen Einträgen (zeilenweise)
+            felder (int): Anzahl Felder
+            reihen (int): Anzahl Reihen
+
+        Returns:
+            tuple: (is_valid: bool, gueltige_eintraege: list, fehler_anzahl: int,
+                    belegte_spalten: SpaltenBelegung, max_spalten: int, fehler_details: list)
+        """
+        max_spalten = felder * reihen * COLUMNS_PER_UNIT
+        locale = ts.get_locale()
+        if max_spalten != self._max_spalten or locale != self._locale:
+            # Bereichs- und Fehlertexte hängen davon ab → komplett neu
+            self.reset()
+            self._max_spalten = max_spalten
+            self._locale = locale
+
+        self._aktualisiere(text_inhalt.split('\n'))
+
+        gueltige_eintraege = [z.eintrag for z in self._zeilen if z.gueltig]
+        fehler_details = [z.fehler for z in self._zeilen if z.fehler]
+        fehler_anzahl = len(fehler_details)
+        return (fehler_anzahl == 0, gueltige_eintraege, fehler_anzahl,
+                self._besitzer.copy(), max_spalten, fehler_details)
+
+    # ==================== Diff ====================
+
+    def _aktualisiere(self, neue_texte):
+        alte = self._zeilen
+        n_alt, n_neu = len(alte), len(neue_texte)
+
+        # Gemeinsamer Anfang und gemeinsames Ende bleiben unangetastet
+        anfang = 0
+        grenze = min(n_alt, n_neu)
+        while anfang < grenze and alte[anfang].text == neue_texte[anfang]:
+            anfang += 1
+        ende = 0
+        grenze -= anfang
+        while ende < grenze and alte[n_alt - 1 - ende].text == neue_texte[n_neu - 1 - ende]:
+            ende += 1
+
+        entfernt = alte[anfang:n_alt - ende]
+        neu = [_Zeile(text, anfang + i, self._max_spalten)
+               for i, text in enumerate(neue_texte[anfang:n_neu - ende])]
+        self.neu_geparst = len(neu)
+        if not entfernt and not neu:
+            return
+
+        alte[anfang:n_alt - ende] = neu
+        if n_alt != n_neu:
+            for pos in range(anfang + len(neu), n_neu):
+                alte[pos].pos = pos
+
+        # Erst alle entfernten Zeilen austragen – sonst würden sie beim
+        # Einreihen der Nachfolger einer anderen entfernten Zeile wieder geprüft
+        entfernte_kandidaten = [zeile for zeile in entfernt if zeile.art == _KANDIDAT]
+        for zeile in entfernt:
+            zeile.entfernt = True
+        for zeile in entfernte_kandidaten:
+            self._anwaerter.remove(zeile.spalten, zeile)
+            if zeile.gueltig:
+                self._besitzer.freigeben(zeile.spalten, zeile)
+                zeile.gueltig = False
+
+        # Spätere Zeilen mit denselben Spalten neu prüfen
+        warteschlange = []
+        for zeile in entfernte_kandidaten:
+            zeile.pos = anfang - 1
+            self._nachfolger_einreihen(zeile, warteschlange)
+        for zeile in neu:
+            if zeile.art == _KANDIDAT:
+                self._anwaerter.add(zeile.spalten, zeile)
+                heapq.heappush(warteschlange, (zeile.pos, id(zeile), zeile))
+            # Andere Zeilenarten: Fehler steht fest, beeinflusst keine anderen Zeilen
+
+        self._abarbeiten(warteschlange)
+
+    # ==================== Belegung ====================
+
+    def _abarbeiten(self, warteschlange):
+        """Prüft eingereihte Zeilen in Textreihenfolge."""
+        erledigt = set()
+        while warteschlange:
+            _pos, key, zeile = heapq.heappop(warteschlange)
+            if key in erledigt or zeile.entfernt:
+                continue
+            erledigt.add(key)
+            self._pruefe(zeile, warteschlange)
+
+    def _pruefe(self, zeile, warteschlange):
+        """Bestimmt, ob eine Kandidaten-Zeile gültig ist (frühere Zeilen stehen fest)."""
+        doppelt = []
+        spaetere = []
+        for von, bis, besitzer in self._besitzer.ueberlappungen(zeile.spalten):
+            if besitzer.pos < zeile.pos:
+                doppelt.append((von, bis))
+            elif besitzer is not zeile:
+                spaetere.append(besitzer)
+        war_gueltig = zeile.gueltig
+
+        if doppelt:
+            self._besitzer.freigeben(zeile.spalten, zeile)
+            zeile.gueltig = False
+            zeile.fehler = _('{zeile} - Spalte(n) {spalten} bereits belegt').format(
+                zeile=f'"{zeile.text.strip()}"',
+                spalten=format_bereiche(doppelt)
+            )
+        else:
+            # Spätere Zeilen verlieren die Spalten und werden neu geprüft
+            for besitzer in spaetere:
+                self._besitzer.freigeben(besitzer.spalten, besitzer)
+                heapq.heappush(warteschlange, (besitzer.pos, id(besitzer), besitzer))
+            if not war_gueltig:
+                self._besitzer.belegen(zeile.spalten, zeile)
+            zeile.gueltig = True
+            zeile.fehler = None
+
+        if zeile.gueltig != war_gueltig:
+            self._nachfolger_einreihen(zeile, warteschlange)
+
+    def _nachfolger_einreihen(self, zeile, warteschlange):
+        """Reiht spätere Kandidaten mit überlappenden Spalten zur Prüfung ein."""
+        for andere in self._anwaerter.ueberlappende(zeile.spalten):
+            if andere.pos > zeile.pos:
+                heapq.heappush(warteschlange, (andere.pos, id(andere), andere))
+
+
+if __name__ == "__main__":
+    pass
@@ -2,85 +2,35 @@
 # -*- coding: utf-8 -*-
 """Anlagen Eingabe App – Registry-Version mit Dataclasses & Optimierungen."""
 
-import json
-from dataclasses import dataclass, field, asdict
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 from date_utils import parse_date_input, format_date_display
 import flet as ft
 
-from constants import TOOL_FLET_VERSION, TOOL_FLET_NAME, COLUMNS_PER_UNIT, _, BFSIZE, BFSIZE2,ts
+from constants import TOOL_FLET_VERSION, TOOL_FLET_NAME, COLUMNS_PER_UNIT, _, BFSIZE, BFSIZE2,ts, PLATZ_VORSCHLAEGE_ANZAHL
 
 from data_manager import DataManager
+from kunden_registry import KundenRegistry
+from migrations import SCHEMA_VERSION, migrate
+from models import Anlage, Kunde, anlage_to_dict, kunde_to_dict
+from save_service import SaveService
+from storage_encoding import encode, read_file
 from ui_builder import UIBuilder
+from batch_export import exportiere_stapel
+from column_intervals import format_bereiche
+from label_packing import packe_text
+from label_validation import IncrementalValidator
 from odf_exporter import (
-    validiere_eintraege,
     exportiere_anlage_ods,
+    exportiere_anlage_pdf,
     exportiere_kunde_odt,
+    exportiere_kunde_ods,
+    exportiere_kunde_pdf,
+    validierungs_cache,
 )
 
-# ---------------------------------------------------------
-# Dataclasses
-# ---------------------------------------------------------
-
-@dataclass
-class Anlage:
-    id: int
-    beschreibung: str = ""
-    name: str = ""
-    adresse: str = ""
-    plz_ort: str = ""
-    raum: str = ""
-    gebaeude: str = ""
-    geschoss: str = ""
-    funktion: str = ""
-    zaehlernummer: str = ""
-    zaehlerstand: str = ""
-    code: str = ""
-    bemerkung: str = ""
-    felder: int = 3
-    reihen: int = 7
-    text_inhalt: str = ""
-    code_auto_last: str = ""
-
-@dataclass
-class Kunde:
-    id: int
-    projekt: str = ""
-    datum: str = ""
-    adresse: str = ""
-    plz: str = ""
-    ort: str = ""
-    ansprechpartner: str = ""
-    telefonnummer: str = ""
-    email: str = ""
-    anlagen: list[Anlage] = field(default_factory=list)
-    next_anlage_id: int = 1  # Pro Kunde
-
-# ---------------------------------------------------------
-# Dict-Konvertierung
-# ---------------------------------------------------------
-
-def anlage_to_dict(a: Anlage) -> dict:
-    return asdict(a)
-
-def anlage_from_dict(d: dict) -> Anlage:
-    # Migration: Entferne veraltete Felder
-    d = d.copy()  # Kopie um Original nicht zu ändern
-    d.pop('teile_text', None)
-    d.pop('teile_parsed', None)
-    return Anlage(**d)
-
-def kunde_to_dict(k: Kunde) -> dict:
-    d = asdict(k)
-    d["anlagen"] = [anlage_to_dict(a) for a in k.anlagen]
-    return d
-
-def kunde_from_dict(d: dict) -> Kunde:
-    anlagen = [anlage_from_dict(a) for a in d.get("anlagen", [])]
-    d = {k: v for k, v in d.items() if k != "anlagen"}
-    return Kunde(**d, anlagen=anlagen)
-
 # ---------------------------------------------------------
 # Hauptklasse
 # ---------------------------------------------------------
@@ -155,19 +105,41 @@ class AnlagenApp:
         ts.set_locale(selected_locale)
 
         # Daten
-        self.alle_kunden = {}
+        self.alle_kunden = KundenRegistry()
         self.aktiver_kunde_key = None
         self.next_kunden_id = 1
         self.anlagen_daten = []
         self.aktuelle_anlage = None
         self.ausgewaehlte_anlage_id = None
+        self._validator_anlage = None  # Anlage, zu der self._validator gehört
+        self._validator = IncrementalValidator()
         self.daten_dirty = False
         self.original_kunde_values = {}
 
+        # Write-Behind: Speichern gesammelt im Hintergrund
+        self.save_service = SaveService(
+            self.data_manager,
+            self._speicher_snapshot,
+            intervall=self.settings.get("speicher_intervall", 1.0),
+            on_saved=self._on_daten_gespeichert,
+        )
+        atexit.register(self.save_service.stop)
+        self.page.on_disconnect = self._on_app_beenden
+
         self.ui_builder = UIBuilder(self, page)
 
         self.init_app()
 
+    @property
+    def aktiver_kunde_key(self):
+        return self._aktiver_kunde_key
+
+    @aktiver_kunde_key.setter
+    def aktiver_kunde_key(self, key):
+        # Der aktive Kunde bleibt hydriert, die UI hält Referenzen auf seine Anlagen
+        self._aktiver_kunde_key = key
+        self.alle_kunden.pin(key)
+
     # ---------------------------------------------------------
     # Hilfsfunktionen
     # ---------------------------------------------------------
@@ -254,39 +226,63 @@ class AnlagenApp:
     # ---------------------------------------------------------
 
     def lade_daten(self):
-        """Lädt Daten über DataManager und konvertiert zu Dataclasses."""
-        alle_kunden_raw, self.next_kunden_id = self.data_manager.load_data()
-        
-        self.alle_kunden = {
-            name: kunde_from_dict(kdict) for name, kdict in alle_kunden_raw.items()
-        }
-        
-        if self.alle_kunden:
-            self.aktiver_kunde_key = next(iter(self.alle_kunden))
+        """Lädt Daten über DataManager, Dataclasses entstehen erst beim Zugriff.
+
+        Layouts mit Index ('sharded', 'sqlite') laden beim Start nur die
+        Kopfdaten, die Anlagen eines Kunden erst bei seiner Auswahl.
+        """
+        if self.data_manager.has_customer_index():
+            index, self.next_kunden_id = self.data_manager.load_index()
+            self.alle_kunden = KundenRegistry(index=index, loader=self.data_manager.load_customer)
+        else:
+            alle_kunden_raw, self.next_kunden_id = self.data_manager.load_data()
+            self.alle_kunden = KundenRegistry(raw=alle_kunden_raw)
+
+        if self.aktiver_kunde_key in self.alle_kunden:
+            self.alle_kunden.pin(self.aktiver_kunde_key)
+        else:
+            self.aktiver_kunde_key = next(iter(self.alle_kunden), None)
         
         # Zeige wo Daten geladen wurden
-        daten_pfad = self.data_manager.get_data_file_path()
+        daten_pfad = self.data_manager.get_storage_path()
         self.show_file_snackbar(_("Geladen"), str(daten_pfad))
 
     def speichere_daten(self, _e=None):
-        """Schreibt Dataclasses zurück in Dict-Struktur und speichert."""
+        """Markiert die Daten als geändert, der SaveService schreibt gesammelt."""
         if not self.daten_dirty:
             return
 
         if self.aktiver_kunde_key in self.alle_kunden:
             self.alle_kunden[self.aktiver_kunde_key].anlagen = list(self.anlagen_daten)
 
-        out = {key: kunde_to_dict(kunde) for key, kunde in self.alle_kunden.items()}
+        self.daten_dirty = False
+        self.save_service.mark_dirty(self.aktiver_kunde_key)
 
-        ok, fehler = self.data_manager.save_data(
-            out, self.next_kunden_id
-        )
+    def flush_daten(self):
+        """Schreibt ausstehende Änderungen sofort (Navigation, Export, Beenden)."""
+        self.speichere_daten()
+        self.save_service.flush()
+
+    def _speicher_snapshot(self, dirty_keys=None, bekannt=()):
+        """Liefert die speicherbare Dict-Struktur (läuft in mark_dirty, im UI-Thread)."""
+        return self.alle_kunden.snapshot(dirty_keys, bekannt), self.next_kunden_id
+
+    def _on_daten_gespeichert(self, ok, fehler, latenz_ms, zusammengefasst):
+        """Callback des SaveService, auch aus dessen Hintergrund-Thread.
+
+        Automatisches Speichern bleibt still; nur Fehler werden gemeldet,
+        und zwar über die Event-Loop der Seite statt aus dem Worker-Thread.
+        """
         if not ok:
-            self.show_snackbar(_("Speicher-Fehler: {fehler}").format(fehler=fehler))
-        else:
-            self.daten_dirty = False
-            daten_pfad = self.data_manager.get_data_file_path()
-            self.show_file_snackbar(_("Gespeichert"), str(daten_pfad))
+            self.page.run_task(self._zeige_speicher_fehler, fehler)
+
+    async def _zeige_speicher_fehler(self, fehler):
+        self.show_snackbar(_("Speicher-Fehler: {fehler}").format(fehler=fehler))
+
+    def _on_app_beenden(self, _e=None):
+        """Schreibt beim Beenden/Trennen alle ausstehenden Änderungen."""
+        self.speichere_daten()
+        self.save_service.stop()
 
     def speichere_projekt_daten(self, _e=None):
         if not self.aktiver_kunde_key:
@@ -356,6 +352,8 @@ class AnlagenApp:
 
     def navigate(self, view_name: str):
         """Zentrale Navigation: baut Views konsistent auf."""
+        self.flush_daten()
+
         if view_name == "main":
             view = self.ui_builder.erstelle_hauptansicht()
             self.show(view)
@@ -714,8 +712,14 @@ class AnlagenApp:
         reihen = anlage.reihen
         text = anlage.text_inhalt
 
-        is_valid, gueltige, fehler, belegte, max_spalten, fehler_details = validiere_eintraege(
-            text, felder, reihen
+        # Ein Validator pro geöffneter Anlage: pro Tastendruck nur geänderte Zeilen prüfen
+        if anlage is not self._validator_anlage:
+            self._validator_anlage = anlage
+            self._validator = IncrementalValidator()
+
+        # Unveränderte Texte (Navigation, andere Felder, Export) kommen aus dem Cache
+        is_valid, gueltige, fehler, belegte, max_spalten, fehler_details = validierungs_cache.validiere(
+            text, felder, reihen, berechne=self._validator.validate
         )
 
         verfuegbar = max_spalten - len(belegte)
@@ -766,9 +770,107 @@ class AnlagenApp:
                 else ft.Colors.ORANGE_700
             )
 
+        self.zeige_platz_vorschlaege(info)
         self.page.update()
         return info["is_valid"], info["gueltige"]
 
+    def zeige_platz_vorschlaege(self, info):
+        """Zeigt freie Bereiche und den nächsten Platz für ein neues Gerät."""
+        try:
+            breite = int(self.ui["platz_breite_input"].value)
+        except (ValueError, TypeError):
+            breite = 1
+
+        belegte, max_spalten = info["belegte"], info["max_spalten"]
+        frei = belegte.freie_bereiche(max_spalten, nach_groesse=True)[:PLATZ_VORSCHLAEGE_ANZAHL]
+        plaetze = belegte.passende_positionen(
+            breite, max_spalten, reihenlaenge=COLUMNS_PER_UNIT, limit=PLATZ_VORSCHLAEGE_ANZAHL
+        )
+
+        if not frei:
+            text = _("Keine freien Spalten")
+        else:
+            text = _("Freie Bereiche: {bereiche}").format(bereiche=format_bereiche(frei))
+            if plaetze:
+                text += "\n" + _("Platz für {breite} Spalte(n): {plaetze}").format(
+                    breite=breite,
+                    plaetze=format_bereiche((p[0], p[-1]) for p in plaetze)
+                )
+            else:
+                text += "\n" + _("Kein Platz für {breite} Spalte(n) innerhalb einer Reihe").format(
+                    breite=breite
+                )
+        self.ui["platz_label"].value = text
+
+    def beschriftungen_anordnen(self, _e=None, alle=False):
+        """Schlägt eine Anordnung ohne Reihenumbrüche vor und übernimmt sie auf Wunsch.
+
+        Args:
+            alle (bool): Alle Einträge kompakt neu anordnen statt nur die umbrechenden
+        """
+        if not self.aktuelle_anlage:
+            return
+
+        self.speichere_detail_daten()
+        anlage = self.aktuelle_anlage
+        vorschlag = packe_text(anlage.text_inhalt, anlage.felder, anlage.reihen, alle=alle)
+        if vorschlag is None:
+            return self.show_snackbar(_("Kein Platz für eine Anordnung ohne Reihenumbruch"))
+        if not vorschlag["aenderungen"]:
+            return self.show_snackbar(_("Keine Reihenumbrüche – nichts zu verschieben"))
+
+        dlg = None  # Forward declaration
+
+        def on_apply(e):
+            dlg.open = False
+            self.ui["text_editor"].value = vorschlag["text"]
+            self.info_aktualisieren_und_speichern()
+            self.show_snackbar(_("{anzahl} Beschriftung(en) verschoben").format(
+                anzahl=len(vorschlag["aenderungen"])
+            ))
+
+        def on_alle(e):
+            dlg.open = False
+            self.page.update()
+            self.beschriftungen_anordnen(alle=True)
+
+        def on_cancel(e):
+            dlg.open = False
+            self.page.update()
+
+        message = "\n".join(f"{alt}  →  {neu}" for alt, neu in vorschlag["aenderungen"])
+        message += "\n\n" + _("Belegte Reihen: {reihen}").format(reihen=vorschlag["reihen"])
+
+        actions = [
+            ft.TextButton(
+                _("Übernehmen", BFSIZE),
+                on_click=on_apply,
+                style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+            ),
+        ]
+        if not alle:
+            actions.append(ft.TextButton(
+                _("Alle kompakt", BFSIZE),
+                on_click=on_alle,
+                style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+            ))
+        actions.append(ft.TextButton(
+            _("Abbrechen", BFSIZE),
+            on_click=on_cancel,
+            style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+        ))
+
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(_("Beschriftungen anordnen")),
+            content=ft.Text(message),
+            actions=actions,
+            actions_alignment=ft.MainAxisAlignment.END,
+            open=True,
+        )
+        self.page.overlay.append(dlg)
+        self.page.update()
+
     def info_aktualisieren_und_speichern(self, e=None):
         self.info_aktualisieren(e)
         self.speichere_detail_daten()
@@ -793,6 +895,7 @@ class AnlagenApp:
                 self.get_export_base_path(),
                 self.aktiver_kunde_key,
                 projekt,
+                force=self.settings.get("export_immer_neu", False),
             )
             self.show_file_snackbar(_("Exportiert"), pfad.name)
 
@@ -811,6 +914,7 @@ class AnlagenApp:
                 kunde_to_dict(kunde),
                 self.aktiver_kunde_key,
                 self.get_export_base_path(),
+                force=self.settings.get("export_immer_neu", False),
             )
             self.show_file_snackbar(_("Exportiert"), pfad.name)
             pass  # Snackbar bereits gesetzt
@@ -818,24 +922,109 @@ class AnlagenApp:
         except Exception as e:
             self.show_snackbar(_("Export-Fehler: {e}").format(e=e))
 
+    def exportiere_kunde_tabellen(self, _e):
+        """Exportiert alle Anlagen des aktiven Kunden als eine ODS-Datei."""
+        if not self.aktiver_kunde_key:
+            return self.dialog(_("Fehler"), _("Kein Kunde ausgewählt."))
+
+        self.speichere_projekt_daten()
+        kunde = self.alle_kunden[self.aktiver_kunde_key]
+
+        try:
+            pfad = exportiere_kunde_ods(
+                kunde_to_dict(kunde),
+                self.settings,
+                self.get_export_base_path(),
+                self.aktiver_kunde_key,
+                force=self.settings.get("export_immer_neu", False),
+            )
+            self.show_file_snackbar(_("Exportiert"), pfad.name)
+
+        except Exception as e:
+            self.show_snackbar(_("Export-Fehler: {e}").format(e=e))
+
+    def exportiere_anlage_pdf(self, _e):
+        """Exportiert die aktuelle Anlage als druckfertige PDF-Datei."""
+        if not self.aktuelle_anlage:
+            return self.dialog(_("Fehler"), _("Keine Anlage ausgewählt."))
+
+        try:
+            projekt = ""
+            if self.aktiver_kunde_key in self.alle_kunden:
+                projekt = self.alle_kunden[self.aktiver_kunde_key].projekt
+
+            pfad = exportiere_anlage_pdf(
+                anlage_to_dict(self.aktuelle_anlage),
+                self.settings,
+                self.get_export_base_path(),
+                self.aktiver_kunde_key,
+                projekt,
+                force=self.settings.get("export_immer_neu", False),
+            )
+            self.show_file_snackbar(_("Exportiert"), pfad.name)
+
+        except Exception as e:
+            self.show_snackbar(_("Export-Fehler: {e}").format(e=e))
+
+    def exportiere_kunde_pdf(self, _e):
+        """Exportiert alle Anlagen des aktiven Kunden als eine PDF-Datei."""
+        if not self.aktiver_kunde_key:
+            return self.dialog(_("Fehler"), _("Kein Kunde ausgewählt."))
+
+        self.speichere_projekt_daten()
+        kunde = self.alle_kunden[self.aktiver_kunde_key]
+
+        try:
+            pfad = exportiere_kunde_pdf(
+                kunde_to_dict(kunde),
+                self.settings,
+                self.get_export_base_path(),
+                self.aktiver_kunde_key,
+                force=self.settings.get("export_immer_neu", False),
+            )
+            self.show_file_snackbar(_("Exportiert"), pfad.name)
+
+        except Exception as e:
+            self.show_snackbar(_("Export-Fehler: {e}").format(e=e))
+
     def exportiere_zu_downloads(self, _e):
-        """Exportiert Daten + Settings als JSON."""
+        """Legt eine Sicherung an und exportiert Daten + Settings zum Austausch.
+
+        Die Sicherung landet dedupliziert im Backup-Speicher; im Export-Ordner
+        werden nur die Austauschdateien (ohne Zeitstempel) überschrieben.
+        Frühere Stände gibt es damit nur noch als Sicherung (Dialog
+        "Sicherungen"), nicht mehr als Kopien mit Zeitstempel.
+        """
         try:
+            self.flush_daten()
             export_base = self.get_export_base_path()
-            ts = self._timestamp()
 
-            daten = self.data_manager.get_data_file_path()
+            daten = self.data_manager.get_storage_path()
             settings = self.data_manager.get_settings_file_path()
 
+            manifest, fehler = self.data_manager.create_backup(
+                self.alle_kunden.snapshot(), self.next_kunden_id
+            )
+            if manifest is None:
+                self.show_snackbar(_("{label}-Fehler: {e}").format(label="Backup", e=fehler))
+            else:
+                self.show_snackbar(_("Sicherung erstellt ({anzahl} neue Objekte, {kb} KB)").format(
+                    anzahl=manifest["neue_objekte"], kb=f"{manifest['neue_bytes'] / 1024:.1f}"
+                ))
+
             exported = []
 
             if daten.exists():
-                dst = export_base / f"Verteiler_Daten_{ts}.json"
-                if self._copy_file(daten, dst, "Export"):
+                # Immer im Einzeldatei-Format (Austausch Handy↔PC)
+                dst = export_base / "Verteiler_Daten.json"
+                ok, fehler = self.data_manager.export_single_file(dst)
+                if ok:
                     exported.append(dst.name)
+                else:
+                    self.show_snackbar(_("{label}-Fehler: {e}").format(label="Export", e=fehler))
 
             if settings.exists():
-                dst = export_base / f"Verteiler_Einstellungen_{ts}.json"
+                dst = export_base / "Verteiler_Einstellungen.json"
                 if self._copy_file(settings, dst, "Export"):
                     exported.append(dst.name)
 
@@ -848,23 +1037,122 @@ class AnlagenApp:
         except Exception as e:
             self.show_snackbar(_("Export-Fehler: {e}").format(e=e))
 
+    def zeige_sicherungen_dialog(self, _e):
+        """Listet die Sicherungen mit Wiederherstellen-Option."""
+        sicherungen = self.data_manager.list_backups()
+        if not sicherungen:
+            return self.show_snackbar(_("Keine Sicherungen vorhanden"))
+
+        dlg = None  # Forward declaration
+
+        def on_wiederherstellen(sicherung_id):
+            def handler(e):
+                dlg.open = False
+                self.page.update()
+                self._sicherung_wiederherstellen(sicherung_id)
+            return handler
+
+        def on_schliessen(e):
+            dlg.open = False
+            self.page.update()
+
+        zeilen = []
+        for manifest in sicherungen:
+            erstellt = manifest.get("erstellt", "").replace("T", " ")
+            zeilen.append(ft.Row([
+                ft.Text(_("{erstellt} – {kunden} Kunden").format(
+                    erstellt=erstellt, kunden=len(manifest.get("kunden", []))
+                ), size=12, expand=True),
+                ft.TextButton(
+                    _("Wiederherstellen", BFSIZE),
+                    on_click=on_wiederherstellen(manifest["id"]),
+                    style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+                ),
+            ]))
+
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(_("Sicherungen")),
+            content=ft.Column(zeilen, scroll=ft.ScrollMode.AUTO, tight=True),
+            actions=[ft.TextButton(
+                _("Schließen", BFSIZE),
+                on_click=on_schliessen,
+                style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+            )],
+            open=True,
+        )
+        self.page.overlay.append(dlg)
+        self.page.update()
+
+    def _sicherung_wiederherstellen(self, sicherung_id):
+        """Ersetzt alle Daten durch eine Sicherung."""
+        try:
+            # Ausstehende Änderungen vorher schreiben, sonst überschreiben sie die Sicherung
+            self.flush_daten()
+            ok, fehler = self.data_manager.restore_backup(sicherung_id)
+            if ok:
+                self.lade_daten()
+                self.refresh_main()
+                self.show_snackbar(_("Sicherung {id} wiederhergestellt").format(id=sicherung_id))
+            else:
+                self.show_snackbar(_("{label}-Fehler: {e}").format(label="Backup", e=fehler))
+        except Exception as e:
+            self.show_snackbar(_("{label}-Fehler: {e}").format(label="Backup", e=e))
+
     def exportiere_alle_kunden(self, _e):
-        """Exportiert alle Kunden als ODT."""
+        """Exportiert alle Kunden als ODT (parallel, im Hintergrund)."""
+        self._starte_stapel_export(odt=True, ods=False)
+
+    def exportiere_alle_anlagen(self, _e):
+        """Exportiert alle Anlagen aller Kunden als ODS (parallel, im Hintergrund)."""
+        self._starte_stapel_export(odt=False, ods=True)
+
+    def _starte_stapel_export(self, odt, ods):
+        """Startet den Stapel-Export in einem Hintergrund-Thread.
+
+        Die Worker-Prozesse bekommen reine Dicts; der UI-Thread bleibt frei.
+        """
         if not self.alle_kunden:
             return self.dialog(_("Fehler"), _("Keine Kunden vorhanden."))
 
+        self.speichere_projekt_daten()
+        kunden = {name: self.alle_kunden.to_dict(name) for name in self.alle_kunden}
+        base = self.get_export_base_path()
+        self.show_snackbar(_("Export läuft …"))
+        threading.Thread(
+            target=self._stapel_export,
+            args=(kunden, dict(self.settings), base, odt, ods),
+            name="StapelExport",
+            daemon=True,
+        ).start()
+
+    def _stapel_export(self, kunden, settings, base, odt, ods):
+        """Läuft im Hintergrund-Thread; meldet über die Event-Loop der Seite."""
         try:
-            count = 0
-            base = self.get_export_base_path()
-
-            for name, kunde in self.alle_kunden.items():
-                exportiere_kunde_odt(kunde_to_dict(kunde), name, base)
-                count += 1
+            ergebnis = exportiere_stapel(
+                kunden, settings, base, odt=odt, ods=ods,
+                force=settings.get("export_immer_neu", False),
+            )
+        except Exception as e:
+            self.page.run_task(self._zeige_stapel_fehler, e)
+            return
+        self.page.run_task(self._zeige_stapel_ergebnis, ergebnis, base)
 
-            self.show_snackbar(_("{count} Kunden exportiert nach {base}").format(count=count, base=base))
+    async def _zeige_stapel_fehler(self, fehler):
+        self.show_snackbar(_("Export-Fehler: {e}").format(e=fehler))
 
-        except Exception as e:
-            self.show_snackbar(_("Export-Fehler: {e}").format(e=e))
+    async def _zeige_stapel_ergebnis(self, ergebnis, base):
+        meldung = _("{count} Dateien exportiert nach {base}").format(
+            count=len(ergebnis["dateien"]), base=base
+        )
+        if ergebnis["fehler"]:
+            details = "\n".join(
+                _("• {datei}: {fehler}").format(datei=datei, fehler=fehler)
+                for datei, fehler in ergebnis["fehler"]
+            )
+            self.dialog(_("Export mit Fehlern"), f"{meldung}\n\n{details}")
+        else:
+            self.show_snackbar(meldung)
 
     def exportiere_aktuellen_kunden(self, _e):
         """Exportiert nur den aktuellen Kunden mit seinen Anlagen."""
@@ -879,7 +1167,8 @@ class AnlagenApp:
                 'kunden': {
                     self.aktiver_kunde_key: kunde_to_dict(kunde)
                 },
-                'next_kunden_id': self.next_kunden_id
+                'next_kunden_id': self.next_kunden_id,
+                'schema_version': SCHEMA_VERSION,
             }
             
             # Dateiname mit Kundenname
@@ -887,9 +1176,9 @@ class AnlagenApp:
             filename = f"Kunde_{safe_name}_{self._timestamp()}.json"
             dst = self.get_export_base_path() / filename
             
-            # Schreibe JSON
-            with open(dst, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            # Schreibe in der eingestellten Kodierung (Import erkennt sie automatisch)
+            with open(dst, 'wb') as f:
+                f.write(encode(export_data, self.data_manager.get_storage_encoding()))
             
             self.show_file_snackbar(_("Kunde exportiert"), filename)
             
@@ -925,10 +1214,9 @@ class AnlagenApp:
             return self.dialog(_("Ungültige Datei"), 
                              _("Die Datei muss 'daten'/'anlagen'/'kunde' oder 'settings'/'einstellung' im Namen enthalten."))
         
-        # 2. Lade und validiere JSON
+        # 2. Lade und validiere Daten (JSON, gzip oder pickle)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
+            import_data = read_file(file_path)
         except Exception as ex:
             return self.show_snackbar(_("Datei-Fehler: {ex}").format(ex=ex))
         
@@ -944,6 +1232,8 @@ class AnlagenApp:
         
         # 4. Daten-Import mit Vergleich
         if is_daten:
+            # Ältere Dateien auf das aktuelle Schema bringen (Merge nutzt die Dicts direkt)
+            migrate(import_data)
             import_kunden = import_data.get('kunden', {})
             
             # Prüfe ob es ein einzelner Kunden-Import ist
@@ -1052,7 +1342,7 @@ class AnlagenApp:
                 kunde.anlagen.append(neue_anlage)
             
             # Speichern
-            self.speichere_daten()
+            self.save_service.mark_dirty(kunde_name)
             self.aktualisiere_aktive_daten()
             self.refresh_main()
             self.show_snackbar(_("{count} neue Anlagen hinzugefügt").format(count=len(neue_anlagen)))
@@ -1097,7 +1387,7 @@ class AnlagenApp:
                     hinzugefuegt += 1
             
             # Speichern
-            self.speichere_daten()
+            self.save_service.mark_dirty(kunde_name)
             self.aktualisiere_aktive_daten()
             self.refresh_main()
             
@@ -1121,7 +1411,7 @@ class AnlagenApp:
             
             # Zähle aktuelle Daten
             aktuelle_kunden = len(self.alle_kunden)
-            aktuelle_anlagen = sum(len(k.anlagen) for k in self.alle_kunden.values())
+            aktuelle_anlagen = sum(self.alle_kunden.anlagen_count(k) for k in self.alle_kunden)
             
             
             # Prüfe ob Merge möglich (unterschiedliche Kunden)
@@ -1222,14 +1512,17 @@ class AnlagenApp:
     def _do_import(self, file_path):
         """Führt Import durch (überschreibt alles)."""
         try:
-            target = self.data_path / "Verteiler_Daten.json"
-            if self._copy_file(file_path, target, "Import"):
+            # Ausstehende Änderungen vorher schreiben, sonst überschreiben sie den Import
+            self.flush_daten()
+            ok, fehler = self.data_manager.import_single_file(file_path)
+            if ok:
+                self.show_file_snackbar(_("Importiert"), file_path.name)
                 self.lade_daten()
                 self.aktualisiere_aktive_daten()
                 self.refresh_main()  # UI aktualisieren!
                 self.show_snackbar(_("Daten importiert"))
             else:
-                self.show_snackbar(_("Daten-Import fehlgeschlagen"))
+                self.show_snackbar(_("{label}-Fehler: {e}").format(label="Import", e=fehler))
         except Exception as e:
             self.show_snackbar(_("Import-Fehler: {e}").format(e=e))
     
@@ -1246,10 +1539,10 @@ class AnlagenApp:
                     kunde = Kunde(**kunde_raw)
                     kunde.anlagen = [Anlage(**a) for a in kunde_raw.get('anlagen', [])]
                     self.alle_kunden[kunde_key] = kunde
+                    self.save_service.mark_dirty(kunde_key)
                     merged_count += 1
             
             if merged_count > 0:
-                self.speichere_daten()
                 self.aktualisiere_aktive_daten()
                 self.refresh_main()  # UI aktualisieren!
                 self.show_snackbar(_("{count} neue Kunden hinzugefügt").format(count=merged_count))
@@ -1290,10 +1583,12 @@ class AnlagenApp:
             "settings_rand_unten_input": ("rand_unten", float),
             "settings_rand_links_input": ("rand_links", float),
             "settings_rand_rechts_input": ("rand_rechts", float),
+            "settings_speicher_intervall_input": ("speicher_intervall", float),
         }
 
         bool_mapping = {
             "settings_umrandung_switch": "zellen_umrandung",
+            "settings_export_neu_switch": "export_immer_neu",
         }
 
         str_mapping = {
@@ -1328,6 +1623,8 @@ class AnlagenApp:
                 self.data_manager.save_settings(self.settings)
             except (OSError, ValueError, TypeError):
                 pass
+
+            self.save_service.intervall = max(0.0, self.settings.get("speicher_intervall", 1.0))
             
             # Wenn Datumsformat geändert wurde, refresh main view
             new_format = self.settings.get("datum_format", "DE")
@@ -1343,6 +1640,40 @@ class AnlagenApp:
         except (OSError, ValueError, TypeError):
             pass
 
+    def on_speicher_modus_change(self, _e):
+        """Wechselt das Speicher-Layout (Einzeldatei ↔ pro Kunde)."""
+        neuer_modus = self.ui["settings_speicher_modus"].value
+        if neuer_modus == self.data_manager.get_storage_mode():
+            return
+
+        self.flush_daten()
+        ok, fehler = self.data_manager.set_storage_mode(neuer_modus)
+        if not ok:
+            self.ui["settings_speicher_modus"].value = self.data_manager.get_storage_mode()
+            self.page.update()
+            return self.show_snackbar(_("Speicher-Fehler: {fehler}").format(fehler=fehler))
+
+        self.data_manager.save_settings(self.settings)
+        # Registry an das neue Layout binden (Index bzw. Rohdaten neu laden)
+        self.lade_daten()
+        self.show_file_snackbar(_("Gespeichert"), str(self.data_manager.get_storage_path()))
+
+    def on_speicher_kodierung_change(self, _e):
+        """Wechselt die Kodierung der Datendatei (JSON, kompakt, gzip, pickle)."""
+        neue_kodierung = self.ui["settings_speicher_kodierung"].value
+        if neue_kodierung == self.data_manager.get_storage_encoding():
+            return
+
+        self.flush_daten()
+        ok, fehler = self.data_manager.set_storage_encoding(neue_kodierung)
+        if not ok:
+            self.ui["settings_speicher_kodierung"].value = self.data_manager.get_storage_encoding()
+            self.page.update()
+            return self.show_snackbar(_("Speicher-Fehler: {fehler}").format(fehler=fehler))
+
+        self.data_manager.save_settings(self.settings)
+        self.show_file_snackbar(_("Gespeichert"), str(self.data_manager.get_storage_path()))
+
     def on_locale_change(self, _e):
         selected_locale = self.ui["settings_locale"].value
         
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Schema-Version der Datendatei und geordnete Migrationsschritte.
+
+Jede Datei trägt 'schema_version' (fehlt = 0). Ein Migrationsschritt hebt
+die Daten genau auf seine Zielversion; migrate() führt alle ausstehenden
+Schritte der Reihe nach aus. Der DataManager speichert das Ergebnis sofort,
+danach laden Dateien in aktueller Version ohne Prüfungen pro Datensatz.
+
+Neue Schritte: Funktion mit @migration(SCHEMA_VERSION + 1) anlegen und
+SCHEMA_VERSION erhöhen. Schritte müssen idempotent sein, weil Dateien ohne
+Versionsangabe bereits teilweise migriert sein können.
+"""
+
+SCHEMA_VERSION = 2
+
+_MIGRATIONS = []  # (zielversion, funktion), aufsteigend sortiert
+
+
+def migration(zielversion):
+    """Registriert einen Migrationsschritt auf zielversion.
+
+    Args:
+        zielversion (int): Version, die die Daten nach dem Schritt haben
+    """
+    def register(funktion):
+        _MIGRATIONS.append((zielversion, funktion))
+        _MIGRATIONS.sort(key=lambda eintrag: eintrag[0])
+        return funktion
+    return register
+
+
+def get_schema_version(all_data):
+    """Gibt die Schema-Version einer geladenen Datei zurück (fehlt = 0)."""
+    return all_data.get('schema_version', 0)
+
+
+def needs_migration(version):
+    """Gibt zurück, ob Daten der Version migriert werden müssen."""
+    return version < SCHEMA_VERSION
+
+
+def migrate(all_data):
+    """Migriert geladene Daten in-place auf SCHEMA_VERSION.
+
+    Dateien einer neueren Version bleiben unverändert.
+
+    Args:
+        all_data (dict): {'kunden': ..., 'next_kunden_id': ..., 'schema_version': ...}
+
+    Returns:
+        bool: True, wenn migriert wurde (Daten sollten gespeichert werden)
+    """
+    version = get_schema_version(all_data)
+    if not needs_migration(version):
+        return False
+
+    kunden = all_data.setdefault('kunden', {})
+    for zielversion, funktion in _MIGRATIONS:
+        if zielversion > version:
+            funktion(kunden)
+    all_data['schema_version'] = SCHEMA_VERSION
+    return True
+
+
+# ==================== Migrationsschritte ====================
+
+@migration(1)
+def _next_anlage_id_pro_kunde(kunden):
+    """next_anlage_id ist pro Kunde gespeichert (früher global)."""
+    for customer_data in kunden.values():
+        if 'next_anlage_id' not in customer_data:
+            # Finde höchste Anlagen-ID + 1
+            max_id = max((a.get('id', 0) for a in customer_data.get('anlagen', [])), default=0)
+            customer_data['next_anlage_id'] = max_id + 1
+
+
+@migration(2)
+def _teile_felder_entfernen(kunden):
+    """Veraltete Anlagen-Felder teile_text/teile_parsed entfernen."""
+    for customer_data in kunden.values():
+        for anlage in customer_data.get('anlagen', []):
+            anlage.pop('teile_text', None)
+            anlage.pop('teile_parsed', None)
+
+
+if __name__ == "__main__":
+    pass
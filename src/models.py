@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Datenmodell: Dataclasses für Kunden und Anlagen plus Dict-Konvertierung.
+
+Ohne UI-Abhängigkeiten, damit Speicher- und Export-Module es importieren können.
+
+Kunde und Anlage merken sich, welche Felder seit der letzten Konvertierung
+geändert wurden. kunde_to_dict_cached/anlage_to_dict_cached bauen nur für
+geänderte Objekte ein neues Dict, sonst liefern sie dasselbe Dict-Objekt
+wie beim letzten Mal – nachgelagerte Caches (z.B. kodierte JSON-Fragmente)
+können unveränderte Kunden so an der Identität erkennen.
+"""
+
+from dataclasses import dataclass, field, asdict, fields
+
+_FEHLT = object()
+
+# ---------------------------------------------------------
+# Änderungsverfolgung
+# ---------------------------------------------------------
+
+class _AenderungenMixin:
+    """Merkt sich Feldänderungen in self._geaendert (kein Dataclass-Feld)."""
+
+    def __setattr__(self, name, value):
+        alt = self.__dict__.get(name, _FEHLT)
+        object.__setattr__(self, name, value)
+        if alt is not value and alt != value:
+            self.__dict__.setdefault('_geaendert', set()).add(name)
+
+    @property
+    def geaenderte_felder(self):
+        """Seit der letzten Konvertierung geänderte Felder."""
+        return self.__dict__.get('_geaendert', set())
+
+    def mark_clean(self):
+        """Setzt die Änderungsverfolgung zurück.
+
+        Returns:
+            set: Die bis dahin geänderten Felder
+        """
+        return self.__dict__.pop('_geaendert', set())
+
+# ---------------------------------------------------------
+# Dataclasses
+# ---------------------------------------------------------
+
+@dataclass
+class Anlage(_AenderungenMixin):
+    id: int
+    beschreibung: str = ""
+    name: str = ""
+    adresse: str = ""
+    plz_ort: str = ""
+    raum: str = ""
+    gebaeude: str = ""
+    geschoss: str = ""
+    funktion: str = ""
+    zaehlernummer: str = ""
+    zaehlerstand: str = ""
+    code: str = ""
+    bemerkung: str = ""
+    felder: int = 3
+    reihen: int = 7
+    text_inhalt: str = ""
+    code_auto_last: str = ""
+
+@dataclass
+class Kunde(_AenderungenMixin):
+    id: int
+    projekt: str = ""
+    datum: str = ""
+    adresse: str = ""
+    plz: str = ""
+    ort: str = ""
+    ansprechpartner: str = ""
+    telefonnummer: str = ""
+    email: str = ""
+    anlagen: list[Anlage] = field(default_factory=list)
+    next_anlage_id: int = 1  # Pro Kunde
+
+# ---------------------------------------------------------
+# Dict-Konvertierung
+# ---------------------------------------------------------
+
+def anlage_to_dict(a: Anlage) -> dict:
+    return asdict(a)
+
+def anlage_from_dict(d: dict) -> Anlage:
+    # Veraltete Felder entfernt die Migration beim Laden (migrations.py)
+    return Anlage(**d)
+
+def kunde_to_dict(k: Kunde) -> dict:
+    d = asdict(k)
+    d["anlagen"] = [anlage_to_dict(a) for a in k.anlagen]
+    return d
+
+def kunde_from_dict(d: dict) -> Kunde:
+    anlagen = [anlage_from_dict(a) for a in d.get("anlagen", [])]
+    d = {k: v for k, v in d.items() if k != "anlagen"}
+    return Kunde(**d, anlagen=anlagen)
+
+# ---------------------------------------------------------
+# Inkrementelle Konvertierung (Speicherpfad)
+# ---------------------------------------------------------
+
+ANLAGE_FELDER = tuple(f.name for f in fields(Anlage))
+KUNDE_FELDER = tuple(f.name for f in fields(Kunde))
+
+def anlage_to_dict_cached(a: Anlage) -> dict:
+    """Wie anlage_to_dict, aber ein neues Dict nur nach Änderungen.
+
+    Das gelieferte Dict wird geteilt und darf nicht verändert werden.
+    """
+    cached = a.__dict__.get('_dict_cache')
+    # Erst zurücksetzen, dann lesen: eine gleichzeitige Änderung (UI-Thread) bleibt markiert
+    if a.mark_clean() or cached is None:
+        # Alle Felder sind unveränderliche Basistypen → flache Kopie genügt
+        cached = {name: getattr(a, name) for name in ANLAGE_FELDER}
+        a.__dict__['_dict_cache'] = cached
+    return cached
+
+def kunde_to_dict_cached(k: Kunde) -> dict:
+    """Wie kunde_to_dict, aber ein neues Dict nur nach Änderungen.
+
+    Unveränderte Anlagen-Dicts werden wiederverwendet. Das gelieferte Dict
+    wird geteilt und darf nicht verändert werden.
+    """
+    geaendert = k.mark_clean() - {'anlagen'}
+    anlagen = [anlage_to_dict_cached(a) for a in k.anlagen]
+    cached = k.__dict__.get('_dict_cache')
+    if (cached is None or geaendert
+            or len(cached['anlagen']) != len(anlagen)
+            or any(alt is not neu for alt, neu in zip(cached['anlagen'], anlagen))):
+        cached = {name: getattr(k, name) for name in KUNDE_FELDER}
+        cached['anlagen'] = anlagen
+        k.__dict__['_dict_cache'] = cached
+    return cached
+
+
+if __name__ == "__main__":
+    pass
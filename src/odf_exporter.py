@@ -4,107 +4,101 @@
 
 Enthält die komplette Logik für den Export von Anlagen in ODS-Format
 (OpenDocument Spreadsheet) und Kunden in ODT-Format (OpenDocument Text).
-Nutzt manuelle ZIP+XML Erstellung für alle Plattformen.
+Nutzt manuelle ZIP+XML Erstellung für alle Plattformen. Druckfertige
+PDF-Streifen entstehen ohne Office-Programm über pdf_renderer.
 """
 
+import io
 import os
-import re
 from datetime import datetime
 from pathlib import Path
 
 # Manuelle ODS/ODT-Erstellung
-from ods_manual import create_ods_manual
-from odt_manual import create_odt_manual
+from ods_manual import write_ods, write_ods_workbook
+from odt_manual import write_odt_manual
+from pdf_renderer import write_pdf
 
-from constants import COLUMNS_PER_UNIT, _
+from column_intervals import SpaltenBelegung, ausserhalb_bereich, format_bereiche
+from constants import COLUMNS_PER_UNIT, TABELLENNAME_MAX, TABELLENNAME_VERBOTEN, _
+from export_manifest import ODS_SETTINGS, eingabe_hash, eintragen, vorhandene_datei
+from label_parser import FEHLER_FORMAT, FEHLER_SPALTEN, parse_spalten_str, tokenize_zeile
+from validation_cache import ValidierungsCache
+
+
+# Zellen des Zeilenmodells: (text, style, colspan)
+LEERE_ZELLE = ('', 'ce3', 1)
 
 
 def convert_anlage_to_manual_format(anlage, gueltige_eintraege, felder, reihen):
     """Konvertiert Anlagen-Daten in Format für manuelle ODS-Erstellung.
-    
+
+    Die Zeilen werden erst beim Schreiben erzeugt (siehe _zeilen) – auch
+    für große Anlagen liegt nie die ganze Tabelle im Speicher.
+
     Args:
         anlage: Anlage Dictionary
         gueltige_eintraege: Liste gültiger Beschriftungen
         felder: Anzahl Felder
         reihen: Anzahl Reihen
-    
+
     Returns:
         dict: Daten im Format für create_ods_manual
+            {'name', 'num_cols', 'rows'}; rows liefert einmalig
+            (ist_kopf, zellen) mit zellen als Tupel von (text, style, colspan)
     """
-    # Spalten-Map erstellen
-    spalten_map = {}
-    for beschr in gueltige_eintraege:
-        spalten_map[beschr['spalten_liste'][0]] = {
-            'beschreibung': beschr['beschreibung'],
-            'anzahl': len(beschr['spalten_liste'])
-        }
-    
-    rows = []
-    globale_spalten_start = 1
-    
-    # Felder und Reihen durchlaufen
-    for feld in range(1, felder + 1):
-        for reihe in range(1, reihen + 1):
-            # Beschriftungszeile (Spaltennummern)
-            beschr_cells = []
-            temp_spalte_nr = globale_spalten_start
-            
-            for i in range(COLUMNS_PER_UNIT):
-                beschr_cells.append({
-                    'text': str(temp_spalte_nr + i),
-                    'style': 'ce1',
-                    'colspan': 1
-                })
-            
-            rows.append({
-                'is_header': True,
-                'cells': beschr_cells
-            })
-            
-            # Inhaltszeile (Beschriftungen)
-            inhalt_cells = []
-            lokale_spalten_zaehler = 0
-            
-            while lokale_spalten_zaehler < COLUMNS_PER_UNIT:
-                globale_spalten_nr = globale_spalten_start + lokale_spalten_zaehler
-                
-                if globale_spalten_nr in spalten_map:
-                    eintrag = spalten_map[globale_spalten_nr]
-                    anzahl = eintrag['anzahl']
-                    anzahl_in_reihe = min(
-                        anzahl,
-                        COLUMNS_PER_UNIT - lokale_spalten_zaehler
-                    )
-                    
-                    inhalt_cells.append({
-                        'text': eintrag['beschreibung'],
-                        'style': 'ce2',
-                        'colspan': anzahl_in_reihe
-                    })
-                    
-                    lokale_spalten_zaehler += anzahl_in_reihe
-                else:
-                    inhalt_cells.append({
-                        'text': '',
-                        'style': 'ce3',
-                        'colspan': 1
-                    })
-                    lokale_spalten_zaehler += 1
-            
-            rows.append({
-                'is_header': False,
-                'cells': inhalt_cells
-            })
-            
-            globale_spalten_start += COLUMNS_PER_UNIT
-    
+    # Spalten-Map: erste Spalte → (beschreibung, anzahl)
+    spalten_map = {
+        beschr['spalten_liste'][0]: (beschr['beschreibung'], len(beschr['spalten_liste']))
+        for beschr in gueltige_eintraege
+    }
+
     return {
         'name': anlage['beschreibung'],
         'num_cols': COLUMNS_PER_UNIT,
-        'rows': rows
+        'rows': _zeilen(spalten_map, felder * reihen),
     }
 
 
+def _zeilen(spalten_map, anzahl_reihen):
+    """Erzeugt je Reihe eine Beschriftungs- und eine Inhaltszeile.
+
+    Args:
+        spalten_map (dict): erste Spalte → (beschreibung, anzahl)
+        anzahl_reihen (int): Felder × Reihen
+
+    Yields:
+        tuple: (ist_kopf, zellen)
+    """
+    globale_spalten_start = 1
+
+    for _reihe in range(anzahl_reihen):
+        # Beschriftungszeile (Spaltennummern)
+        yield True, tuple(
+            (str(spalte_nr), 'ce1', 1)
+            for spalte_nr in range(globale_spalten_start, globale_spalten_start + COLUMNS_PER_UNIT)
+        )
+
+        # Inhaltszeile (Beschriftungen)
+        inhalt_cells = []
+        lokale_spalten_zaehler = 0
+
+        while lokale_spalten_zaehler < COLUMNS_PER_UNIT:
+            eintrag = spalten_map.get(globale_spalten_start + lokale_spalten_zaehler)
+
+            if eintrag is not None:
+                beschreibung, anzahl = eintrag
+                anzahl_in_reihe = min(anzahl, COLUMNS_PER_UNIT - lokale_spalten_zaehler)
+                inhalt_cells.append((beschreibung, 'ce2', anzahl_in_reihe))
+                lokale_spalten_zaehler += anzahl_in_reihe
+            else:
+                inhalt_cells.append(LEERE_ZELLE)
+                lokale_spalten_zaehler += 1
+
+        yield False, tuple(inhalt_cells)
+
+        globale_spalten_start += COLUMNS_PER_UNIT
+
+
 def parse_zeile(zeile):
     """Parsed eine Eingabezeile im Format 'Spalten Beschreibung'.
 
@@ -119,42 +113,27 @@ def parse_zeile(zeile):
     Returns:
         dict: {'spalten': str, 'beschreibung': str} oder None bei Fehler
     """
-    zeile = zeile.strip()
-    if not zeile:
+    eintrag = tokenize_zeile(zeile)
+    if eintrag is None or eintrag.fehler == FEHLER_FORMAT:
         return None
-
-    # Erlaubt nur Ziffern, Bindestriche und Pluszeichen in der Spaltenangabe
-    match = re.match(r'([\d\-\+]+)[\s\t;]*(.*)', zeile)
-    if match:
-        spalten_str = match.group(1).strip()
-        beschreibung = match.group(2).strip()
-        if spalten_str:
-            return {'spalten': spalten_str, 'beschreibung': beschreibung}
-
-    return None
+    return {'spalten': eintrag.spalten_str, 'beschreibung': eintrag.beschreibung}
 
 
 def parse_spalten(spalten_str):
-    """Konvertiert Spalten-String zu Liste von Spaltennummern.
+    """Konvertiert Spalten-String zu einem Spaltenbereich.
+
+    Der Bereich bleibt ein range (keine Liste), damit auch riesige Angaben
+    wie "1-99999999" keinen Speicher kosten.
 
     Args:
         spalten_str (str): Spalten-String (z.B. "1", "3-6", "7+5")
 
     Returns:
-        list: Liste von Spaltennummern oder None bei Fehler
+        range: Spaltennummern oder None bei Fehler
     """
-    try:
-        if '+' in spalten_str:
-            start, anzahl = map(int, spalten_str.split('+'))
-            # Bei 'X+Y' soll X bis X+Y gehen, also Y+1 Zahlen
-            return list(range(start, start + anzahl + 1))
-        elif '-' in spalten_str:
-            start, ende = map(int, spalten_str.split('-'))
-            return list(range(start, ende + 1)) if start <= ende else None
-        else:
-            return [int(spalten_str)]
-    except (ValueError, AttributeError):
+    if not isinstance(spalten_str, str):
         return None
+    return parse_spalten_str(spalten_str)
 
 
 def validiere_eintraege(text_inhalt, felder, reihen):
@@ -167,66 +146,198 @@ def validiere_eintraege(text_inhalt, felder, reihen):
 
     Returns:
         tuple: (is_valid: bool, gueltige_eintraege: list, fehler_anzahl: int,
-                belegte_spalten: set, max_spalten: int, fehler_details: list)
+                belegte_spalten: SpaltenBelegung, max_spalten: int, fehler_details: list)
     """
     max_spalten = felder * reihen * COLUMNS_PER_UNIT
-    belegte_spalten = set()
+    belegte_spalten = SpaltenBelegung()
     fehler_anzahl = 0
     gueltige_eintraege = []
     fehler_details = []
 
-    for zeilen_nr, zeile in enumerate(text_inhalt.split('\n'), 1):
-        if not zeile.strip():
+    for zeile in text_inhalt.split('\n'):
+        eintrag = tokenize_zeile(zeile)
+        if eintrag is None:
             continue
 
-        parsed = parse_zeile(zeile)
-        if not parsed:
+        if eintrag.fehler == FEHLER_FORMAT:
             fehler_anzahl += 1
             fehler_details.append(_('{zeile} - Ungültiges Format').format(zeile=f'"{zeile.strip()}"'))
             continue
 
-        spalten = parse_spalten(parsed['spalten'])
-        if not spalten:
+        spalten = eintrag.spalten
+        if eintrag.fehler == FEHLER_SPALTEN:
             fehler_anzahl += 1
             fehler_details.append(_('{zeile} - Spalten nicht erkennbar').format(zeile=f'"{zeile.strip()}"'))
             continue
 
         # Prüfe ob Spalten außerhalb des Bereichs
-        ungueltige = [s for s in spalten if s < 1 or s > max_spalten]
+        ungueltige = ausserhalb_bereich(spalten, max_spalten)
         if ungueltige:
             fehler_anzahl += 1
             fehler_details.append(_('{zeile} - Spalte(n) {spalten} außerhalb Bereich (1-{max})').format(
                 zeile=f'"{zeile.strip()}"',
-                spalten=ungueltige,
+                spalten=format_bereiche(ungueltige),
                 max=max_spalten
             ))
             continue
 
         # Prüfe auf Doppelbelegung
-        doppelt = [s for s in spalten if s in belegte_spalten]
+        doppelt = belegte_spalten.konflikte(spalten)
         if doppelt:
             fehler_anzahl += 1
             fehler_details.append(_('{zeile} - Spalte(n) {spalten} bereits belegt').format(
                 zeile=f'"{zeile.strip()}"',
-                spalten=doppelt
+                spalten=format_bereiche(doppelt)
             ))
             continue
 
-        for s in spalten:
-            belegte_spalten.add(s)
+        belegte_spalten.belegen(spalten)
 
         gueltige_eintraege.append({
             'spalten_liste': spalten,
-            'beschreibung': parsed['beschreibung'],
-            'spalten_str': parsed['spalten']
+            'beschreibung': eintrag.beschreibung,
+            'spalten_str': eintrag.spalten_str
         })
 
     is_valid = (fehler_anzahl == 0)
     return is_valid, gueltige_eintraege, fehler_anzahl, belegte_spalten, max_spalten, fehler_details
 
 
+# Gemeinsamer Cache für Detailansicht und Export
+validierungs_cache = ValidierungsCache(validiere_eintraege)
+
 
-def exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname, projekt=''):
+# ---------------------------------------------------------
+# Export in einen Stream (ohne Dateien und Verzeichnisse)
+# ---------------------------------------------------------
+
+def schreibe_anlage_ods(out, anlage, settings, kundenname, projekt='', dateipfad=''):
+    """Schreibt eine Anlage als ODS in einen binären Stream.
+
+    Args:
+        out: Binärer, beschreibbarer Stream (muss nicht seekbar sein)
+        anlage (dict): Anlagen-Dictionary mit allen Daten
+        settings (dict): Settings-Dictionary
+        kundenname (str): Name des Kunden für Kopfzeile
+        projekt (str): Projekt-Name für Kopfzeile
+        dateipfad (str): Dateipfad für Fußzeile (leer ohne Datei)
+
+    Raises:
+        ValueError: Wenn Anlage ungültig ist oder keine Einträge vorhanden
+            (bevor etwas geschrieben wurde)
+    """
+    if not anlage:
+        raise ValueError(_('Keine Anlage zum Exportieren vorhanden.'))
+    data = _anlage_daten(anlage)
+    write_ods(out, data, settings, _anlage_footer(anlage, kundenname, projekt, dateipfad))
+
+
+def schreibe_kunde_ods(out, kunde, settings, kundenname, dateipfad=''):
+    """Schreibt alle Anlagen eines Kunden als eine ODS in einen Stream.
+
+    Args:
+        out: Binärer, beschreibbarer Stream
+        kunde (dict): Kunden-Dictionary mit allen Daten
+        settings (dict): Settings-Dictionary
+        kundenname (str): Name des Kunden für Kopfzeile
+        dateipfad (str): Dateipfad für Fußzeile (leer ohne Datei)
+
+    Raises:
+        ValueError: Wenn Anlagen fehlerhaft sind oder keine Einträge vorhanden
+    """
+    if not kunde:
+        raise ValueError(_('Kein Kunde zum Exportieren vorhanden.'))
+    write_ods_workbook(out, _kunde_sheets(kunde, kundenname, dateipfad), settings)
+
+
+def schreibe_kunde_odt(out, kunde, kundenname):
+    """Schreibt alle Daten eines Kunden als ODT in einen Stream.
+
+    Args:
+        out: Binärer, beschreibbarer Stream
+        kunde (dict): Kunden-Dictionary mit allen Daten
+        kundenname (str): Name des Kunden
+
+    Raises:
+        ValueError: Wenn Kunde ungültig ist
+    """
+    if not kunde:
+        raise ValueError(_('Kein Kunde zum Exportieren vorhanden.'))
+
+    # Konvertiere Kunde für manuelle ODT-Erstellung
+    kunde_data = {
+        'kundenname': kundenname,
+        'projekt': kunde.get('projekt', ''),
+        'datum': kunde.get('datum', ''),
+        'adresse': kunde.get('adresse', ''),
+        'plz': kunde.get('plz', ''),
+        'ort': kunde.get('ort', ''),
+        'ansprechpartner': kunde.get('ansprechpartner', ''),
+        'telefonnummer': kunde.get('telefonnummer', ''),
+        'email': kunde.get('email', ''),
+        'anlagen': kunde.get('anlagen', [])
+    }
+    write_odt_manual(out, kunde_data)
+
+
+def schreibe_anlage_pdf(out, anlage, settings, kundenname, projekt='', dateipfad=''):
+    """Schreibt eine Anlage als druckfertige PDF in einen Stream.
+
+    Args und Raises wie bei schreibe_anlage_ods.
+    """
+    if not anlage:
+        raise ValueError(_('Keine Anlage zum Exportieren vorhanden.'))
+    data = _anlage_daten(anlage)
+    write_pdf(out, [(data, _anlage_footer(anlage, kundenname, projekt, dateipfad))], settings)
+
+
+def schreibe_kunde_pdf(out, kunde, settings, kundenname, dateipfad=''):
+    """Schreibt alle Anlagen eines Kunden als eine PDF in einen Stream.
+
+    Args und Raises wie bei schreibe_kunde_ods.
+    """
+    if not kunde:
+        raise ValueError(_('Kein Kunde zum Exportieren vorhanden.'))
+    write_pdf(out, _kunde_sheets(kunde, kundenname, dateipfad), settings)
+
+
+def als_bytes(schreibe, *args, **kwargs):
+    """Führt eine schreibe_*-Funktion im Speicher aus.
+
+    Beispiel:
+        daten = als_bytes(schreibe_anlage_ods, anlage, settings, kundenname)
+
+    Returns:
+        bytes: Inhalt der Datei
+    """
+    puffer = io.BytesIO()
+    schreibe(puffer, *args, **kwargs)
+    return puffer.getvalue()
+
+
+def _schreibe_datei(export_pfad, schreibe, *args, **kwargs):
+    """Führt eine schreibe_*-Funktion in eine neue Datei aus.
+
+    Schlägt der Export fehl, wird die angefangene Datei wieder entfernt.
+    """
+    os.makedirs(export_pfad.parent, exist_ok=True)
+    try:
+        with open(export_pfad, 'wb') as out:
+            schreibe(out, *args, **kwargs)
+    except BaseException:
+        try:
+            os.remove(export_pfad)
+        except OSError:
+            pass
+        raise
+
+
+# ---------------------------------------------------------
+# Export als Datei (Export/<kunde>/, mit Export-Manifest)
+# ---------------------------------------------------------
+
+
+def exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname, projekt='', force=False):
     """Exportiert eine Anlage als ODS-Datei manuell (Android).
 
     Args:
@@ -235,9 +346,11 @@ def exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname,
         export_base_path (Path): Basis-Pfad für Export-Verzeichnis
         kundenname (str): Name des Kunden für Unterordner
         projekt (str): Projekt-Name für Fußzeile
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
 
     Returns:
-        Path: Pfad zur exportierten Datei
+        Path: Pfad zur exportierten Datei (bei unveränderten Eingaben die
+            bereits vorhandene, siehe export_manifest)
 
     Raises:
         ValueError: Wenn Anlage ungültig ist oder keine Einträge vorhanden
@@ -246,13 +359,34 @@ def exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname,
     if not anlage:
         raise ValueError(_('Keine Anlage zum Exportieren vorhanden.'))
 
-    felder = anlage.get('felder', 3)
-    reihen = anlage.get('reihen', 7)
-    text_inhalt = anlage.get('text_inhalt', '')
+    # Unverändert seit dem letzten Export → vorhandene Datei
+    export_dir = Path(export_base_path) / kundenname
+    schluessel = f'ods:{anlage.get("id", "0")}'
+    hash_wert = eingabe_hash('ods', anlage, settings, ODS_SETTINGS, kundenname=kundenname, projekt=projekt)
+    vorhanden = None if force else vorhandene_datei(export_dir, schluessel, hash_wert)
+    if vorhanden:
+        return vorhanden
 
-    is_valid, gueltige_eintraege, fehler_anzahl, _, _, _ = validiere_eintraege(
-        text_inhalt, felder, reihen
-    )
+    # Speichern
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    anlage_id = anlage.get("id", "0")
+    dateiname = f'Kunde_{kundenname.replace(" ", "_")}_Anlage_{anlage_id}_{timestamp}.ods'
+    export_pfad = export_dir / dateiname
+
+    _schreibe_datei(export_pfad, schreibe_anlage_ods, anlage, settings, kundenname, projekt,
+                    dateipfad=str(export_pfad))
+    eintragen(export_dir, schluessel, hash_wert, export_pfad)
+
+    return export_pfad
+
+
+def _anlage_daten(anlage):
+    """Validiert eine Anlage und liefert ihre Tabellendaten.
+
+    Raises:
+        ValueError: Wenn Anlage ungültig ist oder keine Einträge vorhanden
+    """
+    is_valid, gueltige_eintraege = _validiere_anlage(anlage)
 
     if not is_valid:
         raise ValueError(_(
@@ -263,35 +397,141 @@ def exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname,
     if not gueltige_eintraege:
         raise ValueError(_('Keine gültigen Beschriftungen zum Exportieren gefunden!'))
 
-    # Sortiere nach erster Spalte
-    gueltige_eintraege.sort(key=lambda x: x['spalten_liste'][0])
-
-    # Konvertiere Daten
-    data = convert_anlage_to_manual_format(anlage, gueltige_eintraege, felder, reihen)
+    return convert_anlage_to_manual_format(
+        anlage, gueltige_eintraege, anlage.get('felder', 3), anlage.get('reihen', 7)
+    )
 
-    # Speichern
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    anlage_id = anlage.get("id", "0")
-    dateiname = f'Kunde_{kundenname.replace(" ", "_")}_Anlage_{anlage_id}_{timestamp}.ods'
-    export_pfad = Path(export_base_path) / kundenname / dateiname
-    os.makedirs(export_pfad.parent, exist_ok=True)
 
-    # Fußzeilen-Daten
-    footer_data = {
-        'filepath': str(export_pfad),
+def _anlage_footer(anlage, kundenname, projekt, dateipfad):
+    """Kopf-/Fußzeilen-Daten einer Anlage."""
+    return {
+        'filepath': str(dateipfad),
         'customer': kundenname,
         'project': projekt,
         'code': anlage.get('code', ''),
         'description': anlage.get('beschreibung', '')
     }
 
-    # Erstelle ODS manuell
-    create_ods_manual(data, settings, str(export_pfad), footer_data)
+
+def _validiere_anlage(anlage):
+    """Validiert eine Anlage für den Export (über den gemeinsamen Cache).
+
+    Returns:
+        tuple: (is_valid, gueltige_eintraege nach erster Spalte sortiert)
+    """
+    is_valid, gueltige_eintraege, _fehler, _belegte, _max, _details = validierungs_cache.validiere(
+        anlage.get('text_inhalt', ''), anlage.get('felder', 3), anlage.get('reihen', 7)
+    )
+    # Sortiere nach erster Spalte
+    gueltige_eintraege.sort(key=lambda x: x['spalten_liste'][0])
+    return is_valid, gueltige_eintraege
+
+
+def _tabellenname(name, vergeben):
+    """Eindeutiger, in ODS zulässiger Tabellenname.
+
+    Args:
+        name (str): Gewünschter Name (z.B. Anlagenbeschreibung)
+        vergeben (set): Bereits verwendete Namen (wird ergänzt)
+
+    Returns:
+        str: Name ohne TABELLENNAME_VERBOTEN-Zeichen, nicht leer, bei
+            Dopplung mit " (2)" usw.
+    """
+    bereinigt = ''.join(' ' if zeichen in TABELLENNAME_VERBOTEN else zeichen for zeichen in (name or ''))
+    basis = ' '.join(bereinigt.split())[:TABELLENNAME_MAX] or _('Anlage')
+    kandidat, nr = basis, 1
+    while kandidat.casefold() in vergeben:
+        nr += 1
+        kandidat = f'{basis} ({nr})'
+    vergeben.add(kandidat.casefold())
+    return kandidat
+
+
+def _kunde_sheets(kunde, kundenname, dateipfad=''):
+    """Tabellendaten und Kopf-/Fußzeile je Anlage eines Kunden.
+
+    Anlagen ohne Beschriftungen werden übersprungen, die Tabellennamen
+    eindeutig gemacht.
+
+    Returns:
+        list: (data, footer_data) je Anlage
+
+    Raises:
+        ValueError: Wenn Anlagen fehlerhaft sind oder keine Einträge vorhanden
+    """
+    sheets = []
+    fehlerhaft = []
+    vergeben = set()
+    for anlage in kunde.get('anlagen', []):
+        is_valid, gueltige_eintraege = _validiere_anlage(anlage)
+        if not is_valid:
+            fehlerhaft.append(anlage.get('beschreibung') or anlage.get('id', '?'))
+            continue
+        if not gueltige_eintraege:
+            continue
+
+        data = convert_anlage_to_manual_format(
+            anlage, gueltige_eintraege, anlage.get('felder', 3), anlage.get('reihen', 7)
+        )
+        data['name'] = _tabellenname(data['name'], vergeben)
+        sheets.append((data, _anlage_footer(anlage, kundenname, kunde.get('projekt', ''), dateipfad)))
+
+    if fehlerhaft:
+        raise ValueError(_(
+            'Fehlerhafte Beschriftungen in: {anlagen}. '
+            'Bitte beheben Sie die Fehler vor dem Export.'
+        ).format(anlagen=', '.join(map(str, fehlerhaft))))
+
+    if not sheets:
+        raise ValueError(_('Keine gültigen Beschriftungen zum Exportieren gefunden!'))
+
+    return sheets
+
+
+def exportiere_kunde_ods(kunde, settings, export_base_path, kundenname, force=False):
+    """Exportiert alle Anlagen eines Kunden als eine ODS-Datei (eine Tabelle je Anlage).
+
+    Anlagen ohne Beschriftungen werden übersprungen. Jede Tabelle hat eine
+    eigene Kopf-/Fußzeile (Beschreibung und Code der Anlage).
+
+    Args:
+        kunde (dict): Kunden-Dictionary mit allen Daten
+        settings (dict): Settings-Dictionary
+        export_base_path (Path): Basis-Pfad für Export-Verzeichnis
+        kundenname (str): Name des Kunden für Unterordner
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
+
+    Returns:
+        Path: Pfad zur exportierten Datei (bei unveränderten Eingaben die
+            bereits vorhandene)
+
+    Raises:
+        ValueError: Wenn Anlagen fehlerhaft sind oder keine Einträge vorhanden
+    """
+    if not kunde:
+        raise ValueError(_('Kein Kunde zum Exportieren vorhanden.'))
+
+    # Unverändert seit dem letzten Export → vorhandene Datei
+    export_dir = Path(export_base_path) / kundenname
+    hash_wert = eingabe_hash('ods-kunde', kunde, settings, ODS_SETTINGS, kundenname=kundenname)
+    vorhanden = None if force else vorhandene_datei(export_dir, 'ods-kunde', hash_wert)
+    if vorhanden:
+        return vorhanden
+
+    # Speichern
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    dateiname = f'Kunde_{kundenname.replace(" ", "_")}_Anlagen_{timestamp}.ods'
+    export_pfad = export_dir / dateiname
+
+    _schreibe_datei(export_pfad, schreibe_kunde_ods, kunde, settings, kundenname,
+                    dateipfad=str(export_pfad))
+    eintragen(export_dir, 'ods-kunde', hash_wert, export_pfad)
 
     return export_pfad
 
 
-def exportiere_anlage_ods(anlage, settings, export_base_path, kundenname, projekt=''):
+def exportiere_anlage_ods(anlage, settings, export_base_path, kundenname, projekt='', force=False):
     """Exportiert eine Anlage als ODS-Datei.
 
     Args:
@@ -300,6 +540,7 @@ def exportiere_anlage_ods(anlage, settings, export_base_path, kundenname, projek
         export_base_path (Path): Basis-Pfad für Export-Verzeichnis
         kundenname (str): Name des Kunden für Unterordner
         projekt (str): Projekt-Name für Fußzeile
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
 
     Returns:
         Path: Pfad zur exportierten Datei
@@ -307,59 +548,54 @@ def exportiere_anlage_ods(anlage, settings, export_base_path, kundenname, projek
     Raises:
         ValueError: Wenn Anlage ungültig ist oder keine Einträge vorhanden
     """
-    return exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname, projekt)
+    return exportiere_anlage_ods_manual(anlage, settings, export_base_path, kundenname, projekt, force)
 
 
-def exportiere_kunde_odt_manual(kunde, kundenname, export_base_path):
+def exportiere_kunde_odt_manual(kunde, kundenname, export_base_path, force=False):
     """Exportiert alle Daten eines Kunden als ODT-Datei manuell (Android).
 
     Args:
         kunde (dict): Kunden-Dictionary mit allen Daten
         kundenname (str): Name des Kunden
         export_base_path (Path): Basis-Pfad für Export-Verzeichnis
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
 
     Returns:
-        Path: Pfad zur exportierten Datei
+        Path: Pfad zur exportierten Datei (bei unveränderten Eingaben die
+            bereits vorhandene)
 
     Raises:
         ValueError: Wenn Kunde ungültig ist
     """
     if not kunde:
         raise ValueError(_('Kein Kunde zum Exportieren vorhanden.'))
-    
-    # Konvertiere Kunde für manuelle ODT-Erstellung
-    kunde_data = {
-        'kundenname': kundenname,
-        'projekt': kunde.get('projekt', ''),
-        'datum': kunde.get('datum', ''),
-        'adresse': kunde.get('adresse', ''),
-        'plz': kunde.get('plz', ''),
-        'ort': kunde.get('ort', ''),
-        'ansprechpartner': kunde.get('ansprechpartner', ''),
-        'telefonnummer': kunde.get('telefonnummer', ''),
-        'email': kunde.get('email', ''),
-        'anlagen': kunde.get('anlagen', [])
-    }
+
+    # Unverändert seit dem letzten Export → vorhandene Datei
+    export_dir = Path(export_base_path) / kundenname
+    hash_wert = eingabe_hash('odt', kunde, kundenname=kundenname)
+    vorhanden = None if force else vorhandene_datei(export_dir, 'odt', hash_wert)
+    if vorhanden:
+        return vorhanden
     
     # Speichern
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     dateiname = f'Kunde_{kundenname.replace(" ", "_")}_{timestamp}.odt'
-    export_pfad = Path(export_base_path) / kundenname / dateiname
-    os.makedirs(export_pfad.parent, exist_ok=True)
+    export_pfad = export_dir / dateiname
     
-    # Erstelle ODT manuell
-    create_odt_manual(kunde_data, str(export_pfad))
+    _schreibe_datei(export_pfad, schreibe_kunde_odt, kunde, kundenname)
+    eintragen(export_dir, 'odt', hash_wert, export_pfad)
     
     return export_pfad
 
 
-def exportiere_kunde_odt(kunde, kundenname, export_base_path):
+def exportiere_kunde_odt(kunde, kundenname, export_base_path, force=False):
     """Exportiert alle Daten eines Kunden als ODT-Datei.
 
     Args:
         kunde (dict): Kunden-Dictionary mit allen Daten
         kundenname (str): Name des Kunden
         export_base_path (Path): Basis-Pfad für Export-Verzeichnis
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
 
     Returns:
         Path: Pfad zur exportierten Datei
@@ -367,7 +603,89 @@ def exportiere_kunde_odt(kunde, kundenname, export_base_path):
     Raises:
         ValueError: Wenn Kunde ungültig ist
     """
-    return exportiere_kunde_odt_manual(kunde, kundenname, export_base_path)
+    return exportiere_kunde_odt_manual(kunde, kundenname, export_base_path, force)
+
+
+def exportiere_anlage_pdf(anlage, settings, export_base_path, kundenname, projekt='', force=False):
+    """Exportiert eine Anlage als druckfertige PDF-Datei (siehe pdf_renderer).
+
+    Args:
+        anlage (dict): Anlagen-Dictionary mit allen Daten
+        settings (dict): Settings-Dictionary
+        export_base_path (Path): Basis-Pfad für Export-Verzeichnis
+        kundenname (str): Name des Kunden für Unterordner
+        projekt (str): Projekt-Name für Kopfzeile
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
+
+    Returns:
+        Path: Pfad zur exportierten Datei (bei unveränderten Eingaben die
+            bereits vorhandene)
+
+    Raises:
+        ValueError: Wenn Anlage ungültig ist oder keine Einträge vorhanden
+    """
+    if not anlage:
+        raise ValueError(_('Keine Anlage zum Exportieren vorhanden.'))
+
+    # Unverändert seit dem letzten Export → vorhandene Datei
+    export_dir = Path(export_base_path) / kundenname
+    anlage_id = anlage.get("id", "0")
+    schluessel = f'pdf:{anlage_id}'
+    hash_wert = eingabe_hash('pdf', anlage, settings, ODS_SETTINGS, kundenname=kundenname, projekt=projekt)
+    vorhanden = None if force else vorhandene_datei(export_dir, schluessel, hash_wert)
+    if vorhanden:
+        return vorhanden
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    dateiname = f'Kunde_{kundenname.replace(" ", "_")}_Anlage_{anlage_id}_{timestamp}.pdf'
+    export_pfad = export_dir / dateiname
+
+    _schreibe_datei(export_pfad, schreibe_anlage_pdf, anlage, settings, kundenname, projekt,
+                    dateipfad=str(export_pfad))
+    eintragen(export_dir, schluessel, hash_wert, export_pfad)
+
+    return export_pfad
+
+
+def exportiere_kunde_pdf(kunde, settings, export_base_path, kundenname, force=False):
+    """Exportiert alle Anlagen eines Kunden als eine PDF-Datei.
+
+    Jede Anlage beginnt auf einer neuen Seite mit eigener Kopf-/Fußzeile;
+    Anlagen ohne Beschriftungen werden übersprungen.
+
+    Args:
+        kunde (dict): Kunden-Dictionary mit allen Daten
+        settings (dict): Settings-Dictionary
+        export_base_path (Path): Basis-Pfad für Export-Verzeichnis
+        kundenname (str): Name des Kunden für Unterordner
+        force (bool): Auch bei unveränderten Eingaben neu erzeugen
+
+    Returns:
+        Path: Pfad zur exportierten Datei (bei unveränderten Eingaben die
+            bereits vorhandene)
+
+    Raises:
+        ValueError: Wenn Anlagen fehlerhaft sind oder keine Einträge vorhanden
+    """
+    if not kunde:
+        raise ValueError(_('Kein Kunde zum Exportieren vorhanden.'))
+
+    # Unverändert seit dem letzten Export → vorhandene Datei
+    export_dir = Path(export_base_path) / kundenname
+    hash_wert = eingabe_hash('pdf-kunde', kunde, settings, ODS_SETTINGS, kundenname=kundenname)
+    vorhanden = None if force else vorhandene_datei(export_dir, 'pdf-kunde', hash_wert)
+    if vorhanden:
+        return vorhanden
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    dateiname = f'Kunde_{kundenname.replace(" ", "_")}_Anlagen_{timestamp}.pdf'
+    export_pfad = export_dir / dateiname
+
+    _schreibe_datei(export_pfad, schreibe_kunde_pdf, kunde, settings, kundenname,
+                    dateipfad=str(export_pfad))
+    eintragen(export_dir, 'pdf-kunde', hash_wert, export_pfad)
+
+    return export_pfad
 
 
 if __name__ == "__main__":
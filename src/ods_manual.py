@@ -2,15 +2,99 @@
 # -*- coding: utf-8 -*-
 """Manuelle ODS/ODT Erstellung für Android (ohne odfpy)."""
 
+import hashlib
 import io
+import json
+import threading
 import zipfile
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from datetime import datetime
 
-from constants import _, TOOL_FLET_VERSION
+from constants import _, TOOL_FLET_VERSION, ODF_TEIL_CACHE_MAX
+from xml_stream import XmlStreamWriter
 
 WATERMARK_TEXT = "Verteiler-Beschriften - (C)2026 vohegg@gmail.com"
 WATERMARK_COLOR = "#AAAAAA"  # Hellgrau
+
+# Namespace Definitionen
+NS_ODS = {
+    'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+    'style': 'urn:oasis:names:tc:opendocument:xmlns:style:1.0',
+    'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
+    'table': 'urn:oasis:names:tc:opendocument:xmlns:table:1.0',
+    'fo': 'urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0',
+    'svg': 'urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0',
+    'draw': 'urn:oasis:names:tc:opendocument:xmlns:drawing:1.0',
+    'loext': 'urn:org:documentfoundation:names:experimental:office:xmlns:loext:1.0',
+    'manifest': 'urn:oasis:names:tc:opendocument:xmlns:manifest:1.0',
+}
+
+# Im Wurzelelement von content.xml deklarierte Namespaces
+CONTENT_NAMESPACES = ('office', 'style', 'text', 'table', 'fo', 'svg', 'draw', 'loext')
+
+# Settings, von denen die statischen Teile abhängen (Schlüssel des Caches)
+STYLES_SETTINGS = ('seite_breite', 'seite_hoehe', 'rand_oben', 'rand_unten',
+                   'rand_links', 'rand_rechts')
+CONTENT_STYLE_SETTINGS = ('spalten_breite', 'beschriftung_row_hoehe', 'inhalt_row_hoehe',
+                          'zellen_umrandung', 'fontsize_beschriftung_zelle',
+                          'fontsize_gemergte_zelle', 'fontsize_inhalt_zelle')
+
+# Serialisierte statische Teile: (art, fingerprint) → bytes bzw. (kopf, ende)
+_statische_teile = OrderedDict()
+_statische_teile_lock = threading.Lock()
+
+
+def _fingerprint(settings, keys, NS):
+    """Hash über die relevanten Settings und die Namespaces."""
+    werte = json.dumps([[settings.get(key) for key in keys], sorted(NS.items())], default=str)
+    return hashlib.blake2b(werte.encode('utf-8'), digest_size=16).digest()
+
+
+def _statischer_teil(art, settings, keys, NS, erzeuge):
+    """Liefert einen serialisierten statischen Teil aus dem Cache.
+
+    Args:
+        art (str): Art des Teils (z.B. 'manifest', 'styles', 'content')
+        settings (dict): Settings Dictionary
+        keys (tuple): Für diesen Teil relevante Settings
+        NS (dict): Namespace Definitionen
+        erzeuge: Callable() → Teil, nur bei einem Fehlgriff aufgerufen
+
+    Returns:
+        Der gespeicherte Teil (bytes bzw. Tupel aus bytes)
+    """
+    schluessel = (art, _fingerprint(settings, keys, NS))
+    with _statische_teile_lock:
+        teil = _statische_teile.get(schluessel)
+        if teil is not None:
+            _statische_teile.move_to_end(schluessel)
+            return teil
+    teil = erzeuge()
+    with _statische_teile_lock:
+        _statische_teile[schluessel] = teil
+        while len(_statische_teile) > ODF_TEIL_CACHE_MAX:
+            _statische_teile.popitem(last=False)
+    return teil
+
+
+def _rahmen(schreibe_kopf):
+    """Erzeugt Dokumentanfang und -ende mit einem XmlStreamWriter.
+
+    Args:
+        schreibe_kopf: Callable(writer), öffnet die Elemente des Anfangs
+
+    Returns:
+        tuple: (kopf, ende) als bytes – ende schließt die offenen Tags
+    """
+    puffer = io.BytesIO()
+    w = XmlStreamWriter(puffer)
+    schreibe_kopf(w)
+    offen = w.detach()
+    ende = ''.join(f'</{tag}>' for tag in reversed(offen))
+    return puffer.getvalue(), ende.encode('utf-8')
+
+
 def create_ods_manual(data, settings, output_path, footer_data=None):
     """Erstellt ODS-Datei manuell mit zipfile und XML.
     
@@ -21,44 +105,96 @@ def create_ods_manual(data, settings, output_path, footer_data=None):
         footer_data: Optional - Dictionary mit Fußzeilen-Daten
                     {filepath, customer, project, code, description}
     """
-    # Namespace Definitionen
-    NS = {
-        'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
-        'style': 'urn:oasis:names:tc:opendocument:xmlns:style:1.0',
-        'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
-        'table': 'urn:oasis:names:tc:opendocument:xmlns:table:1.0',
-        'fo': 'urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0',
-        'svg': 'urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0',
-        'draw': 'urn:oasis:names:tc:opendocument:xmlns:drawing:1.0',
-        'loext': 'urn:org:documentfoundation:names:experimental:office:xmlns:loext:1.0',
-        'manifest': 'urn:oasis:names:tc:opendocument:xmlns:manifest:1.0',
-    }
-    
+    with open(output_path, 'wb') as out:
+        write_ods(out, data, settings, footer_data)
+
+
+def write_ods(out, data, settings, footer_data=None):
+    """Schreibt eine ODS-Datei in einen binären Stream (wie create_ods_manual).
+
+    Args:
+        out: Binärer, beschreibbarer Stream (z.B. io.BytesIO); muss nicht
+            seekbar sein
+        data: Dictionary mit Tabellendaten
+        settings: Settings Dictionary
+        footer_data: Optional - Dictionary mit Fußzeilen-Daten
+    """
+    _schreibe_ods(
+        out, settings,
+        lambda content: write_content_xml(content, data, settings, NS_ODS, footer_data),
+        [('Default', footer_data)],
+    )
+
+
+def create_ods_workbook(sheets, settings, output_path):
+    """Erstellt eine ODS-Datei mit einer Tabelle pro Eintrag.
+
+    Alle Tabellen teilen sich die Styles; jede bekommt über einen eigenen
+    Tabellen-Style eine eigene Master-Page mit Kopf-/Fußzeile. Die Datei
+    wird in einem Durchgang geschrieben (eine ZIP-Datei, ein Deflate-Strom
+    je Eintrag).
+
+    Args:
+        sheets: Liste von (data, footer_data) – data wie bei create_ods_manual,
+            data['name'] ist der Tabellenname (muss eindeutig sein)
+        settings: Settings Dictionary
+        output_path: Ausgabepfad
+    """
+    with open(output_path, 'wb') as out:
+        write_ods_workbook(out, sheets, settings)
+
+
+def write_ods_workbook(out, sheets, settings):
+    """Schreibt eine ODS-Datei mit einer Tabelle pro Eintrag in einen Stream.
+
+    Args:
+        out: Binärer, beschreibbarer Stream
+        sheets: Liste von (data, footer_data) wie bei create_ods_workbook
+        settings: Settings Dictionary
+    """
+    _schreibe_ods(
+        out, settings,
+        lambda content: write_workbook_content_xml(content, sheets, settings, NS_ODS),
+        [(f'Master{nr}', footer_data) for nr, (_data, footer_data) in enumerate(sheets, 1)],
+    )
+
+
+def _schreibe_ods(out, settings, schreibe_content, seiten):
+    """Schreibt die ZIP-Struktur einer ODS-Datei.
+
+    Args:
+        out: Binärer, beschreibbarer Stream
+        settings: Settings Dictionary
+        schreibe_content: Callable(out), schreibt content.xml
+        seiten: Liste von (Name der Master-Page, footer_data)
+    """
+    NS = NS_ODS
+
     # Registriere Namespaces
     for prefix, uri in NS.items():
         ET.register_namespace(prefix, uri)
     
     # Erstelle ZIP
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
         # 1. mimetype (MUSS erste Datei sein, unkomprimiert)
         zf.writestr('mimetype', 
                     'application/vnd.oasis.opendocument.spreadsheet',
                     compress_type=zipfile.ZIP_STORED)
         
-        # 2. manifest.xml
-        manifest = create_manifest_xml(NS)
-        zf.writestr('META-INF/manifest.xml', 
-                    ET.tostring(manifest, encoding='utf-8', xml_declaration=True))
+        # 2. manifest.xml (unabhängig von den Settings, einmal serialisiert)
+        manifest = _statischer_teil(
+            'manifest', settings, (), NS,
+            lambda: ET.tostring(create_manifest_xml(NS), encoding='utf-8', xml_declaration=True)
+        )
+        zf.writestr('META-INF/manifest.xml', manifest)
         
-        # 3. content.xml
-        content = create_content_xml(data, settings, NS, footer_data)
-        zf.writestr('content.xml',
-                    ET.tostring(content, encoding='utf-8', xml_declaration=True))
+        # 3. content.xml (direkt in den ZIP-Eintrag gestreamt)
+        with zf.open('content.xml', 'w') as out:
+            schreibe_content(out)
         
         # 4. styles.xml
-        styles = create_styles_xml(settings, NS, footer_data)
-        zf.writestr('styles.xml',
-                    ET.tostring(styles, encoding='utf-8', xml_declaration=True))
+        with zf.open('styles.xml', 'w') as out:
+            _write_styles(out, settings, NS, seiten)
         
         # 5. meta.xml
         meta = create_meta_xml(NS)
@@ -107,360 +243,424 @@ def create_meta_xml(NS):
     return root
 
 
-def create_styles_xml(settings, NS, footer_data=None):
-    """Erstellt styles.xml mit Page Layout, Header, Footer und Styles."""
-    root = ET.Element(f'{{{NS["office"]}}}document-styles',
-                     attrib={f'{{{NS["office"]}}}version': '1.2'})
-    
-    # Automatische Styles
-    auto_styles = ET.SubElement(root, f'{{{NS["office"]}}}automatic-styles')
-    
-    # Text-Style MT1 für Header (10pt)
-    text_style_header = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                              attrib={
-                                  f'{{{NS["style"]}}}name': 'MT1',
-                                  f'{{{NS["style"]}}}family': 'text'
-                              })
-    ET.SubElement(text_style_header, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': '10pt',
-                     f'{{{NS["fo"]}}}font-family': 'Liberation Sans',
-                 })
-    
-    # Text-Style MT2 für Footer (6pt)
-    text_style_footer = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                              attrib={
-                                  f'{{{NS["style"]}}}name': 'MT2',
-                                  f'{{{NS["style"]}}}family': 'text'
-                              })
-    ET.SubElement(text_style_footer, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': '6pt',
-                     f'{{{NS["fo"]}}}font-family': 'Liberation Sans',
-                 })
-    
-    # Page Layout mit Header/Footer-Style
-    page_layout = ET.SubElement(auto_styles, f'{{{NS["style"]}}}page-layout',
-                                attrib={f'{{{NS["style"]}}}name': 'PageLayout1'})
-    
-    page_props = ET.SubElement(page_layout, f'{{{NS["style"]}}}page-layout-properties',
-                              attrib={
-                                  f'{{{NS["fo"]}}}page-width': f"{settings.get('seite_breite', 29.7)}cm",
-                                  f'{{{NS["fo"]}}}page-height': f"{settings.get('seite_hoehe', 21.0)}cm",
-                                  f'{{{NS["fo"]}}}margin-top': f"{settings.get('rand_oben', 2.0)}cm",
-                                  f'{{{NS["fo"]}}}margin-bottom': f"{settings.get('rand_unten', 1.5)}cm",
-                                  f'{{{NS["fo"]}}}margin-left': f"{settings.get('rand_links', 1.0)}cm",
-                                  f'{{{NS["fo"]}}}margin-right': f"{settings.get('rand_rechts', 1.0)}cm",
-                                  'style:print-orientation': 'landscape',
-                              })
-    
-    # Header-Style
-    header_style = ET.SubElement(page_layout, f'{{{NS["style"]}}}header-style')
-    ET.SubElement(header_style, f'{{{NS["style"]}}}header-footer-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}min-height': '0.75cm',
-                     f'{{{NS["fo"]}}}margin-left': '0cm',
-                     f'{{{NS["fo"]}}}margin-right': '0cm',
-                     f'{{{NS["fo"]}}}margin-bottom': '0.25cm',
-                 })
-    
-    # Footer-Style
-    footer_style = ET.SubElement(page_layout, f'{{{NS["style"]}}}footer-style')
-    ET.SubElement(footer_style, f'{{{NS["style"]}}}header-footer-properties',
-                 attrib={
-                     f'{{{NS["svg"]}}}height': '0.75cm',
-                     f'{{{NS["fo"]}}}margin-left': '0cm',
-                     f'{{{NS["fo"]}}}margin-right': '0cm',
-                     f'{{{NS["fo"]}}}margin-top': '0.25cm',
-                 })
-    
-    # Master Styles
-    master_styles = ET.SubElement(root, f'{{{NS["office"]}}}master-styles')
-    master_page = ET.SubElement(master_styles, f'{{{NS["style"]}}}master-page',
-                               attrib={
-                                   f'{{{NS["style"]}}}name': 'Default',
-                                   f'{{{NS["style"]}}}page-layout-name': 'PageLayout1'
-                               })
-    
+def write_styles_xml(out, settings, NS, footer_data=None):
+    """Schreibt styles.xml mit Page Layout, Header, Footer und Styles.
+
+    Alles bis zu den Master-Pages hängt nur von den Settings ab und kommt
+    serialisiert aus dem Cache; je Datei werden nur Kopf- und Fußzeile
+    geschrieben.
+
+    Args:
+        out: Binärer Stream (z.B. zf.open('styles.xml', 'w'))
+        settings: Settings Dictionary
+        NS: Namespace Definitionen {präfix: uri}
+        footer_data: Optional - Dictionary mit Fußzeilen-Daten
+    """
+    _write_styles(out, settings, NS, [('Default', footer_data)])
+
+
+def _write_styles(out, settings, NS, seiten):
+    """Schreibt styles.xml mit einer Master-Page je (name, footer_data)."""
+    # Ohne Kopf-/Fußzeile wird der text-Namespace nicht deklariert (wie ET.tostring)
+    mit_kopfzeile = any(footer_data for _name, footer_data in seiten)
+    kopf, ende = _statischer_teil(
+        'styles-kopfzeile' if mit_kopfzeile else 'styles', settings, STYLES_SETTINGS, NS,
+        lambda: _rahmen(lambda w: _write_styles_kopf(w, settings, NS, mit_kopfzeile))
+    )
+    out.write(kopf)
+
+    w = XmlStreamWriter(out)
+    for name, footer_data in seiten:
+        _write_master_page(w, name, footer_data)
+    w.close()
+    out.write(ende)
+
+
+def _write_master_page(w, name, footer_data):
+    """Master-Page mit Kopfzeile (3 Regionen) und Fußzeile der ersten Seite."""
+    w.start('style:master-page', {
+        'style:name': name,
+        'style:page-layout-name': 'PageLayout1',
+    })
+
     # Header mit 3 Regionen
     if footer_data:
-        header = ET.SubElement(master_page, f'{{{NS["style"]}}}header')
-        
+        w.start('style:header')
+
         # Region Links: Kundenname
-        region_left = ET.SubElement(header, f'{{{NS["style"]}}}region-left')
-        p_left = ET.SubElement(region_left, f'{{{NS["text"]}}}p')
-        p_left.text = footer_data.get('customer', '')
-        
+        w.start('style:region-left')
+        w.element('text:p', text=footer_data.get('customer', ''))
+        w.end()
+
         # Region Mitte: Projekt
-        region_center = ET.SubElement(header, f'{{{NS["style"]}}}region-center')
-        p_center = ET.SubElement(region_center, f'{{{NS["text"]}}}p')
-        p_center.text = footer_data.get('project', '')
-        
+        w.start('style:region-center')
+        w.element('text:p', text=footer_data.get('project', ''))
+        w.end()
+
         # Region Rechts: Anlagenbeschreibung
-        region_right = ET.SubElement(header, f'{{{NS["style"]}}}region-right')
-        p_right = ET.SubElement(region_right, f'{{{NS["text"]}}}p')
-        span_right = ET.SubElement(p_right, f'{{{NS["text"]}}}span',
-                                  attrib={f'{{{NS["text"]}}}style-name': 'MT1'})
-        span_right.text = footer_data.get('description', '')
-    
+        w.start('style:region-right')
+        w.start('text:p')
+        w.element('text:span', {'text:style-name': 'MT1'}, footer_data.get('description', ''))
+        w.end()
+        w.end()
+
+        w.end()  # header
+
     # Leerer Footer (normal)
-    ET.SubElement(master_page, f'{{{NS["style"]}}}footer')
-    
+    w.element('style:footer')
+
     # Footer-First mit 2 Regionen
     if footer_data:
-        footer_first = ET.SubElement(master_page, f'{{{NS["style"]}}}footer-first')
-        
+        w.start('style:footer-first')
+
         # Region Links: Dateipfad
-        region_left = ET.SubElement(footer_first, f'{{{NS["style"]}}}region-left')
-        p_left = ET.SubElement(region_left, f'{{{NS["text"]}}}p')
-        span_left = ET.SubElement(p_left, f'{{{NS["text"]}}}span',
-                                 attrib={f'{{{NS["text"]}}}style-name': 'MT2'})
-        span_left.text = footer_data.get('filepath', '')
-        
+        w.start('style:region-left')
+        w.start('text:p')
+        w.element('text:span', {'text:style-name': 'MT2'}, footer_data.get('filepath', ''))
+        w.end()
+        w.end()
+
         # Region Rechts: Code
-        region_right = ET.SubElement(footer_first, f'{{{NS["style"]}}}region-right')
-        p_right = ET.SubElement(region_right, f'{{{NS["text"]}}}p')
-        span_right = ET.SubElement(p_right, f'{{{NS["text"]}}}span',
-                                  attrib={f'{{{NS["text"]}}}style-name': 'MT2'})
-        span_right.text = footer_data.get('code', '')
-    
-    return root
+        w.start('style:region-right')
+        w.start('text:p')
+        w.element('text:span', {'text:style-name': 'MT2'}, footer_data.get('code', ''))
+        w.end()
+        w.end()
 
+        w.end()  # footer-first
+
+    w.end()  # master-page
+
+
+def _write_styles_kopf(w, settings, NS, mit_kopfzeile):
+    """Statischer Anfang von styles.xml bis einschließlich <office:master-styles>."""
+    namespaces = ('office', 'style', 'fo', 'svg') + (('text',) if mit_kopfzeile else ())
+    w.declaration()
+    w.start('office:document-styles',
+            {'office:version': '1.2'},
+            namespaces={praefix: NS[praefix] for praefix in namespaces})
 
-def create_content_xml(data, settings, NS, footer_data=None):
-    """Erstellt content.xml mit Tabellendaten."""
-    root = ET.Element(f'{{{NS["office"]}}}document-content',
-                     attrib={f'{{{NS["office"]}}}version': '1.2'})
-    
     # Automatische Styles
-    auto_styles = ET.SubElement(root, f'{{{NS["office"]}}}automatic-styles')
-    
-    # Spalten Style
-    col_style = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                             attrib={
-                                 f'{{{NS["style"]}}}name': 'co1',
-                                 f'{{{NS["style"]}}}family': 'table-column'
-                             })
-    ET.SubElement(col_style, f'{{{NS["style"]}}}table-column-properties',
-                 attrib={f'{{{NS["style"]}}}column-width': f"{settings.get('spalten_breite', 1.75)}cm"})
-    
-    # Row Styles
-    label_row = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                              attrib={
-                                  f'{{{NS["style"]}}}name': 'ro1',
-                                  f'{{{NS["style"]}}}family': 'table-row'
-                              })
-    ET.SubElement(label_row, f'{{{NS["style"]}}}table-row-properties',
-                 attrib={f'{{{NS["style"]}}}row-height': f"{settings.get('beschriftung_row_hoehe', 0.5)}cm"})
-    
-    content_row = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                              attrib={
-                                  f'{{{NS["style"]}}}name': 'ro2',
-                                  f'{{{NS["style"]}}}family': 'table-row'
-                              })
-    ET.SubElement(content_row, f'{{{NS["style"]}}}table-row-properties',
-                 attrib={f'{{{NS["style"]}}}row-height': f"{settings.get('inhalt_row_hoehe', 0.5)}cm"})
-    
-    # Cell Styles
-    border = '0.5pt solid #000000' if settings.get('zellen_umrandung', True) else 'none'
-    
-    # Beschriftung Cell
-    label_cell = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                               attrib={
-                                   f'{{{NS["style"]}}}name': 'ce1',
-                                   f'{{{NS["style"]}}}family': 'table-cell'
-                               })
-    ET.SubElement(label_cell, f'{{{NS["style"]}}}table-cell-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}border': border,
-                     f'{{{NS["fo"]}}}wrap-option': 'wrap',
-                     f'{{{NS["style"]}}}vertical-align': 'top',
-                 })
-    ET.SubElement(label_cell, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': f"{settings.get('fontsize_beschriftung_zelle', 7)}pt",
-                     f'{{{NS["fo"]}}}font-weight': 'bold',
-                     f'{{{NS["fo"]}}}hyphenate': 'true',
-                 })
-    ET.SubElement(label_cell, f'{{{NS["style"]}}}paragraph-properties',
-                 attrib={f'{{{NS["fo"]}}}text-align': 'center'})
-    
-    # Gemergte Cell
-    merged_cell = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                               attrib={
-                                   f'{{{NS["style"]}}}name': 'ce2',
-                                   f'{{{NS["style"]}}}family': 'table-cell'
-                               })
-    ET.SubElement(merged_cell, f'{{{NS["style"]}}}table-cell-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}border': border,
-                     f'{{{NS["fo"]}}}wrap-option': 'wrap',
-                     f'{{{NS["style"]}}}vertical-align': 'top',
-                 })
-    ET.SubElement(merged_cell, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': f"{settings.get('fontsize_gemergte_zelle', 7)}pt",
-                     f'{{{NS["fo"]}}}font-weight': 'bold',
-                     f'{{{NS["fo"]}}}hyphenate': 'true',
-                 })
-    ET.SubElement(merged_cell, f'{{{NS["style"]}}}paragraph-properties',
-                 attrib={f'{{{NS["fo"]}}}text-align': 'center'})
-    
-    # Inhalt Cell
-    content_cell = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                               attrib={
-                                   f'{{{NS["style"]}}}name': 'ce3',
-                                   f'{{{NS["style"]}}}family': 'table-cell'
-                               })
-    ET.SubElement(content_cell, f'{{{NS["style"]}}}table-cell-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}border': border,
-                     f'{{{NS["fo"]}}}wrap-option': 'wrap',
-                     f'{{{NS["style"]}}}vertical-align': 'top',
-                 })
-    ET.SubElement(content_cell, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': f"{settings.get('fontsize_inhalt_zelle', 6)}pt",
-                     f'{{{NS["fo"]}}}hyphenate': 'true',
-                 })
-    ET.SubElement(content_cell, f'{{{NS["style"]}}}paragraph-properties',
-                 attrib={f'{{{NS["fo"]}}}text-align': 'center'})
-    
-    # Watermark Text Style (5pt, grau)
-    watermark_style = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                                   attrib={
-                                       f'{{{NS["style"]}}}name': 'P1',
-                                       f'{{{NS["style"]}}}family': 'paragraph'
-                                   })
-    ET.SubElement(watermark_style, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': '5pt',
-                     f'{{{NS["fo"]}}}color': WATERMARK_COLOR,
-                 })
-    
-    # Text Span Style für Watermark
-    span_style = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                              attrib={
-                                  f'{{{NS["style"]}}}name': 'T1',
-                                  f'{{{NS["style"]}}}family': 'text'
-                              })
-    ET.SubElement(span_style, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': '5pt',
-                     f'{{{NS["fo"]}}}color': WATERMARK_COLOR,
-                     f'{{{NS["loext"]}}}opacity': '100%',
-                 })
-    
-    # Watermark Graphic Style (für draw:frame)
-    graphic_style = ET.SubElement(auto_styles, f'{{{NS["style"]}}}style',
-                                 attrib={
-                                     f'{{{NS["style"]}}}name': 'gr1',
-                                     f'{{{NS["style"]}}}family': 'graphic',
-                                     f'{{{NS["style"]}}}parent-style-name': 'Default'
-                                 })
-    ET.SubElement(graphic_style, f'{{{NS["style"]}}}graphic-properties',
-                 attrib={
-                     f'{{{NS["draw"]}}}stroke': 'none',
-                     f'{{{NS["draw"]}}}fill': 'none',
-                     f'{{{NS["draw"]}}}textarea-horizontal-align': 'left',
-                     f'{{{NS["draw"]}}}textarea-vertical-align': 'bottom',
-                     f'{{{NS["fo"]}}}min-height': '0.4cm',
-                     f'{{{NS["loext"]}}}decorative': 'false',
-                 })
-    ET.SubElement(graphic_style, f'{{{NS["style"]}}}paragraph-properties',
-                 attrib={
-                     f'{{{NS["style"]}}}writing-mode': 'lr-tb'
-                 })
-    ET.SubElement(graphic_style, f'{{{NS["style"]}}}text-properties',
-                 attrib={
-                     f'{{{NS["fo"]}}}font-size': '5pt',
-                     f'{{{NS["fo"]}}}color': WATERMARK_COLOR,
-                     f'{{{NS["loext"]}}}opacity': '100%',
-                 })
-    
-    # Body
-    body = ET.SubElement(root, f'{{{NS["office"]}}}body')
-    spreadsheet = ET.SubElement(body, f'{{{NS["office"]}}}spreadsheet')
-    
+    w.start('office:automatic-styles')
+
+    # Text-Style MT1 für Header (10pt)
+    w.start('style:style', {'style:name': 'MT1', 'style:family': 'text'})
+    w.element('style:text-properties', {
+        'fo:font-size': '10pt',
+        'fo:font-family': 'Liberation Sans',
+    })
+    w.end()
+
+    # Text-Style MT2 für Footer (6pt)
+    w.start('style:style', {'style:name': 'MT2', 'style:family': 'text'})
+    w.element('style:text-properties', {
+        'fo:font-size': '6pt',
+        'fo:font-family': 'Liberation Sans',
+    })
+    w.end()
+
+    # Page Layout mit Header/Footer-Style
+    w.start('style:page-layout', {'style:name': 'PageLayout1'})
+    w.element('style:page-layout-properties', {
+        'fo:page-width': f"{settings.get('seite_breite', 29.7)}cm",
+        'fo:page-height': f"{settings.get('seite_hoehe', 21.0)}cm",
+        'fo:margin-top': f"{settings.get('rand_oben', 2.0)}cm",
+        'fo:margin-bottom': f"{settings.get('rand_unten', 1.5)}cm",
+        'fo:margin-left': f"{settings.get('rand_links', 1.0)}cm",
+        'fo:margin-right': f"{settings.get('rand_rechts', 1.0)}cm",
+        'style:print-orientation': 'landscape',
+    })
+
+    # Header-Style
+    w.start('style:header-style')
+    w.element('style:header-footer-properties', {
+        'fo:min-height': '0.75cm',
+        'fo:margin-left': '0cm',
+        'fo:margin-right': '0cm',
+        'fo:margin-bottom': '0.25cm',
+    })
+    w.end()
+
+    # Footer-Style
+    w.start('style:footer-style')
+    w.element('style:header-footer-properties', {
+        'svg:height': '0.75cm',
+        'fo:margin-left': '0cm',
+        'fo:margin-right': '0cm',
+        'fo:margin-top': '0.25cm',
+    })
+    w.end()
+
+    w.end()  # page-layout
+    w.end()  # automatic-styles
+
+    # Master Styles
+    w.start('office:master-styles')
+
+
+def write_content_xml(out, data, settings, NS, footer_data=None):
+    """Schreibt content.xml mit Tabellendaten direkt in einen Stream.
+
+    Zeilen und Zellen werden geschrieben, sobald sie erzeugt sind – der
+    Speicherbedarf hängt nicht von der Anzahl der Zeilen ab. Die
+    automatischen Styles kommen serialisiert aus dem Cache.
+
+    Args:
+        out: Binärer Stream (z.B. zf.open('content.xml', 'w'))
+        data: Dictionary mit Tabellendaten
+        settings: Settings Dictionary
+        NS: Namespace Definitionen {präfix: uri}
+        footer_data: Optional - Dictionary mit Fußzeilen-Daten (ungenutzt)
+    """
+    kopf, ende = _statischer_teil(
+        'content', settings, CONTENT_STYLE_SETTINGS, NS,
+        lambda: _rahmen(lambda w: _write_content_kopf(w, settings, NS))
+    )
+    out.write(kopf)
+
+    w = XmlStreamWriter(out)
+    _write_table(w, data, settings)
+    w.close()
+    out.write(ende)
+
+
+def write_workbook_content_xml(out, sheets, settings, NS):
+    """Schreibt content.xml mit einer Tabelle pro (data, footer_data).
+
+    Tabelle Nr. n verweist über den Tabellen-Style tan auf die
+    Master-Page Mastern (siehe create_ods_workbook).
+    """
+    anzahl = len(sheets)
+    kopf, ende = _statischer_teil(
+        f'content-{anzahl}', settings, CONTENT_STYLE_SETTINGS, NS,
+        lambda: _rahmen(lambda w: _write_content_kopf(w, settings, NS, anzahl))
+    )
+    out.write(kopf)
+
+    w = XmlStreamWriter(out)
+    for nr, (data, _footer_data) in enumerate(sheets, 1):
+        _write_table(w, data, settings, style_name=f'ta{nr}', watermark_name=f'Watermark_{nr}_')
+    w.close()
+    out.write(ende)
+
+
+def _write_table(w, data, settings, style_name='ta1', watermark_name='Watermark_'):
+    """Schreibt eine Tabelle (table:table) mit allen Zeilen.
+
+    Args:
+        w (XmlStreamWriter): Writer
+        data: Dictionary mit Tabellendaten; data['rows'] liefert
+            (ist_kopf, zellen) mit zellen als Folge von (text, style, colspan)
+        settings: Settings Dictionary
+        style_name (str): Tabellen-Style (bestimmt die Master-Page)
+        watermark_name (str): Präfix der Watermark-Rahmen (eindeutig je Tabelle)
+    """
     # Tabelle
-    table = ET.SubElement(spreadsheet, f'{{{NS["table"]}}}table',
-                         attrib={
-                             f'{{{NS["table"]}}}name': data.get('name', 'Tabelle1'),
-                             f'{{{NS["table"]}}}style-name': 'ta1'
-                         })
-    
+    w.start('table:table', {
+        'table:name': data.get('name', 'Tabelle1'),
+        'table:style-name': style_name,
+    })
+
     # Spalten definieren
     num_cols = data.get('num_cols', 12)
-    for _ in range(num_cols):
-        ET.SubElement(table, f'{{{NS["table"]}}}table-column',
-                     attrib={f'{{{NS["table"]}}}style-name': 'co1'})
-    
+    for _i in range(num_cols):
+        w.element('table:table-column', {'table:style-name': 'co1'})
+
     # Rows mit Daten
-    rows = data.get('rows', [])
+    linebreak_char = settings.get('linebreak_char', ';')
+    watermark_y = settings.get('inhalt_row_hoehe', 0.5) - 0.05  # Relativ zur Zelle!
     absolute_row_counter = 0  # Startet bei 0
-    
-    for row_data in rows:
-        row_style = 'ro1' if row_data.get('is_header', False) else 'ro2'
-        row = ET.SubElement(table, f'{{{NS["table"]}}}table-row',
-                           attrib={f'{{{NS["table"]}}}style-name': row_style})
-        
+    zellen_attribute = {}  # (style, colspan) → Attribute, einmal je Kombination
+
+    for ist_kopf, zellen in data.get('rows', ()):
+        row_style = 'ro1' if ist_kopf else 'ro2'
+        w.start('table:table-row', {'table:style-name': row_style})
+
         # Watermark in Zeile 2, 6, 10, 14... (row_counter ist 1, 5, 9...)
         add_watermark = (absolute_row_counter % 4 == 0)
-        
+
         absolute_row_counter += 1  # NACH der Prüfung erhöhen
-        
-        for idx, cell_data in enumerate(row_data.get('cells', [])):
-            cell_attribs = {f'{{{NS["table"]}}}style-name': cell_data.get('style', 'ce3')}
-            
-            # Merged cells
-            if cell_data.get('colspan', 1) > 1:
-                cell_attribs[f'{{{NS["table"]}}}number-columns-spanned'] = str(cell_data['colspan'])
-            
-            cell = ET.SubElement(row, f'{{{NS["table"]}}}table-cell', attrib=cell_attribs)
-            
+
+        for idx, (cell_text, style, colspan) in enumerate(zellen):
+            cell_attribs = zellen_attribute.get((style, colspan))
+            if cell_attribs is None:
+                cell_attribs = {'table:style-name': style}
+                # Merged cells
+                if colspan > 1:
+                    cell_attribs['table:number-columns-spanned'] = str(colspan)
+                zellen_attribute[style, colspan] = cell_attribs
+
+            w.start('table:table-cell', cell_attribs)
+
             # Watermark in erste Zelle jeder ungeraden Zeile
             if add_watermark and idx == 0:
-                row_height = settings.get('inhalt_row_hoehe', 0.5)
-                watermark_y = row_height - 0.05  # Relativ zur Zelle!
-                
-                frame = ET.SubElement(cell, f'{{{NS["draw"]}}}frame',
-                                     attrib={
-                                         f'{{{NS["draw"]}}}z-index': '0',
-                                         f'{{{NS["draw"]}}}name': f'Watermark_{absolute_row_counter}',
-                                         f'{{{NS["draw"]}}}style-name': 'gr1',
-                                         f'{{{NS["draw"]}}}text-style-name': 'P1',
-                                         f'{{{NS["table"]}}}table-background': 'true',
-                                         f'{{{NS["svg"]}}}x': '0.001cm',
-                                         f'{{{NS["svg"]}}}y': f'{watermark_y:.2f}cm',
-                                         f'{{{NS["svg"]}}}width': '20cm',
-                                         f'{{{NS["svg"]}}}height': '0.4cm',
-                                     })
-                textbox = ET.SubElement(frame, f'{{{NS["draw"]}}}text-box')
-                p = ET.SubElement(textbox, f'{{{NS["text"]}}}p')
-                span = ET.SubElement(p, f'{{{NS["text"]}}}span',
-                                    attrib={f'{{{NS["text"]}}}style-name': 'T1'})
-                span.text = WATERMARK_TEXT
-            
+                w.start('draw:frame', {
+                    'draw:z-index': '0',
+                    'draw:name': f'{watermark_name}{absolute_row_counter}',
+                    'draw:style-name': 'gr1',
+                    'draw:text-style-name': 'P1',
+                    'table:table-background': 'true',
+                    'svg:x': '0.001cm',
+                    'svg:y': f'{watermark_y:.2f}cm',
+                    'svg:width': '20cm',
+                    'svg:height': '0.4cm',
+                })
+                w.start('draw:text-box')
+                w.start('text:p')
+                w.element('text:span', {'text:style-name': 'T1'}, WATERMARK_TEXT)
+                w.end()
+                w.end()
+                w.end()
+
             # Text mit Zeilenumbruch-Unterstützung
-            if cell_data.get('text'):
-                cell_text = cell_data['text']
-                linebreak_char = settings.get('linebreak_char', ';')
-                
+            if cell_text:
                 # Wenn linebreak_char im Text vorkommt, mehrere <text:p> erstellen
                 if linebreak_char and linebreak_char in cell_text:
-                    lines = cell_text.split(linebreak_char)
-                    for line in lines:
-                        p = ET.SubElement(cell, f'{{{NS["text"]}}}p')
-                        p.text = line.strip()
+                    for line in cell_text.split(linebreak_char):
+                        w.element('text:p', text=line.strip())
                 else:
-                    p = ET.SubElement(cell, f'{{{NS["text"]}}}p')
-                    p.text = cell_text
-            
+                    w.element('text:p', text=cell_text)
+
+            w.end()  # table-cell
+
             # Covered cells nach merged cell
-            for _ in range(cell_data.get('colspan', 1) - 1):
-                ET.SubElement(row, f'{{{NS["table"]}}}covered-table-cell')
-    
-    return root
+            for _i in range(colspan - 1):
+                w.element('table:covered-table-cell')
+
+        w.end()  # table-row
+
+    w.end()  # table
+
+
+def _write_content_kopf(w, settings, NS, tabellen=0):
+    """Statischer Anfang von content.xml bis einschließlich <office:spreadsheet>.
+
+    Args:
+        tabellen (int): Anzahl Tabellen-Styles ta1..taN mit eigener
+            Master-Page (0 = keine, wie beim Export einer Anlage)
+    """
+    w.declaration()
+    w.start('office:document-content',
+            {'office:version': '1.2'},
+            namespaces={praefix: NS[praefix] for praefix in CONTENT_NAMESPACES})
+
+    # Automatische Styles
+    w.start('office:automatic-styles')
+
+    # Spalten Style
+    w.start('style:style', {'style:name': 'co1', 'style:family': 'table-column'})
+    w.element('style:table-column-properties',
+              {'style:column-width': f"{settings.get('spalten_breite', 1.75)}cm"})
+    w.end()
+
+    # Row Styles
+    w.start('style:style', {'style:name': 'ro1', 'style:family': 'table-row'})
+    w.element('style:table-row-properties',
+              {'style:row-height': f"{settings.get('beschriftung_row_hoehe', 0.5)}cm"})
+    w.end()
+
+    w.start('style:style', {'style:name': 'ro2', 'style:family': 'table-row'})
+    w.element('style:table-row-properties',
+              {'style:row-height': f"{settings.get('inhalt_row_hoehe', 0.5)}cm"})
+    w.end()
+
+    # Cell Styles
+    border = '0.5pt solid #000000' if settings.get('zellen_umrandung', True) else 'none'
+    cell_properties = {
+        'fo:border': border,
+        'fo:wrap-option': 'wrap',
+        'style:vertical-align': 'top',
+    }
+
+    # Beschriftung Cell
+    w.start('style:style', {'style:name': 'ce1', 'style:family': 'table-cell'})
+    w.element('style:table-cell-properties', cell_properties)
+    w.element('style:text-properties', {
+        'fo:font-size': f"{settings.get('fontsize_beschriftung_zelle', 7)}pt",
+        'fo:font-weight': 'bold',
+        'fo:hyphenate': 'true',
+    })
+    w.element('style:paragraph-properties', {'fo:text-align': 'center'})
+    w.end()
+
+    # Gemergte Cell
+    w.start('style:style', {'style:name': 'ce2', 'style:family': 'table-cell'})
+    w.element('style:table-cell-properties', cell_properties)
+    w.element('style:text-properties', {
+        'fo:font-size': f"{settings.get('fontsize_gemergte_zelle', 7)}pt",
+        'fo:font-weight': 'bold',
+        'fo:hyphenate': 'true',
+    })
+    w.element('style:paragraph-properties', {'fo:text-align': 'center'})
+    w.end()
+
+    # Inhalt Cell
+    w.start('style:style', {'style:name': 'ce3', 'style:family': 'table-cell'})
+    w.element('style:table-cell-properties', cell_properties)
+    w.element('style:text-properties', {
+        'fo:font-size': f"{settings.get('fontsize_inhalt_zelle', 6)}pt",
+        'fo:hyphenate': 'true',
+    })
+    w.element('style:paragraph-properties', {'fo:text-align': 'center'})
+    w.end()
+
+    # Watermark Text Style (5pt, grau)
+    w.start('style:style', {'style:name': 'P1', 'style:family': 'paragraph'})
+    w.element('style:text-properties', {
+        'fo:font-size': '5pt',
+        'fo:color': WATERMARK_COLOR,
+    })
+    w.end()
+
+    # Text Span Style für Watermark
+    w.start('style:style', {'style:name': 'T1', 'style:family': 'text'})
+    w.element('style:text-properties', {
+        'fo:font-size': '5pt',
+        'fo:color': WATERMARK_COLOR,
+        'loext:opacity': '100%',
+    })
+    w.end()
+
+    # Watermark Graphic Style (für draw:frame)
+    w.start('style:style', {
+        'style:name': 'gr1',
+        'style:family': 'graphic',
+        'style:parent-style-name': 'Default',
+    })
+    w.element('style:graphic-properties', {
+        'draw:stroke': 'none',
+        'draw:fill': 'none',
+        'draw:textarea-horizontal-align': 'left',
+        'draw:textarea-vertical-align': 'bottom',
+        'fo:min-height': '0.4cm',
+        'loext:decorative': 'false',
+    })
+    w.element('style:paragraph-properties', {'style:writing-mode': 'lr-tb'})
+    w.element('style:text-properties', {
+        'fo:font-size': '5pt',
+        'fo:color': WATERMARK_COLOR,
+        'loext:opacity': '100%',
+    })
+    w.end()
+
+    # Tabellen-Styles: je Tabelle eine Master-Page (eigene Kopf-/Fußzeile)
+    for nr in range(1, tabellen + 1):
+        w.start('style:style', {
+            'style:name': f'ta{nr}',
+            'style:family': 'table',
+            'style:master-page-name': f'Master{nr}',
+        })
+        w.element('style:table-properties', {
+            'table:display': 'true',
+            'style:writing-mode': 'lr-tb',
+        })
+        w.end()
+
+    w.end()  # automatic-styles
+
+    # Body
+    w.start('office:body')
+    w.start('office:spreadsheet')
 
 
 if __name__ == "__main__":
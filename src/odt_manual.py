@@ -16,6 +16,18 @@ def create_odt_manual(customer_data, output_path):
         customer_data: Dictionary mit Kundendaten und Anlagen
         output_path: Ausgabepfad für ODT-Datei
     """
+    with open(output_path, 'wb') as out:
+        write_odt_manual(out, customer_data)
+
+
+def write_odt_manual(out, customer_data):
+    """Schreibt eine ODT-Datei in einen binären Stream (wie create_odt_manual).
+
+    Args:
+        out: Binärer, beschreibbarer Stream (z.B. io.BytesIO); muss nicht
+            seekbar sein
+        customer_data: Dictionary mit Kundendaten und Anlagen
+    """
     # Namespace Definitionen
     NS = {
         'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
@@ -30,7 +42,7 @@ def create_odt_manual(customer_data, output_path):
         ET.register_namespace(prefix, uri)
     
     # Erstelle ZIP
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
         # 1. mimetype (MUSS erste Datei sein, unkomprimiert)
         zf.writestr('mimetype', 
                     'application/vnd.oasis.opendocument.text',
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Druckfertige PDF-Beschriftungsstreifen ohne Office-Programm.
+
+Nimmt dieselben Tabellendaten wie create_ods_manual/create_ods_workbook
+(convert_anlage_to_manual_format) und zeichnet sie mit den Maßen aus den
+Settings direkt als Vektor-PDF: Spaltenbreite, Zeilenhöhen, Seitengröße
+und Ränder in cm, Schriftgrößen der Zellen-Styles ce1/ce2/ce3,
+Umrandung, Zeilenumbruch-Zeichen sowie Kopf-/Fußzeile und Watermark wie
+in der ODS-Datei.
+
+Es werden nur die Standardschriften Helvetica und Helvetica-Bold
+verwendet (nicht eingebettet, WinAnsi-Kodierung); für Zentrierung und
+Umbruch dienen deren Zeichenbreiten. Jede Seite wird geschrieben, sobald
+sie voll ist – der Speicherbedarf hängt nicht von der Anzahl der Anlagen
+ab.
+"""
+
+import unicodedata
+import zlib
+
+from constants import TOOL_FLET_VERSION
+from ods_manual import WATERMARK_COLOR, WATERMARK_TEXT
+
+CM = 72 / 2.54  # PDF-Punkte je cm
+
+# Wie im Page-Layout der ODS-Datei (styles.xml)
+KOPF_HOEHE = 0.75 * CM
+KOPF_ABSTAND = 0.25 * CM
+FUSS_HOEHE = 0.75 * CM
+FUSS_ABSTAND = 0.25 * CM
+SCHRIFT_KOPF = 10   # Header-Regionen (MT1)
+SCHRIFT_FUSS = 6    # Footer-Regionen (MT2)
+SCHRIFT_WATERMARK = 5
+
+ZELLEN_INNENABSTAND = 0.05 * CM
+ZEILENABSTAND = 1.15   # Zeilenhöhe relativ zur Schriftgröße
+OBERLAENGE = 0.905     # Abstand Zeilenoberkante → Grundlinie (relativ)
+LINIENBREITE = 0.5     # Umrandung in pt (0.5pt solid wie fo:border)
+
+# Zellen-Style → (Schrift, Setting der Schriftgröße, Standardgröße)
+ZELLEN_SCHRIFTEN = {
+    'ce1': ('F2', 'fontsize_beschriftung_zelle', 7),
+    'ce2': ('F2', 'fontsize_gemergte_zelle', 7),
+    'ce3': ('F1', 'fontsize_inhalt_zelle', 6),
+}
+SCHRIFTEN = {'F1': 'Helvetica', 'F2': 'Helvetica-Bold'}
+
+# Zeichenbreiten (1/1000 em) der Zeichen 32..126 aus den AFM-Dateien
+_ASCII_BREITEN = {
+    'F1': (
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ),
+    'F2': (
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+    ),
+}
+
+# Übrige WinAnsi-Zeichen ohne Basisbuchstaben: (Helvetica, Helvetica-Bold)
+_SONDER_BREITEN = {
+    '€': (556, 556), '‚': (222, 278), 'ƒ': (556, 556), '„': (333, 500), '…': (1000, 1000),
+    '†': (556, 556), '‡': (556, 556), 'ˆ': (333, 333), '‰': (1000, 1000), '‹': (333, 333),
+    'Œ': (1000, 1000), '‘': (222, 278), '’': (222, 278), '“': (333, 500), '”': (333, 500),
+    '•': (350, 350), '–': (556, 556), '—': (1000, 1000), '˜': (333, 333), '™': (1000, 1000),
+    '›': (333, 333), 'œ': (944, 944), '\xa0': (278, 278), '¡': (333, 333), '¢': (556, 556),
+    '£': (556, 556), '¤': (556, 556), '¥': (556, 556), '¦': (260, 280), '§': (556, 556),
+    '¨': (333, 333), '©': (737, 737), 'ª': (370, 370), '«': (556, 556), '¬': (584, 584),
+    '\xad': (333, 333), '®': (737, 737), '¯': (333, 333), '°': (400, 400), '±': (584, 584),
+    '²': (333, 333), '³': (333, 333), '´': (333, 333), 'µ': (556, 611), '¶': (537, 556),
+    '·': (278, 278), '¸': (333, 333), '¹': (333, 333), 'º': (365, 365), '»': (556, 556),
+    '¼': (834, 834), '½': (834, 834), '¾': (834, 834), '¿': (611, 611), 'Æ': (1000, 1000),
+    'Ð': (722, 722), '×': (584, 584), 'Ø': (778, 778), 'Þ': (667, 667), 'ß': (611, 611),
+    'æ': (889, 889), 'ð': (556, 611), '÷': (584, 584), 'ø': (611, 611), 'þ': (556, 611),
+}
+
+
+def _breiten_tabelle(schrift):
+    """Zeichenbreiten je Byte (WinAnsi) für eine Schrift."""
+    ascii_breiten = _ASCII_BREITEN[schrift]
+    index = 0 if schrift == 'F1' else 1
+    tabelle = [0] * 256
+    for byte in range(32, 127):
+        tabelle[byte] = ascii_breiten[byte - 32]
+    for byte in range(128, 256):
+        try:
+            zeichen = bytes((byte,)).decode('cp1252')
+        except UnicodeDecodeError:
+            continue
+        if zeichen in _SONDER_BREITEN:
+            tabelle[byte] = _SONDER_BREITEN[zeichen][index]
+            continue
+        # Buchstaben mit Akzent sind so breit wie ihr Basisbuchstabe
+        basis = unicodedata.decomposition(zeichen).split()
+        if basis and not basis[0].startswith('<') and int(basis[0], 16) < 127:
+            tabelle[byte] = ascii_breiten[int(basis[0], 16) - 32]
+        else:
+            tabelle[byte] = 556
+    return tuple(tabelle)
+
+
+BREITEN = {schrift: _breiten_tabelle(schrift) for schrift in SCHRIFTEN}
+
+
+def kodiere(text):
+    """Text als WinAnsi-Bytes (nicht darstellbare Zeichen als '?')."""
+    return text.encode('cp1252', 'replace')
+
+
+def textbreite(daten, schrift, groesse):
+    """Breite von WinAnsi-Bytes in pt."""
+    tabelle = BREITEN[schrift]
+    return sum(tabelle[byte] for byte in daten) * groesse / 1000
+
+
+def umbrechen(daten, schrift, groesse, breite):
+    """Bricht WinAnsi-Bytes an Leerzeichen auf die Breite um.
+
+    Wörter, die allein nicht in eine Zeile passen, werden zeichenweise
+    getrennt.
+
+    Returns:
+        list: Zeilen (bytes)
+    """
+    tabelle = BREITEN[schrift]
+    max_einheiten = breite * 1000 / groesse
+    leer = tabelle[32]
+
+    zeilen = []
+    zeile, zeile_breite = b'', 0
+    for wort in daten.split():
+        wort_breite = sum(tabelle[byte] for byte in wort)
+        if zeile and zeile_breite + leer + wort_breite <= max_einheiten:
+            zeile += b' ' + wort
+            zeile_breite += leer + wort_breite
+            continue
+        if zeile:
+            zeilen.append(zeile)
+        # Überlanges Wort zeichenweise trennen
+        while wort_breite > max_einheiten and len(wort) > 1:
+            teil_breite, ende = 0, 0
+            while ende < len(wort) and teil_breite + tabelle[wort[ende]] <= max_einheiten:
+                teil_breite += tabelle[wort[ende]]
+                ende += 1
+            ende = max(ende, 1)
+            zeilen.append(wort[:ende])
+            wort = wort[ende:]
+            wort_breite = sum(tabelle[byte] for byte in wort)
+        zeile, zeile_breite = wort, wort_breite
+    if zeile:
+        zeilen.append(zeile)
+    return zeilen
+
+
+def _zahl(wert):
+    """Koordinate für den Content-Stream (kurz, ohne Exponent)."""
+    return f'{wert:.2f}'.rstrip('0').rstrip('.')
+
+
+def _grauwert(farbe):
+    """'#RRGGBB' → Grauwert 0..1 (mittlere Helligkeit)."""
+    rot, gruen, blau = (int(farbe[i:i + 2], 16) for i in (1, 3, 5))
+    return (rot + gruen + blau) / 3 / 255
+
+
+class _PdfDatei:
+    """Schreibt PDF-Objekte nacheinander in einen binären Stream.
+
+    Objekt 1 ist der Katalog, 2 der Seitenbaum, danach folgen die
+    Schriften; Seiten und ihre Inhalte werden angehängt, sobald sie fertig
+    sind. Seitenbaum und Querverweistabelle entstehen in close().
+    """
+
+    KATALOG = 1
+    SEITENBAUM = 2
+
+    def __init__(self, out):
+        self._out = out
+        self._position = 0
+        self._offsets = {}
+        self._naechstes = 3
+        self._seiten = []
+
+        self._schreibe(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self.schriften = {}
+        for name, basisschrift in SCHRIFTEN.items():
+            nummer = self.objekt(
+                f'<< /Type /Font /Subtype /Type1 /BaseFont /{basisschrift} '
+                f'/Encoding /WinAnsiEncoding >>'.encode('ascii')
+            )
+            self.schriften[name] = nummer
+
+    def _schreibe(self, daten):
+        self._out.write(daten)
+        self._position += len(daten)
+
+    def objekt(self, inhalt, nummer=None):
+        """Schreibt ein Objekt und liefert seine Nummer."""
+        if nummer is None:
+            nummer = self._naechstes
+            self._naechstes += 1
+        self._offsets[nummer] = self._position
+        self._schreibe(b'%d 0 obj\n' % nummer + inhalt + b'\nendobj\n')
+        return nummer
+
+    def seite(self, breite, hoehe, inhalt):
+        """Hängt eine Seite mit komprimiertem Content-Stream an."""
+        daten = zlib.compress(inhalt, 6)
+        stream = self.objekt(
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(daten) + daten + b'\nendstream'
+        )
+        ressourcen = ' '.join(f'/{name} {nummer} 0 R' for name, nummer in self.schriften.items())
+        self._seiten.append(self.objekt(
+            f'<< /Type /Page /Parent {self.SEITENBAUM} 0 R '
+            f'/MediaBox [0 0 {_zahl(breite)} {_zahl(hoehe)}] '
+            f'/Resources << /Font << {ressourcen} >> >> /Contents {stream} 0 R >>'.encode('ascii')
+        ))
+
+    def close(self):
+        """Schreibt Seitenbaum, Katalog, Querverweise und Trailer."""
+        kinder = ' '.join(f'{nummer} 0 R' for nummer in self._seiten)
+        self.objekt(
+            f'<< /Type /Pages /Kids [{kinder}] /Count {len(self._seiten)} >>'.encode('ascii'),
+            self.SEITENBAUM,
+        )
+        self.objekt(f'<< /Type /Catalog /Pages {self.SEITENBAUM} 0 R >>'.encode('ascii'), self.KATALOG)
+        info = self.objekt(
+            f'<< /Producer (Verteiler-Beschriften {TOOL_FLET_VERSION}) >>'.encode('cp1252', 'replace')
+        )
+
+        anzahl = self._naechstes
+        xref = self._position
+        zeilen = [b'xref\n0 %d\n' % anzahl, b'0000000000 65535 f \n']
+        zeilen.extend(b'%010d 00000 n \n' % self._offsets[nummer] for nummer in range(1, anzahl))
+        zeilen.append(
+            b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (anzahl, self.KATALOG, info, xref)
+        )
+        self._schreibe(b''.join(zeilen))
+
+
+class _Seitenlayout:
+    """Maße einer Seite in pt (PDF-Ursprung unten links)."""
+
+    def __init__(self, settings):
+        self.breite = settings.get('seite_breite', 29.7) * CM
+        self.hoehe = settings.get('seite_hoehe', 21.0) * CM
+        self.links = settings.get('rand_links', 1.0) * CM
+        self.rechts = self.breite - settings.get('rand_rechts', 1.0) * CM
+        self.oben = self.hoehe - settings.get('rand_oben', 2.0) * CM
+        self.unten = settings.get('rand_unten', 1.5) * CM
+
+        # Kopf- und Fußzeile liegen innerhalb der Ränder (wie in LibreOffice)
+        self.tabelle_oben = self.oben - KOPF_HOEHE - KOPF_ABSTAND
+        self.tabelle_unten = self.unten + FUSS_HOEHE + FUSS_ABSTAND
+
+
+def _text(teile, schrift, groesse, x, y, daten):
+    teile.append(f'BT /{schrift} {_zahl(groesse)} Tf {_zahl(x)} {_zahl(y)} Td <{daten.hex()}> Tj ET\n')
+
+
+class _SeitenSchreiber:
+    """Zeichnet die Tabellen einer Datei und gibt volle Seiten ab."""
+
+    def __init__(self, pdf, settings):
+        self.pdf = pdf
+        self.settings = settings
+        self.layout = _Seitenlayout(settings)
+        self.spalten_breite = settings.get('spalten_breite', 1.75) * CM
+        self.zeilen_hoehen = {
+            True: settings.get('beschriftung_row_hoehe', 0.5) * CM,
+            False: settings.get('inhalt_row_hoehe', 0.5) * CM,
+        }
+        self.umrandung = settings.get('zellen_umrandung', True)
+        self.linebreak_char = settings.get('linebreak_char', ';')
+        self.schriften = {
+            style: (schrift, settings.get(key, standard))
+            for style, (schrift, key, standard) in ZELLEN_SCHRIFTEN.items()
+        }
+        self.watermark = kodiere(WATERMARK_TEXT)
+        # Wie in _write_table: relativ zur Oberkante der Zelle, Rahmen 0.4cm hoch
+        self.watermark_abstand = (settings.get('inhalt_row_hoehe', 0.5) - 0.05 + 0.4 - 0.1) * CM
+        self.watermark_grau = _zahl(_grauwert(WATERMARK_COLOR))
+        self.teile = None
+        self.y = 0
+
+    def tabelle(self, data, footer_data):
+        """Zeichnet eine Tabelle ab einer neuen Seite.
+
+        Eine Beschriftungszeile bleibt mit ihren Inhaltszeilen auf einer
+        Seite; passt ein solcher Block nicht mehr, beginnt eine neue Seite.
+        """
+        self._neue_seite(footer_data, erste=True)
+        zeilen_nr = 0
+        block = []
+        for ist_kopf, zellen in data.get('rows', ()):
+            if ist_kopf and block:
+                zeilen_nr = self._block(block, zeilen_nr, footer_data)
+                block = []
+            block.append((ist_kopf, zellen))
+        if block:
+            self._block(block, zeilen_nr, footer_data)
+        self._seite_fertig()
+
+    def _block(self, block, zeilen_nr, footer_data):
+        hoehe = sum(self.zeilen_hoehen[ist_kopf] for ist_kopf, _zellen in block)
+        if self.y - hoehe < self.layout.tabelle_unten and self.y < self.layout.tabelle_oben:
+            self._seite_fertig()
+            self._neue_seite(footer_data, erste=False)
+        for ist_kopf, zellen in block:
+            self._zeile(ist_kopf, zellen, zeilen_nr)
+            zeilen_nr += 1
+        return zeilen_nr
+
+    def _neue_seite(self, footer_data, erste):
+        layout = self.layout
+        self.teile = [f'{_zahl(LINIENBREITE)} w 0 G 0 g\n']
+        self.y = layout.tabelle_oben
+        if not footer_data:
+            return
+
+        # Kopfzeile: Kunde links, Projekt Mitte, Anlagenbeschreibung rechts
+        grundlinie = layout.oben - SCHRIFT_KOPF * OBERLAENGE
+        for text, ausrichtung in ((footer_data.get('customer', ''), 0),
+                                  (footer_data.get('project', ''), 0.5),
+                                  (footer_data.get('description', ''), 1)):
+            self._ausgerichtet(text, 'F1', SCHRIFT_KOPF, ausrichtung, grundlinie)
+
+        # Fußzeile nur auf der ersten Seite (footer-first): Dateipfad links, Code rechts
+        if erste:
+            grundlinie = layout.unten + FUSS_HOEHE - SCHRIFT_FUSS * OBERLAENGE
+            self._ausgerichtet(footer_data.get('filepath', ''), 'F1', SCHRIFT_FUSS, 0, grundlinie)
+            self._ausgerichtet(footer_data.get('code', ''), 'F1', SCHRIFT_FUSS, 1, grundlinie)
+
+    def _ausgerichtet(self, text, schrift, groesse, ausrichtung, grundlinie):
+        """Text links (0), mittig (0.5) oder rechts (1) im Satzspiegel."""
+        if not text:
+            return
+        daten = kodiere(text)
+        layout = self.layout
+        frei = layout.rechts - layout.links - textbreite(daten, schrift, groesse)
+        _text(self.teile, schrift, groesse, layout.links + frei * ausrichtung, grundlinie, daten)
+
+    def _zeile(self, ist_kopf, zellen, zeilen_nr):
+        hoehe = self.zeilen_hoehen[ist_kopf]
+        oben = self.y
+        unten = oben - hoehe
+        x = self.layout.links
+        teile = self.teile
+
+        for idx, (cell_text, style, colspan) in enumerate(zellen):
+            breite = colspan * self.spalten_breite
+            if self.umrandung:
+                teile.append(f'{_zahl(x)} {_zahl(unten)} {_zahl(breite)} {_zahl(hoehe)} re S\n')
+            if cell_text:
+                self._zelltext(cell_text, style, x, oben, breite, hoehe)
+            # Watermark in erste Zelle jeder vierten Zeile (wie _write_table)
+            if idx == 0 and zeilen_nr % 4 == 0:
+                teile.append(f'{self.watermark_grau} g\n')
+                _text(teile, 'F1', SCHRIFT_WATERMARK, x + 0.001 * CM,
+                      oben - self.watermark_abstand, self.watermark)
+                teile.append('0 g\n')
+            x += breite
+
+        self.y = unten
+
+    def _zelltext(self, cell_text, style, x, oben, breite, hoehe):
+        """Zentrierter, oben ausgerichteter Text mit Umbruch."""
+        schrift, groesse = self.schriften.get(style, self.schriften['ce3'])
+        innen = breite - 2 * ZELLEN_INNENABSTAND
+        if self.linebreak_char and self.linebreak_char in cell_text:
+            absaetze = [absatz.strip() for absatz in cell_text.split(self.linebreak_char)]
+        else:
+            absaetze = [cell_text]
+
+        zeilen = []
+        for absatz in absaetze:
+            zeilen.extend(umbrechen(kodiere(absatz), schrift, groesse, innen) or [b''])
+
+        zeilenhoehe = groesse * ZEILENABSTAND
+        zu_hoch = len(zeilen) * zeilenhoehe + ZELLEN_INNENABSTAND > hoehe
+        teile = self.teile
+        if zu_hoch:
+            # Überstehenden Text an der Zelle abschneiden
+            teile.append(f'q {_zahl(x)} {_zahl(oben - hoehe)} {_zahl(breite)} {_zahl(hoehe)} re W n\n')
+        grundlinie = oben - ZELLEN_INNENABSTAND - groesse * OBERLAENGE
+        for zeile in zeilen:
+            if zeile:
+                links = x + (breite - textbreite(zeile, schrift, groesse)) / 2
+                _text(teile, schrift, groesse, links, grundlinie, zeile)
+            grundlinie -= zeilenhoehe
+        if zu_hoch:
+            teile.append('Q\n')
+
+    def _seite_fertig(self):
+        if self.teile is not None:
+            self.pdf.seite(self.layout.breite, self.layout.hoehe, ''.join(self.teile).encode('ascii'))
+            self.teile = None
+
+
+def write_pdf(out, sheets, settings):
+    """Schreibt eine PDF-Datei mit den Tabellen direkt in einen Stream.
+
+    Jede Tabelle beginnt auf einer neuen Seite mit eigener Kopf-/Fußzeile.
+
+    Args:
+        out: Binärer, beschreibbarer Stream
+        sheets: Liste von (data, footer_data) wie bei create_ods_workbook
+        settings: Settings Dictionary
+    """
+    pdf = _PdfDatei(out)
+    schreiber = _SeitenSchreiber(pdf, settings)
+    for data, footer_data in sheets:
+        schreiber.tabelle(data, footer_data)
+    pdf.close()
+
+
+def create_pdf(sheets, settings, output_path):
+    """Erstellt eine druckfertige PDF-Datei.
+
+    Args:
+        sheets: Liste von (data, footer_data) wie bei create_ods_workbook
+        settings: Settings Dictionary
+        output_path: Ausgabepfad
+    """
+    with open(output_path, 'wb') as out:
+        write_pdf(out, sheets, settings)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Write-Behind-Speicherdienst für den DataManager.
+
+Änderungen werden nur als "dirty" markiert. Ein Hintergrund-Thread fasst
+alle Änderungen innerhalb eines Intervalls zu einem einzigen Schreibvorgang
+zusammen, damit der UI-Thread bei jedem Tastendruck nicht die komplette
+Datendatei neu schreiben muss.
+
+Der Snapshot (reine Dicts) entsteht in mark_dirty, also im Thread, der die
+Daten geändert hat, und enthält nur den geänderten Kunden; alle übrigen
+kennt der Dienst schon aus früheren Snapshots. Der Hintergrund-Thread
+fasst die Objekte der Oberfläche nie an und setzt beim Schreiben den
+letzten Stand aller Kunden aus diesen Teilen zusammen.
+"""
+
+import threading
+import time
+
+
+class SaveService:
+    """Fasst Speicheranforderungen zusammen und schreibt sie im Hintergrund."""
+
+    def __init__(self, data_manager, snapshot_fn, intervall=1.0, on_saved=None):
+        """Initialisiert den SaveService und startet den Worker-Thread.
+
+        Args:
+            data_manager: DataManager, über den gespeichert wird
+            snapshot_fn: Callable(dirty_keys, bekannt), liefert
+                (all_customers: dict, next_customer_id: int) mit allen
+                Kunden in ihrer Reihenfolge; Kunden aus bekannt, die nicht
+                in dirty_keys stehen, mit None. Wird in mark_dirty im
+                Thread des Aufrufers ausgeführt.
+            intervall (float): Sekunden, über die Änderungen gesammelt werden
+            on_saved: Optional - Callable(erfolg, fehler, latenz_ms, zusammengefasst),
+                wird nach jedem Schreibvorgang aufgerufen, auch im
+                Hintergrund-Thread (Oberfläche nicht direkt aktualisieren)
+        """
+        self.data_manager = data_manager
+        self.snapshot_fn = snapshot_fn
+        self.intervall = max(0.0, float(intervall))
+        self.on_saved = on_saved
+
+        self._lock = threading.Lock()           # schützt Zähler/Zeitstempel/Snapshot
+        self._write_lock = threading.Lock()     # serialisiert Schreibvorgänge
+        self._snapshot_lock = threading.Lock()  # serialisiert mark_dirty (nicht den Worker)
+        self._wakeup = threading.Event()
+        self._pending = 0
+        self._dirty_keys = set()  # None = alle Kunden geändert
+        self._first_dirty = None
+        self._namen = None        # Reihenfolge aller Kunden aus dem letzten mark_dirty
+        self._next_customer_id = None
+        self._neu = {}            # Name → Dict, seit dem letzten Schreiben geliefert
+        self._bekannt = set()     # Kunden mit Daten in _neu oder _stand (nur unter _snapshot_lock)
+        self._stand = {}          # Name → Dict, zuletzt bekannter Stand (nur unter _write_lock)
+        self._running = True
+
+        # Statistik des letzten Schreibvorgangs
+        self.letzte_latenz_ms = 0.0
+        self.letzte_zusammengefasst = 0
+        self.anzahl_speicherungen = 0
+
+        self._thread = threading.Thread(target=self._run, name="SaveService", daemon=True)
+        self._thread.start()
+
+    # ==================== Öffentliche API ====================
+
+    def mark_dirty(self, kunde_key=None):
+        """Markiert die Daten als geändert; gespeichert wird im Hintergrund.
+
+        Nach der Änderung im Thread aufrufen, der die Daten verändert hat:
+        hier wird der Snapshot des geänderten Kunden erstellt (außerhalb von
+        _lock, der Hintergrund-Thread wartet nicht darauf).
+
+        Args:
+            kunde_key (str, optional): Name des geänderten Kunden.
+                None = Änderung betrifft alle Kunden.
+        """
+        with self._snapshot_lock:
+            all_customers, next_customer_id = self.snapshot_fn(
+                None if kunde_key is None else {kunde_key}, self._bekannt
+            )
+            neu = {name: daten for name, daten in all_customers.items() if daten is not None}
+            with self._lock:
+                if self._pending == 0:
+                    self._first_dirty = time.monotonic()
+                self._pending += 1
+                if kunde_key is None:
+                    self._dirty_keys = None
+                elif self._dirty_keys is not None:
+                    self._dirty_keys.add(kunde_key)
+                self._namen = list(all_customers)
+                self._next_customer_id = next_customer_id
+                self._neu.update(neu)
+            self._bekannt.update(neu)
+        self._wakeup.set()
+
+    def is_dirty(self):
+        """Gibt zurück, ob noch ungespeicherte Änderungen vorliegen."""
+        with self._lock:
+            return self._pending > 0
+
+    def flush(self):
+        """Schreibt ausstehende Änderungen sofort (synchron).
+
+        Returns:
+            tuple: (erfolg: bool, fehler_nachricht: str oder None)
+        """
+        return self._write()
+
+    def stop(self):
+        """Beendet den Worker-Thread nach einem letzten Flush."""
+        result = self.flush()
+        self._running = False
+        self._wakeup.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        return result
+
+    # ==================== Worker ====================
+
+    def _run(self):
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._running:
+                break
+
+            # Intervall ab der ersten Änderung abwarten, weitere Änderungen sammeln
+            while True:
+                with self._lock:
+                    if self._pending == 0:
+                        break
+                    rest = self.intervall - (time.monotonic() - self._first_dirty)
+                if rest <= 0 or not self._running:
+                    break
+                time.sleep(min(rest, 0.1))
+
+            self._write()
+
+    def _write(self):
+        with self._write_lock:
+            with self._lock:
+                zusammengefasst = self._pending
+                dirty_keys = self._dirty_keys
+                namen, next_customer_id = self._namen, self._next_customer_id
+                neu = self._neu
+                self._pending = 0
+                self._dirty_keys = set()
+                self._first_dirty = None
+                self._namen = self._next_customer_id = None
+                self._neu = {}
+
+            if zusammengefasst == 0:
+                return True, None
+
+            start = time.perf_counter()
+            self._stand.update(neu)
+            try:
+                all_customers = {name: self._stand[name] for name in namen}
+                ok, fehler = self.data_manager.save_data(
+                    all_customers, next_customer_id, dirty_keys
+                )
+            except Exception as e:
+                ok, fehler = False, str(e)
+            latenz_ms = (time.perf_counter() - start) * 1000.0
+
+            if not ok:
+                # Änderungen bleiben ausstehend und werden erneut versucht
+                with self._lock:
+                    if self._pending == 0:
+                        self._first_dirty = time.monotonic()
+                    self._pending += zusammengefasst
+                    if dirty_keys is None or self._dirty_keys is None:
+                        self._dirty_keys = None
+                    else:
+                        self._dirty_keys |= dirty_keys
+                    if self._namen is None:
+                        self._namen, self._next_customer_id = namen, next_customer_id
+            else:
+                self.letzte_latenz_ms = latenz_ms
+                self.letzte_zusammengefasst = zusammengefasst
+                self.anzahl_speicherungen += 1
+
+            if self.on_saved:
+                try:
+                    self.on_saved(ok, fehler, latenz_ms, zusammengefasst)
+                except Exception:
+                    pass
+
+            return ok, fehler
+
+
+if __name__ == "__main__":
+    pass
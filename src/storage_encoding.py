@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kodierungen für die Datendatei (Setting 'speicher_kodierung').
+
+    json          JSON mit indent=4 (Standard, lesbar, bisheriges Format)
+    json_kompakt  JSON ohne Einrückung und Leerzeichen
+    gzip          Kompaktes JSON, gzip-komprimiert
+    pickle        Binär (pickle, Protokoll 5), nur Basistypen
+
+Beim Lesen wird die Kodierung an den ersten Bytes erkannt, der Dateiname
+bleibt unverändert. Für die JSON-Kodierungen hält FragmentCache die bereits
+kodierten Kunden vor und setzt die Datei aus den Fragmenten zusammen.
+Pickle-Dateien werden mit einem Unpickler gelesen, der keine Klassen
+auflöst – importierte Dateien können so keinen Code ausführen.
+"""
+
+import gzip
+import io
+import json
+import pickle
+
+ENCODING_JSON = 'json'
+ENCODING_COMPACT = 'json_kompakt'
+ENCODING_GZIP = 'gzip'
+ENCODING_PICKLE = 'pickle'
+ENCODINGS = (ENCODING_JSON, ENCODING_COMPACT, ENCODING_GZIP, ENCODING_PICKLE)
+
+GZIP_MAGIC = b'\x1f\x8b'
+PICKLE_MAGIC = b'\x80'  # PROTO-Opcode, ab Protokoll 2 immer am Anfang
+
+
+class _DataUnpickler(pickle.Unpickler):
+    """Unpickler, der nur Basistypen (dict, list, str, Zahlen, ...) zulässt."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f'Nicht erlaubter Typ: {module}.{name}')
+
+
+def encode(obj, encoding=ENCODING_JSON):
+    """Kodiert ein Objekt in die gewählte Kodierung.
+
+    Args:
+        obj: Zu speichernde Daten (dict/list/Basistypen)
+        encoding (str): Eine der ENCODINGS
+
+    Returns:
+        bytes: Kodierte Daten
+    """
+    if encoding == ENCODING_COMPACT:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if encoding == ENCODING_GZIP:
+        # Stufe 1: ~6x schneller als Stufe 6 bei nur wenig größerer Datei;
+        # mtime=0: gleiche Daten ergeben gleiche Bytes
+        return gzip.compress(encode(obj, ENCODING_COMPACT), compresslevel=1, mtime=0)
+    if encoding == ENCODING_PICKLE:
+        return pickle.dumps(obj, protocol=5)
+    return json.dumps(obj, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+def detect_encoding(data):
+    """Erkennt die Kodierung an den ersten Bytes.
+
+    Args:
+        data (bytes): Dateiinhalt
+
+    Returns:
+        str: ENCODING_GZIP, ENCODING_PICKLE oder ENCODING_JSON (für beide JSON-Varianten)
+    """
+    if data.startswith(GZIP_MAGIC):
+        return ENCODING_GZIP
+    if data.startswith(PICKLE_MAGIC):
+        return ENCODING_PICKLE
+    return ENCODING_JSON
+
+
+def decode(data):
+    """Dekodiert Daten in einer beliebigen der ENCODINGS.
+
+    Args:
+        data (bytes): Dateiinhalt
+
+    Returns:
+        Dekodiertes Objekt
+    """
+    encoding = detect_encoding(data)
+    if encoding == ENCODING_GZIP:
+        return decode(gzip.decompress(data))
+    if encoding == ENCODING_PICKLE:
+        return _DataUnpickler(io.BytesIO(data)).load()
+    return json.loads(data.decode('utf-8-sig'))
+
+
+def _dumps(obj, kompakt):
+    if kompakt:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(obj, indent=4, ensure_ascii=False)
+
+
+def _einruecken(text, ebene):
+    """Rückt alle Folgezeilen eines indent=4-Texts um ebene Stufen ein."""
+    return text.replace('\n', '\n' + '    ' * ebene)
+
+
+class FragmentCache:
+    """Kodiert {'kunden': ..., ...} inkrementell aus Fragmenten pro Kunde.
+
+    Ein Kunde wird nur neu kodiert, wenn ein anderes Dict-Objekt als beim
+    letzten Mal übergeben wird (siehe models.kunde_to_dict_cached). Das
+    Ergebnis ist byte-identisch zu encode().
+    """
+
+    def __init__(self):
+        self._fragmente = {}  # Name → (Kundendaten, Kodierung, Fragment)
+        self.neu_kodiert = 0  # Statistik: neu kodierte Kunden beim letzten Aufruf
+
+    def encode(self, all_data, encoding=ENCODING_JSON):
+        """Wie encode(), aber nur geänderte Kunden werden neu kodiert.
+
+        Args:
+            all_data (dict): Daten mit dem Schlüssel 'kunden'
+            encoding (str): Eine der ENCODINGS
+
+        Returns:
+            bytes: Kodierte Daten
+        """
+        if encoding == ENCODING_GZIP:
+            return gzip.compress(self.encode(all_data, ENCODING_COMPACT), compresslevel=1, mtime=0)
+        if encoding not in (ENCODING_JSON, ENCODING_COMPACT) or not isinstance(all_data.get('kunden'), dict):
+            return encode(all_data, encoding)
+
+        kompakt = encoding == ENCODING_COMPACT
+        teile = []
+        for key, wert in all_data.items():
+            if key == 'kunden':
+                text = self._kunden_text(wert, encoding)
+            elif kompakt:
+                text = _dumps(wert, True)
+            else:
+                text = _einruecken(_dumps(wert, False), 1)
+            teile.append((_dumps(key, kompakt), text))
+
+        if kompakt:
+            text = '{' + ','.join(f'{k}:{v}' for k, v in teile) + '}'
+        else:
+            text = '{\n' + ',\n'.join(f'    {k}: {v}' for k, v in teile) + '\n}'
+        return text.encode('utf-8')
+
+    def _kunden_text(self, kunden, encoding):
+        kompakt = encoding == ENCODING_COMPACT
+        fragmente = {}
+        neu_kodiert = 0
+        for name, daten in kunden.items():
+            eintrag = self._fragmente.get(name)
+            if eintrag is None or eintrag[0] is not daten or eintrag[1] != encoding:
+                fragment = _dumps(daten, kompakt)
+                if not kompakt:
+                    fragment = _einruecken(fragment, 2)
+                eintrag = (daten, encoding, f'{_dumps(name, kompakt)}{":" if kompakt else ": "}{fragment}')
+                neu_kodiert += 1
+            fragmente[name] = eintrag
+        self._fragmente = fragmente
+        self.neu_kodiert = neu_kodiert
+
+        if not fragmente:
+            return '{}'
+        if kompakt:
+            return '{' + ','.join(e[2] for e in fragmente.values()) + '}'
+        return '{\n        ' + ',\n        '.join(e[2] for e in fragmente.values()) + '\n    }'
+
+
+def read_file(path):
+    """Liest und dekodiert eine Datei (Kodierung automatisch erkannt)."""
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Speicher-Backend mit Append-Only-Journal und periodischer Kompaktierung.
+
+Jede Änderung auf Feldebene wird als eine JSON-Zeile an
+Verteiler_Daten.journal angehängt. Ein Hintergrund-Thread faltet das Journal
+in den Snapshot Verteiler_Daten.json, sobald es eine Größen- oder
+Altersgrenze überschreitet. Beim Laden wird das Journal auf den Snapshot
+angewendet; eine abgebrochene letzte Zeile wird ignoriert.
+
+Alle Journal-Einträge setzen Werte (idempotent), deshalb darf ein Journal
+nach einem Absturz während der Kompaktierung gefahrlos erneut angewendet
+werden.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from migrations import SCHEMA_VERSION
+from storage_encoding import ENCODING_JSON, FragmentCache, read_file
+from storage_sharded import atomic_write_bytes
+
+COMPACTING_SUFFIX = '.compacting'
+
+
+class JournalStorage:
+    """Snapshot-Datei plus Journal mit Änderungen auf Feldebene."""
+
+    def __init__(self, snapshot_path, journal_path, max_bytes=256 * 1024, max_age=300.0,
+                 encoding=ENCODING_JSON):
+        """Initialisiert das Backend.
+
+        Args:
+            snapshot_path (Path): Snapshot im Einzeldatei-Format
+            journal_path (Path): Journal-Datei (JSON Lines)
+            max_bytes (int): Journal-Größe, ab der kompaktiert wird
+            max_age (float): Sekunden seit dem ersten Journal-Eintrag,
+                nach denen kompaktiert wird
+            encoding (str): Kodierung des Snapshots (siehe storage_encoding)
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = Path(journal_path)
+        self.compacting_path = self.journal_path.with_name(self.journal_path.name + COMPACTING_SUFFIX)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.encoding = encoding
+        self._fragment_cache = FragmentCache()  # Snapshot: nur geänderte Kunden neu kodieren
+
+        self._lock = threading.Lock()
+        self._state = None           # Zuletzt persistierter Stand: Name → Kundendaten
+        self._next_customer_id = 1
+        self.schema_version = SCHEMA_VERSION  # Version des Snapshots
+        self._journal_bytes = 0
+        self._journal_since = None
+        self._compactor = None
+
+    def exists(self):
+        """Gibt zurück, ob Snapshot oder Journal existieren."""
+        return (self.snapshot_path.exists() or self.journal_path.exists()
+                or self.compacting_path.exists())
+
+    # ==================== Laden ====================
+
+    def load(self, read_only=False):
+        """Lädt den Snapshot und wendet die Journale an.
+
+        Args:
+            read_only (bool): Abgebrochenen Rest eines Journals nicht
+                abschneiden (die App könnte gerade anhängen)
+
+        Returns:
+            tuple: (all_customers: dict, next_customer_id: int)
+        """
+        state, next_customer_id = {}, 1
+        if self.snapshot_path.exists():
+            all_data = read_file(self.snapshot_path)
+            state = all_data.get('kunden', {})
+            next_customer_id = all_data.get('next_kunden_id', 1)
+            self.schema_version = all_data.get('schema_version', 0)
+
+        self._next_customer_id = next_customer_id
+        for path in (self.compacting_path, self.journal_path):
+            records, valid_bytes = self._read_records(path)
+            for record in records:
+                self._apply(state, record)
+            if not read_only and path.exists() and path.stat().st_size != valid_bytes:
+                # Abgebrochenen Rest abschneiden, sonst klebt der nächste Eintrag daran
+                with open(path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        self._state = state
+        self._journal_bytes = self.journal_path.stat().st_size if self.journal_path.exists() else 0
+        self._journal_since = time.monotonic() if self._journal_bytes else None
+
+        # Die Dicts werden geteilt: Aufrufer ersetzen Daten, sie verändern sie nicht
+        return state, self._next_customer_id
+
+    @staticmethod
+    def _read_records(path):
+        """Liest alle vollständigen Einträge eines Journals.
+
+        Returns:
+            tuple: (records: list, valid_bytes: int) – Länge des gültigen Teils
+        """
+        records, valid_bytes = [], 0
+        if not path.exists():
+            return records, valid_bytes
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Abgebrochener Schreibvorgang (Absturz)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        return records, valid_bytes
+
+    def _apply(self, state, record):
+        """Wendet einen Journal-Eintrag auf den Stand an."""
+        op = record.get('op')
+        name = record.get('kunde')
+
+        if op == 'next_kunden_id':
+            self._next_customer_id = record['wert']
+        elif op == 'kunde_neu':
+            state[name] = record['daten']
+        elif op == 'kunde_weg':
+            state.pop(name, None)
+        elif op == 'kunden_reihenfolge':
+            ordered = {n: state[n] for n in record['namen'] if n in state}
+            ordered.update({n: d for n, d in state.items() if n not in ordered})
+            state.clear()
+            state.update(ordered)
+        elif name in state:
+            customer_data = state[name]
+            anlagen = customer_data.setdefault('anlagen', [])
+            if op == 'kunde_feld':
+                customer_data[record['feld']] = record['wert']
+            elif op == 'anlage_feld':
+                for anlage in anlagen:
+                    if anlage.get('id') == record['anlage']:
+                        anlage[record['feld']] = record['wert']
+                        break
+            elif op == 'anlage_neu':
+                neu = record['daten']
+                for idx, anlage in enumerate(anlagen):
+                    if anlage.get('id') == neu.get('id'):
+                        anlagen[idx] = neu
+                        break
+                else:
+                    anlagen.append(neu)
+            elif op == 'anlage_weg':
+                customer_data['anlagen'] = [a for a in anlagen if a.get('id') != record['anlage']]
+            elif op == 'anlagen_reihenfolge':
+                by_id = {a.get('id'): a for a in anlagen}
+                customer_data['anlagen'] = [by_id[i] for i in record['ids'] if i in by_id]
+
+    # ==================== Speichern ====================
+
+    def save(self, all_customers, next_customer_id, dirty_keys=None):
+        """Hängt die Änderungen gegenüber dem letzten Stand an das Journal an.
+
+        Args:
+            all_customers (dict): Alle Kundendaten (Name → dict)
+            next_customer_id (int): Nächste freie Kunden-ID
+            dirty_keys (set, optional): Geänderte Kundennamen. None = alles
+                neu schreiben (Snapshot + leeres Journal).
+        """
+        if dirty_keys is None or self._state is None:
+            self._write_snapshot(dict(all_customers), next_customer_id)
+            return
+
+        records = self._diff(all_customers, next_customer_id, dirty_keys)
+        if not records:
+            return
+
+        payload = ''.join(
+            json.dumps(r, ensure_ascii=False, separators=(',', ':')) + '\n' for r in records
+        ).encode('utf-8')
+
+        with self._lock:
+            with open(self.journal_path, 'ab') as f:
+                f.write(payload)
+            self._state = {
+                name: data if name in dirty_keys or name not in self._state else self._state[name]
+                for name, data in all_customers.items()
+            }
+            self._next_customer_id = next_customer_id
+            self._journal_bytes += len(payload)
+            if self._journal_since is None:
+                self._journal_since = time.monotonic()
+
+        self._maybe_compact()
+
+    def _diff(self, all_customers, next_customer_id, dirty_keys):
+        """Erzeugt Journal-Einträge für alle Abweichungen vom letzten Stand."""
+        records = []
+        state = self._state
+
+        for name in state:
+            if name not in all_customers:
+                records.append({'op': 'kunde_weg', 'kunde': name})
+
+        for name, new in all_customers.items():
+            old = state.get(name)
+            if old is None:
+                records.append({'op': 'kunde_neu', 'kunde': name, 'daten': new})
+            elif name in dirty_keys:
+                records.extend(self._diff_customer(name, old, new))
+
+        # Beim Anwenden landen neue Kunden am Ende – abweichende Reihenfolge festhalten
+        erwartet = [n for n in state if n in all_customers] + \
+                   [n for n in all_customers if n not in state]
+        if erwartet != list(all_customers):
+            records.append({'op': 'kunden_reihenfolge', 'namen': list(all_customers)})
+
+        if next_customer_id != self._next_customer_id:
+            records.append({'op': 'next_kunden_id', 'wert': next_customer_id})
+
+        return records
+
+    @staticmethod
+    def _diff_customer(name, old, new):
+        """Einträge auf Feldebene für einen Kunden."""
+        if set(old) != set(new):
+            return [{'op': 'kunde_neu', 'kunde': name, 'daten': new}]
+
+        records = []
+        for feld, wert in new.items():
+            if feld != 'anlagen' and old.get(feld) != wert:
+                records.append({'op': 'kunde_feld', 'kunde': name, 'feld': feld, 'wert': wert})
+
+        old_anlagen = {a.get('id'): a for a in old.get('anlagen', [])}
+        new_anlagen = new.get('anlagen', [])
+        new_ids = [a.get('id') for a in new_anlagen]
+        if len(set(new_ids)) != len(new_ids) or len(old_anlagen) != len(old.get('anlagen', [])):
+            # Doppelte IDs lassen sich nicht adressieren → kompletten Kunden schreiben
+            return [{'op': 'kunde_neu', 'kunde': name, 'daten': new}]
+
+        for anlage in new_anlagen:
+            alt = old_anlagen.get(anlage.get('id'))
+            if alt is None or set(alt) != set(anlage):
+                records.append({'op': 'anlage_neu', 'kunde': name, 'daten': anlage})
+                continue
+            for feld, wert in anlage.items():
+                if alt.get(feld) != wert:
+                    records.append({'op': 'anlage_feld', 'kunde': name,
+                                    'anlage': anlage.get('id'), 'feld': feld, 'wert': wert})
+
+        new_id_set = set(new_ids)
+        for anlage_id in old_anlagen:
+            if anlage_id not in new_id_set:
+                records.append({'op': 'anlage_weg', 'kunde': name, 'anlage': anlage_id})
+
+        erwartet = [i for i in old_anlagen if i in new_id_set] + \
+                   [i for i in new_ids if i not in old_anlagen]
+        if erwartet != new_ids:
+            records.append({'op': 'anlagen_reihenfolge', 'kunde': name, 'ids': new_ids})
+
+        return records
+
+    # ==================== Kompaktierung ====================
+
+    def _maybe_compact(self):
+        """Startet die Kompaktierung im Hintergrund, wenn eine Grenze erreicht ist."""
+        too_big = self._journal_bytes >= self.max_bytes
+        too_old = (self._journal_since is not None
+                   and time.monotonic() - self._journal_since >= self.max_age)
+        if not (too_big or too_old):
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self.compact, name="JournalCompactor", daemon=True)
+        self._compactor.start()
+
+    def compact(self):
+        """Faltet das Journal in den Snapshot und leert es."""
+        with self._lock:
+            if self._state is None:
+                return
+            # Neue Einträge landen ab jetzt in einem frischen Journal
+            if self.journal_path.exists():
+                if self.compacting_path.exists():
+                    # Reste einer abgebrochenen Kompaktierung nicht überschreiben
+                    with open(self.compacting_path, 'ab') as dst, open(self.journal_path, 'rb') as src:
+                        shutil.copyfileobj(src, dst)
+                    self.journal_path.unlink()
+                else:
+                    os.replace(self.journal_path, self.compacting_path)
+            elif not self.compacting_path.exists():
+                return
+            snapshot = dict(self._state)
+            next_customer_id = self._next_customer_id
+            self._journal_bytes = 0
+            self._journal_since = None
+
+        atomic_write_bytes(self.snapshot_path, self._fragment_cache.encode({
+            'kunden': snapshot,
+            'next_kunden_id': next_customer_id,
+            'schema_version': SCHEMA_VERSION,
+        }, self.encoding))
+        self.compacting_path.unlink()
+
+    def discard_journal(self):
+        """Löscht alle Journale (nach dem Wechsel in ein anderes Layout)."""
+        with self._lock:
+            for path in (self.journal_path, self.compacting_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._state = None
+            self._journal_bytes = 0
+            self._journal_since = None
+
+    def _write_snapshot(self, all_customers, next_customer_id):
+        """Schreibt einen vollständigen Snapshot und verwirft alle Journale."""
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.snapshot_path, self._fragment_cache.encode({
+                'kunden': all_customers,
+                'next_kunden_id': next_customer_id,
+                'schema_version': SCHEMA_VERSION,
+            }, self.encoding))
+            self.schema_version = SCHEMA_VERSION
+            for path in (self.journal_path, self.compacting_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._state = all_customers
+            self._next_customer_id = next_customer_id
+            self._journal_bytes = 0
+            self._journal_since = None
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Speicher-Backend mit einer Datei pro Kunde.
+
+Layout im Datenverzeichnis:
+
+    Verteiler_Index.json      # Kundenname → id, Shard-Datei; next_kunden_id
+    Kunden/kunde_<id>.json    # Komplette Daten eines Kunden inkl. Anlagen
+
+Beim Speichern werden nur die Shards der geänderten Kunden neu geschrieben,
+der Index nur wenn sich Namen, Reihenfolge oder Kopfdaten geändert haben.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from migrations import SCHEMA_VERSION
+
+INDEX_FILENAME = 'Verteiler_Index.json'
+SHARD_DIRNAME = 'Kunden'
+
+
+def atomic_write_bytes(path, data):
+    """Schreibt Bytes atomar (temporäre Datei + os.replace).
+
+    Args:
+        path (Path): Zieldatei
+        data (bytes): Inhalt
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(path, obj, indent=4):
+    """Schreibt ein Objekt atomar als JSON (UTF-8, ohne ASCII-Escaping)."""
+    text = json.dumps(obj, indent=indent, ensure_ascii=False)
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+class ShardedStorage:
+    """Speichert jeden Kunden in einer eigenen Datei plus kleinem Index."""
+
+    def __init__(self, data_path):
+        """Initialisiert das Backend.
+
+        Args:
+            data_path: Pfad zum Datenverzeichnis
+        """
+        self.data_path = Path(data_path)
+        self.index_path = self.data_path / INDEX_FILENAME
+        self.shard_dir = self.data_path / SHARD_DIRNAME
+        self._index = None
+        self._next_customer_id = 1
+        self.schema_version = SCHEMA_VERSION  # Version der gespeicherten Daten
+
+    def exists(self):
+        """Gibt zurück, ob bereits ein Index existiert."""
+        return self.index_path.exists()
+
+    # ==================== Laden ====================
+
+    def load_index(self):
+        """Lädt nur den Index (ohne Kundendaten).
+
+        Returns:
+            tuple: (index: dict Name → Eintrag, next_customer_id: int)
+                Eintrag = {'id', 'datei', 'projekt', 'anlagen'}
+        """
+        if not self.index_path.exists():
+            self._index, self._next_customer_id = {}, 1
+            return {}, 1
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            index_data = json.load(f)
+
+        self._index = index_data.get('kunden', {})
+        self._next_customer_id = index_data.get('next_kunden_id', 1)
+        self.schema_version = index_data.get('schema_version', 0)
+        return self._index, self._next_customer_id
+
+    def load_customer(self, name):
+        """Lädt die Daten eines einzelnen Kunden aus seinem Shard.
+
+        Args:
+            name (str): Kundenname
+
+        Returns:
+            dict: Kundendaten
+        """
+        if self._index is None:
+            self.load_index()
+        entry = self._index[name]
+        with open(self.shard_dir / entry['datei'], 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self):
+        """Lädt Index und alle Shards.
+
+        Returns:
+            tuple: (all_customers: dict, next_customer_id: int)
+        """
+        index, next_customer_id = self.load_index()
+        all_customers = {name: self.load_customer(name) for name in index}
+        return all_customers, next_customer_id
+
+    # ==================== Speichern ====================
+
+    def save(self, all_customers, next_customer_id, dirty_keys=None):
+        """Schreibt geänderte Kunden-Shards und bei Bedarf den Index.
+
+        Args:
+            all_customers (dict): Alle Kundendaten (Name → dict)
+            next_customer_id (int): Nächste freie Kunden-ID
+            dirty_keys (set, optional): Geänderte Kundennamen. None = alle.
+                Kunden, die noch nicht im Index stehen, werden immer geschrieben.
+        """
+        if self._index is None:
+            self.load_index()
+
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        old_index = self._index
+        new_index = {}
+        used_files = set()
+        # Shards umbenannter Kunden (gleiche ID) weiterverwenden
+        orphans = {
+            entry['id']: entry['datei']
+            for name, entry in old_index.items() if name not in all_customers
+        }
+
+        for name, customer_data in all_customers.items():
+            old_entry = old_index.get(name)
+            needs_write = dirty_keys is None or name in dirty_keys or old_entry is None
+
+            if old_entry is not None and old_entry.get('id') == customer_data.get('id'):
+                filename = old_entry['datei']
+            elif orphans.get(customer_data.get('id')) not in (None, *used_files):
+                filename = orphans.pop(customer_data.get('id'))
+                needs_write = True
+            else:
+                filename = self._shard_filename(customer_data.get('id', 0), used_files)
+                needs_write = True
+            used_files.add(filename)
+
+            if needs_write:
+                atomic_write_json(self.shard_dir / filename, customer_data)
+                entry = self._index_entry(customer_data, filename)
+            else:
+                entry = old_entry
+            new_index[name] = entry
+
+        # Shards entfernter/umbenannter Kunden löschen
+        for name, entry in old_index.items():
+            if entry['datei'] not in used_files:
+                try:
+                    (self.shard_dir / entry['datei']).unlink()
+                except FileNotFoundError:
+                    pass
+
+        if new_index != old_index or list(new_index) != list(old_index) \
+                or next_customer_id != self._next_customer_id \
+                or self.schema_version != SCHEMA_VERSION:
+            atomic_write_json(self.index_path, {
+                'kunden': new_index,
+                'next_kunden_id': next_customer_id,
+                'schema_version': SCHEMA_VERSION,
+            })
+
+        self._index = new_index
+        self._next_customer_id = next_customer_id
+        self.schema_version = SCHEMA_VERSION
+
+    def _shard_filename(self, customer_id, used_files):
+        """Eindeutiger Shard-Dateiname auf Basis der Kunden-ID."""
+        taken = used_files | {e['datei'] for e in self._index.values()}
+        filename = f'kunde_{customer_id}.json'
+        counter = 2
+        while filename in taken:
+            filename = f'kunde_{customer_id}_{counter}.json'
+            counter += 1
+        return filename
+
+    @staticmethod
+    def _index_entry(customer_data, filename):
+        return {
+            'id': customer_data.get('id', 0),
+            'datei': filename,
+            'projekt': customer_data.get('projekt', ''),
+            'anlagen': len(customer_data.get('anlagen', [])),
+        }
+
+
+if __name__ == "__main__":
+    pass
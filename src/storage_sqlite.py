@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SQLite-Speicher-Backend (stdlib sqlite3).
+
+Normalisierte Tabellen für Kunden, Anlagen und die geparsten
+Beschriftungseinträge, mit Indizes für die typischen Suchen (Kundenname,
+Anlagen-Code, Zählernummer, Gebäude/Geschoss/Raum). Die Datenbank läuft im
+WAL-Modus.
+
+Export und Import im Einzeldatei-Format bleiben byte-kompatibel: Feld-
+reihenfolge, fehlende und unbekannte Felder werden pro Datensatz in der
+Spalte 'extra' festgehalten, die Spalten selbst haben keine Typ-Affinität
+und speichern Werte unverändert.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from migrations import SCHEMA_VERSION
+from label_parser import tokenize_text
+
+_SQLITE_INT_MAX = 2 ** 63 - 1
+
+# Feldreihenfolge wie in kunde_to_dict / anlage_to_dict
+KUNDE_FELDER = (
+    'id', 'projekt', 'datum', 'adresse', 'plz', 'ort', 'ansprechpartner',
+    'telefonnummer', 'email', 'anlagen', 'next_anlage_id',
+)
+ANLAGE_FELDER = (
+    'id', 'beschreibung', 'name', 'adresse', 'plz_ort', 'raum', 'gebaeude',
+    'geschoss', 'funktion', 'zaehlernummer', 'zaehlerstand', 'code', 'bemerkung',
+    'felder', 'reihen', 'text_inhalt', 'code_auto_last',
+)
+KUNDE_SPALTEN = tuple(f for f in KUNDE_FELDER if f != 'anlagen')
+ANLAGE_SPALTEN = ANLAGE_FELDER
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE IF NOT EXISTS kunde (
+    pk INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    {', '.join(f'"{c}"' for c in KUNDE_SPALTEN)},
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS anlage (
+    pk INTEGER PRIMARY KEY,
+    kunde_pk INTEGER NOT NULL REFERENCES kunde(pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    {', '.join(f'"{c}"' for c in ANLAGE_SPALTEN)},
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS beschriftung (
+    anlage_pk INTEGER NOT NULL REFERENCES anlage(pk) ON DELETE CASCADE,
+    zeile INTEGER NOT NULL,
+    spalte_von INTEGER NOT NULL,
+    spalte_bis INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_kunde_position ON kunde(position);
+CREATE INDEX IF NOT EXISTS idx_anlage_kunde ON anlage(kunde_pk, position);
+CREATE INDEX IF NOT EXISTS idx_anlage_code ON anlage(code);
+CREATE INDEX IF NOT EXISTS idx_anlage_zaehlernummer ON anlage(zaehlernummer);
+CREATE INDEX IF NOT EXISTS idx_anlage_ort ON anlage(gebaeude, geschoss, raum);
+CREATE INDEX IF NOT EXISTS idx_beschriftung_anlage ON beschriftung(anlage_pk);
+"""
+
+
+def _split_record(data, felder):
+    """Teilt ein Dict in Spaltenwerte und 'extra' (Reihenfolge/Sonderfelder).
+
+    Returns:
+        tuple: (spaltenwerte: list, extra: str oder None)
+    """
+    keys = list(data)
+    werte = {}
+    spalten = []
+    for feld in felder:
+        if feld == 'anlagen':
+            continue
+        wert = data.get(feld)
+        if isinstance(wert, (bool, list, dict)) or (
+                isinstance(wert, int) and not -_SQLITE_INT_MAX - 1 <= wert <= _SQLITE_INT_MAX):
+            # Typen, die SQLite nicht unverändert speichert (auch int jenseits von 64 Bit)
+            werte[feld] = wert
+            wert = None
+        spalten.append(wert)
+    for key in keys:
+        if key not in felder:
+            werte[key] = data[key]
+
+    extra = {}
+    if keys != list(felder):
+        extra['keys'] = keys
+    if werte:
+        extra['werte'] = werte
+    return spalten, (json.dumps(extra, ensure_ascii=False) if extra else None)
+
+
+def _join_record(row, felder, extra):
+    """Gegenstück zu _split_record."""
+    spalten = dict(zip([f for f in felder if f != 'anlagen'], row))
+    extra = json.loads(extra) if extra else {}
+    werte = extra.get('werte', {})
+    keys = extra.get('keys', felder)
+    data = {}
+    for key in keys:
+        data[key] = werte[key] if key in werte else spalten.get(key)
+    return data
+
+
+class SqliteStorage:
+    """Speichert alle Kunden in einer SQLite-Datenbank."""
+
+    def __init__(self, db_path):
+        """Initialisiert das Backend (die Datenbank wird erst bei Bedarf geöffnet).
+
+        Args:
+            db_path (Path): Pfad zur Datenbankdatei
+        """
+        self.db_path = Path(db_path)
+        self._conn = None
+        self._lock = threading.Lock()
+        self.schema_version = SCHEMA_VERSION  # Version der gespeicherten Daten
+
+    def exists(self):
+        """Gibt zurück, ob die Datenbank bereits existiert."""
+        return self.db_path.exists()
+
+    def _connect(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Zugriff aus SaveService-Thread und UI-Thread, serialisiert über self._lock
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Schließt die Datenbankverbindung."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ==================== Laden ====================
+
+    def load_index(self):
+        """Lädt nur Kopfdaten der Kunden.
+
+        Returns:
+            tuple: (index: dict Name → {'id', 'projekt', 'anlagen'}, next_customer_id: int)
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                'SELECT k.name, k.id, k.projekt, COUNT(a.pk) FROM kunde k '
+                'LEFT JOIN anlage a ON a.kunde_pk = k.pk '
+                'GROUP BY k.pk ORDER BY k.position'
+            ).fetchall()
+            next_customer_id = self._get_meta(conn, 'next_kunden_id', 1)
+            self._read_schema_version(conn)
+        index = {
+            name: {'id': kid, 'projekt': projekt or '', 'anlagen': anzahl}
+            for name, kid, projekt, anzahl in rows
+        }
+        return index, next_customer_id
+
+    def load_customer(self, name):
+        """Lädt die Daten eines einzelnen Kunden.
+
+        Args:
+            name (str): Kundenname
+
+        Returns:
+            dict: Kundendaten
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f'SELECT pk, {self._cols(KUNDE_SPALTEN)}, extra FROM kunde WHERE name = ?',
+                (name,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(name)
+            anlagen = self._load_anlagen(conn, [row[0]]).get(row[0], [])
+        return self._kunde_from_row(row, anlagen)
+
+    def load(self):
+        """Lädt alle Kunden.
+
+        Returns:
+            tuple: (all_customers: dict, next_customer_id: int)
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f'SELECT pk, {self._cols(KUNDE_SPALTEN)}, extra, name FROM kunde ORDER BY position'
+            ).fetchall()
+            anlagen = self._load_anlagen(conn, None)
+            next_customer_id = self._get_meta(conn, 'next_kunden_id', 1)
+            self._read_schema_version(conn)
+
+        all_customers = {
+            row[-1]: self._kunde_from_row(row[:-1], anlagen.get(row[0], []))
+            for row in rows
+        }
+        return all_customers, next_customer_id
+
+    def _load_anlagen(self, conn, kunde_pks):
+        """Lädt Anlagen gruppiert nach kunde_pk (None = alle)."""
+        sql = f'SELECT kunde_pk, {self._cols(ANLAGE_SPALTEN)}, extra FROM anlage'
+        params = ()
+        if kunde_pks is not None:
+            sql += f' WHERE kunde_pk IN ({",".join("?" * len(kunde_pks))})'
+            params = tuple(kunde_pks)
+        sql += ' ORDER BY kunde_pk, position'
+
+        result = {}
+        for row in conn.execute(sql, params):
+            result.setdefault(row[0], []).append(
+                _join_record(row[1:-1], ANLAGE_FELDER, row[-1])
+            )
+        return result
+
+    @staticmethod
+    def _kunde_from_row(row, anlagen):
+        data = _join_record(row[1:-1], KUNDE_FELDER, row[-1])
+        if 'anlagen' in data:
+            data['anlagen'] = anlagen
+        return data
+
+    # ==================== Speichern ====================
+
+    def save(self, all_customers, next_customer_id, dirty_keys=None):
+        """Schreibt geänderte Kunden in einer Transaktion.
+
+        Args:
+            all_customers (dict): Alle Kundendaten (Name → dict)
+            next_customer_id (int): Nächste freie Kunden-ID
+            dirty_keys (set, optional): Geänderte Kundennamen. None = alle.
+                Kunden, die noch nicht in der Datenbank stehen, werden immer geschrieben.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                vorhanden = dict(conn.execute('SELECT name, pk FROM kunde'))
+
+                for name in vorhanden.keys() - all_customers.keys():
+                    conn.execute('DELETE FROM kunde WHERE pk = ?', (vorhanden[name],))
+
+                for position, (name, customer_data) in enumerate(all_customers.items()):
+                    if name in vorhanden and dirty_keys is not None and name not in dirty_keys:
+                        conn.execute('UPDATE kunde SET position = ? WHERE pk = ?',
+                                     (position, vorhanden[name]))
+                        continue
+                    if name in vorhanden:
+                        conn.execute('DELETE FROM kunde WHERE pk = ?', (vorhanden[name],))
+                    self._insert_customer(conn, name, position, customer_data)
+
+                conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+                    ('next_kunden_id', next_customer_id),
+                    ('schema_version', SCHEMA_VERSION),
+                ])
+            self.schema_version = SCHEMA_VERSION
+
+    def _insert_customer(self, conn, name, position, customer_data):
+        spalten, extra = _split_record(customer_data, KUNDE_FELDER)
+        cur = conn.execute(
+            f'INSERT INTO kunde (name, position, {self._cols(KUNDE_SPALTEN)}, extra) '
+            f'VALUES ({",".join("?" * (len(KUNDE_SPALTEN) + 3))})',
+            (name, position, *spalten, extra)
+        )
+        kunde_pk = cur.lastrowid
+
+        for anlage_pos, anlage in enumerate(customer_data.get('anlagen', []) or []):
+            spalten, extra = _split_record(anlage, ANLAGE_FELDER)
+            cur = conn.execute(
+                f'INSERT INTO anlage (kunde_pk, position, {self._cols(ANLAGE_SPALTEN)}, extra) '
+                f'VALUES ({",".join("?" * (len(ANLAGE_SPALTEN) + 3))})',
+                (kunde_pk, anlage_pos, *spalten, extra)
+            )
+            conn.executemany(
+                'INSERT INTO beschriftung (anlage_pk, zeile, spalte_von, spalte_bis, text) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(cur.lastrowid, *eintrag) for eintrag in self._parse_labels(anlage.get('text_inhalt'))]
+            )
+
+    @staticmethod
+    def _parse_labels(text_inhalt):
+        """Zerlegt text_inhalt in (zeile, spalte_von, spalte_bis, text)."""
+        if not isinstance(text_inhalt, str):
+            return []
+        # Spaltennummern jenseits von 64 Bit (Tippfehler) kann SQLite nicht speichern
+        return [(e.zeile, e.spalten[0], e.spalten[-1], e.beschreibung)
+                for e in tokenize_text(text_inhalt)
+                if e.spalten and -_SQLITE_INT_MAX <= e.spalten[0] and e.spalten[-1] <= _SQLITE_INT_MAX]
+
+    # ==================== Suche ====================
+
+    def find_anlagen(self, code=None, zaehlernummer=None, gebaeude=None,
+                     geschoss=None, raum=None, beschriftung=None):
+        """Sucht Anlagen über die indizierten Spalten.
+
+        Args:
+            code, zaehlernummer, gebaeude, geschoss, raum (str, optional):
+                Exakte Treffer
+            beschriftung (str, optional): Teilstring in einem Beschriftungseintrag
+
+        Returns:
+            list: [(kundenname, anlage: dict), ...]
+        """
+        bedingungen, params = [], []
+        for spalte, wert in (('code', code), ('zaehlernummer', zaehlernummer),
+                             ('gebaeude', gebaeude), ('geschoss', geschoss), ('raum', raum)):
+            if wert is not None:
+                bedingungen.append(f'a."{spalte}" = ?')
+                params.append(wert)
+        if beschriftung is not None:
+            bedingungen.append(
+                'a.pk IN (SELECT anlage_pk FROM beschriftung WHERE text LIKE ?)'
+            )
+            params.append(f'%{beschriftung}%')
+
+        sql = (f'SELECT k.name, {", ".join(f"a.{c}" for c in self._quoted(ANLAGE_SPALTEN))}, a.extra '
+               'FROM anlage a JOIN kunde k ON k.pk = a.kunde_pk')
+        if bedingungen:
+            sql += ' WHERE ' + ' AND '.join(bedingungen)
+        sql += ' ORDER BY k.position, a.position'
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [(row[0], _join_record(row[1:-1], ANLAGE_FELDER, row[-1])) for row in rows]
+
+    # ==================== Helper ====================
+
+    @staticmethod
+    def _quoted(spalten):
+        return [f'"{c}"' for c in spalten]
+
+    def _cols(self, spalten):
+        return ', '.join(self._quoted(spalten))
+
+    def _read_schema_version(self, conn):
+        # Bereits gespeicherte Datenbank ohne Versionsangabe = Version 0
+        gespeichert = self._get_meta(conn, 'next_kunden_id', None) is not None
+        self.schema_version = self._get_meta(conn, 'schema_version', 0 if gespeichert else SCHEMA_VERSION)
+
+    @staticmethod
+    def _get_meta(conn, key, default):
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+
+if __name__ == "__main__":
+    pass
@@ -33,16 +33,25 @@ import re
 import warnings
 from typing import Dict, List, Tuple, Optional
 
-import flet as ft
 import locale
 
-# Pillow optional for text measurement
-try:
-    from PIL import ImageFont
+# Pillow optional for text measurement – imported on the first measurement,
+# so that headless tools (exports, CLI) do not pay for it at startup
+_IMAGE_FONT = None
+_PIL_CHECKED = False
 
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+
+def _image_font():
+    """Return PIL.ImageFont, or None if Pillow is not installed."""
+    global _IMAGE_FONT, _PIL_CHECKED
+    if not _PIL_CHECKED:
+        try:
+            from PIL import ImageFont
+            _IMAGE_FONT = ImageFont
+        except ImportError:
+            _IMAGE_FONT = None
+        _PIL_CHECKED = True
+    return _IMAGE_FONT
 
 __version__ = "2.0.0"
 __author__ = "Your Name"
@@ -92,7 +101,8 @@ class TranslationSystem:
         if size in self._font_cache:
             return self._font_cache[size]
 
-        if not PIL_AVAILABLE:
+        ImageFont = _image_font()
+        if ImageFont is None:
             # Statt Exception: Gebe None zurück
             # _measure() hat bereits einen Fallback
             return None
@@ -115,7 +125,7 @@ class TranslationSystem:
     def _measure(self, text: str, size: int) -> Tuple[int, int]:
         """Measure text dimensions at given font size."""
         # Fallback für Android oder wenn PIL nicht verfügbar
-        if not PIL_AVAILABLE:
+        if _image_font() is None:
             # Schätze Breite basierend auf Zeichenlänge
             # Durchschnittliche Zeichenbreite ≈ 0.6 * fontsize
             width = int(len(text) * size * 0.6)
@@ -384,6 +394,8 @@ class TranslationSystem:
     # =========================================================
 
     def run_tr_extractor_ui(self) -> None:
+        # Flet erst hier laden: Übersetzungen (z.B. in Export-Workern) brauchen es nicht
+        import flet as ft
 
         def get_system_locale() -> str:
             lang, enc = locale.getlocale()
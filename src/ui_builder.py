@@ -208,7 +208,22 @@ class UIBuilder:
                         style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
                     ),
                 ], spacing=5),
-                # Zeile 3: Kunde - Alle Kunden Text Export
+                # Zeile 3: Kunde Tabellenexport (eine Datei) - Alle Anlagen Tabellenexport
+                ft.Row([
+                    ft.ElevatedButton(
+                        _("KUNDE TABELLENEXPORT", BFSIZE),
+                        on_click=self.app.exportiere_kunde_tabellen,
+                        expand=True,
+                        style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+                    ),
+                    ft.ElevatedButton(
+                        _("ALLE ANLAGEN TABELLENEXPORT", BFSIZE),
+                        on_click=self.app.exportiere_alle_anlagen,
+                        expand=True,
+                        style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+                    ),
+                ], spacing=5),
+                # Zeile 4: Kunde - Alle Kunden Text Export
                 ft.Row([
                     ft.ElevatedButton(
                         _("KUNDE TEXT EXPORT", BFSIZE),
@@ -223,7 +238,22 @@ class UIBuilder:
                         style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
                     ),
                 ], spacing=5),
-                # Zeile 4: Einstellungen - Kunden Export
+                # Zeile 5: Druckfertige PDF-Streifen (Anlage - Kunde)
+                ft.Row([
+                    ft.ElevatedButton(
+                        _("ANLAGE PDF EXPORT", BFSIZE),
+                        on_click=self.app.exportiere_anlage_pdf,
+                        expand=True,
+                        style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+                    ),
+                    ft.ElevatedButton(
+                        _("KUNDE PDF EXPORT", BFSIZE),
+                        on_click=self.app.exportiere_kunde_pdf,
+                        expand=True,
+                        style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+                    ),
+                ], spacing=5),
+                # Zeile 6: Einstellungen - Kunden Export
                 ft.Row([
                     ft.ElevatedButton(
                         _("EINSTELLUNGEN", BFSIZE),
@@ -305,6 +335,19 @@ class UIBuilder:
 
         self.app.ui["info_label"] = ft.Text("", size=10)
         self.app.ui["verfuegbar_label"] = ft.Text("", size=10)
+        self.tf(
+            "platz_breite_input",
+            label=_("Breite neues Gerät (Spalten)"),
+            value="1",
+            keyboard_type=ft.KeyboardType.NUMBER,
+            on_change=self.app.info_aktualisieren,
+        )
+        self.app.ui["platz_label"] = ft.Text("", size=10)
+        self.app.ui["anordnen_btn"] = ft.ElevatedButton(
+            _("Beschriftungen anordnen", BFSIZE),
+            on_click=self.app.beschriftungen_anordnen,
+            style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+        )
 
         # Text Editor
         editor = ft.TextField(
@@ -341,6 +384,9 @@ class UIBuilder:
                 self.app.ui["reihen_input"],
                 self.app.ui["info_label"],
                 self.app.ui["verfuegbar_label"],
+                self.app.ui["platz_breite_input"],
+                self.app.ui["platz_label"],
+                self.app.ui["anordnen_btn"],
                 ft.Divider(),
                 editor,
             ],
@@ -379,6 +425,8 @@ class UIBuilder:
             "settings_rand_unten_input": (_("Rand Unten (cm)"), "rand_unten"),
             "settings_rand_links_input": (_("Rand Links (cm)"), "rand_links"),
             "settings_rand_rechts_input": (_("Rand Rechts (cm)"), "rand_rechts"),
+            "settings_speicher_intervall_input": (_("Speicherintervall (s)"),
+                                                  "speicher_intervall"),
         }
 
         for key, (label, setting_key) in settings_map.items():
@@ -396,6 +444,12 @@ class UIBuilder:
             self.app.settings["zellen_umrandung"],
             on_change=self.app.auto_speichere_settings,
         )
+        self.sw(
+            "settings_export_neu_switch",
+            _("Unveränderte Exporte neu erzeugen"),
+            self.app.settings["export_immer_neu"],
+            on_change=self.app.auto_speichere_settings,
+        )
 
         # Datumsformat-Dropdown
         datum_dropdown = ft.Dropdown(
@@ -430,6 +484,36 @@ class UIBuilder:
             locale_dropdown,
         ], spacing=10)
         
+        # Speicher-Layout
+        speicher_modus_dropdown = ft.Dropdown(
+            label=_("Speicherformat"),
+            options=[
+                ft.dropdown.Option("json", _("Eine Datei (Verteiler_Daten.json)")),
+                ft.dropdown.Option("sharded", _("Eine Datei pro Kunde")),
+                ft.dropdown.Option("journal", _("Änderungsjournal")),
+                ft.dropdown.Option("sqlite", _("SQLite-Datenbank")),
+            ],
+            value=self.app.data_manager.get_storage_mode(),
+            expand=True,
+        )
+        speicher_modus_dropdown.on_text_change = self.app.on_speicher_modus_change
+        self.app.ui["settings_speicher_modus"] = speicher_modus_dropdown
+
+        # Kodierung der Datendatei
+        speicher_kodierung_dropdown = ft.Dropdown(
+            label=_("Dateikodierung"),
+            options=[
+                ft.dropdown.Option("json", _("JSON (lesbar)")),
+                ft.dropdown.Option("json_kompakt", _("JSON kompakt")),
+                ft.dropdown.Option("gzip", _("JSON gzip-komprimiert")),
+                ft.dropdown.Option("pickle", _("Binär (pickle)")),
+            ],
+            value=self.app.data_manager.get_storage_encoding(),
+            expand=True,
+        )
+        speicher_kodierung_dropdown.on_text_change = self.app.on_speicher_kodierung_change
+        self.app.ui["settings_speicher_kodierung"] = speicher_kodierung_dropdown
+
         # Linebreak-Zeichen
         self.tf(
             "settings_linebreak_input",
@@ -463,6 +547,7 @@ class UIBuilder:
                 self.app.ui["settings_beschr_hoehe_input"],
                 self.app.ui["settings_inhalt_hoehe_input"],
                 self.app.ui["settings_umrandung_switch"],
+                self.app.ui["settings_export_neu_switch"],
                 ft.Divider(),
                 ft.Text(_("Seiten-Layout"),
                         weight=ft.FontWeight.BOLD, size=11),
@@ -473,6 +558,9 @@ class UIBuilder:
                 ft.Divider(),
                 ft.Text(_("Datensicherung"),
                         weight=ft.FontWeight.BOLD, size=11),
+                self.app.ui["settings_speicher_intervall_input"],
+                speicher_modus_dropdown,
+                speicher_kodierung_dropdown,
                 ft.ElevatedButton(
                     _("📤 Export zu Documents", BFSIZE),
                     on_click=self.app.exportiere_zu_downloads,
@@ -485,10 +573,20 @@ class UIBuilder:
                     expand=True,
                     style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
                 ),
+                ft.ElevatedButton(
+                    _("🗄 Sicherungen", BFSIZE),
+                    on_click=self.app.zeige_sicherungen_dialog,
+                    expand=True,
+                    style=ft.ButtonStyle(text_style=ft.TextStyle(size=BFSIZE2))
+                ),
                 ft.Text(
                     _("Erstellt: Verteiler_Daten.json & Verteiler_Einstellungen.json"),
                     size=8,
                 ),
+                ft.Text(
+                    _("Jeder Export legt zusätzlich eine Sicherung in Backups/ an"),
+                    size=8,
+                ),
             ],
             spacing=5,
             scroll=ft.ScrollMode.AUTO,
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""LRU-Cache für Validierungsergebnisse der Beschriftungen.
+
+Schlüssel ist ein Hash über (text_inhalt, felder, reihen). Detailansicht,
+Feldänderungen und Export validieren dieselbe Anlage oft mehrfach
+unverändert – der Cache liefert dann das gemerkte Ergebnis. Die
+Fehlermeldungen sind übersetzt, daher wird der Cache beim Wechsel der
+Sprache geleert.
+
+Die gemeinsame Instanz ist odf_exporter.validierungs_cache; Editor und
+Export lesen und schreiben dieselbe. Der Editor rechnet bei einem
+Fehlgriff mit dem IncrementalValidator, der dieselben Ergebnisse liefert
+wie validiere_eintraege.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from constants import VALIDIERUNG_CACHE_MAX, ts
+
+
+class ValidierungsCache:
+    """Begrenzter LRU-Cache (text_inhalt, felder, reihen) → Validierungsergebnis."""
+
+    def __init__(self, berechne, max_eintraege=VALIDIERUNG_CACHE_MAX):
+        """Initialisiert den Cache.
+
+        Args:
+            berechne: Callable(text_inhalt, felder, reihen) → Ergebnis-Tupel
+                wie odf_exporter.validiere_eintraege
+            max_eintraege (int): Maximale Anzahl gemerkter Ergebnisse
+        """
+        self._berechne = berechne
+        self._lock = threading.Lock()
+        self._eintraege = OrderedDict()
+        self._locale = ts.get_locale()
+        self.max_eintraege = max(1, max_eintraege)
+        self.treffer = 0      # Statistik: aus dem Cache beantwortet
+        self.fehlgriffe = 0   # Statistik: neu berechnet
+
+    @staticmethod
+    def _schluessel(text_inhalt, felder, reihen):
+        digest = hashlib.blake2b(text_inhalt.encode('utf-8'), digest_size=16).digest()
+        return digest, felder, reihen
+
+    def validiere(self, text_inhalt, felder, reihen, berechne=None):
+        """Liefert das Validierungsergebnis, aus dem Cache oder neu berechnet.
+
+        Args:
+            text_inhalt (str): Text mit allen Einträgen (zeilenweise)
+            felder (int): Anzahl Felder
+            reihen (int): Anzahl Reihen
+            berechne (optional): Abweichende Berechnung bei einem Fehlgriff
+                (z.B. der IncrementalValidator der geöffneten Anlage); muss
+                dieselben Ergebnisse liefern wie validiere_eintraege
+
+        Returns:
+            tuple: Wie validiere_eintraege. Listen und Belegung sind Kopien,
+                die Dicts in gueltige_eintraege werden geteilt (nicht verändern).
+        """
+        schluessel = self._schluessel(text_inhalt, felder, reihen)
+        with self._lock:
+            self._pruefe_locale()
+            ergebnis = self._eintraege.get(schluessel)
+            if ergebnis is not None:
+                self._eintraege.move_to_end(schluessel)
+                self.treffer += 1
+                return self._kopie(ergebnis)
+            self.fehlgriffe += 1
+            locale = self._locale
+
+        ergebnis = (berechne or self._berechne)(text_inhalt, felder, reihen)
+        with self._lock:
+            # Sprache während der Berechnung gewechselt: Meldungen sind veraltet
+            self._pruefe_locale()
+            if self._locale != locale:
+                return ergebnis
+            self._eintraege[schluessel] = self._kopie(ergebnis)
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+        return ergebnis
+
+    def invalidate(self):
+        """Leert den Cache (Zähler bleiben erhalten)."""
+        with self._lock:
+            self._eintraege.clear()
+            self._locale = ts.get_locale()
+
+    def _pruefe_locale(self):
+        """Leert den Cache, wenn sich die Sprache geändert hat."""
+        locale = ts.get_locale()
+        if locale != self._locale:
+            self._eintraege.clear()
+            self._locale = locale
+
+    @staticmethod
+    def _kopie(ergebnis):
+        is_valid, gueltige, fehler_anzahl, belegte, max_spalten, fehler_details = ergebnis
+        return is_valid, list(gueltige), fehler_anzahl, belegte.copy(), max_spalten, list(fehler_details)
+
+    def __len__(self):
+        return len(self._eintraege)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kommandozeile für Exporte und Audit – ohne Flet.
+
+Lädt nur Datenhaltung, Validierung und die Export-Module; die Oberfläche
+(Flet) wird nie importiert. Damit lassen sich z.B. nächtliche
+Stapel-Exporte per Skript starten.
+
+Aufruf (im Verzeichnis src):
+    python -m verteiler export DATENPFAD [--kunde NAME ...]
+                               [--anlage ID ... | --alle-anlagen]
+                               [--format ods,odt] [--ziel PFAD]
+                               [--neu] [--prozesse N]
+    python -m verteiler audit DATENPFAD [--schwelle PROZENT] [--ohne-numpy]
+
+Formate (--format, mit Komma getrennt):
+    ods        eine Tabelle je Anlage
+    pdf        druckfertige PDF-Streifen je Anlage
+    odt        Kundendaten als Text je Kunde
+    ods-kunde  alle Anlagen eines Kunden in einer ODS
+    pdf-kunde  alle Anlagen eines Kunden in einer PDF
+
+Mit --anlage werden nur diese Anlagen (ID oder Beschreibung) exportiert,
+auch in odt/ods-kunde/pdf-kunde. Unveränderte Dateien werden über das
+Export-Manifest übernommen, außer mit --neu. Exit-Code 1, wenn ein
+Export fehlgeschlagen ist.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+STANDARD_FORMATE = 'ods,odt'
+
+
+def _formate(text):
+    """argparse-Typ für --format."""
+    from batch_export import ARTEN
+
+    formate = [teil.strip().lower() for teil in text.split(',') if teil.strip()]
+    unbekannt = [art for art in formate if art not in ARTEN]
+    if unbekannt or not formate:
+        raise argparse.ArgumentTypeError(
+            f"unbekanntes Format {', '.join(unbekannt) or text!r} (möglich: {', '.join(ARTEN)})"
+        )
+    return formate
+
+
+def _auswahl(all_customers, kunden, anlagen):
+    """Gewählte Kunden, optional nur mit den gewählten Anlagen.
+
+    Returns:
+        tuple: ({kundenname: kunde_dict}, [nicht gefundene Namen/IDs])
+    """
+    fehlend = [name for name in kunden if name not in all_customers]
+    namen = [name for name in kunden if name in all_customers] if kunden else list(all_customers)
+
+    auswahl = {}
+    gefunden = set()
+    for name in namen:
+        kunde = all_customers[name]
+        if anlagen:
+            treffer = [anlage for anlage in kunde.get('anlagen', [])
+                       if str(anlage.get('id')) in anlagen or anlage.get('beschreibung') in anlagen]
+            if not treffer:
+                continue
+            gefunden.update(str(anlage.get('id')) for anlage in treffer)
+            gefunden.update(anlage.get('beschreibung') for anlage in treffer)
+            kunde = dict(kunde, anlagen=treffer)
+        auswahl[name] = kunde
+
+    fehlend.extend(anlage for anlage in anlagen if anlage not in gefunden)
+    return auswahl, fehlend
+
+
+def export(args):
+    """Unterbefehl export."""
+    from batch_export import exportiere_stapel
+    from constants import ts
+    from data_manager import DataManager
+
+    data_manager = DataManager(args.datenpfad)
+    settings = data_manager.load_settings()
+    all_customers, _next_id = data_manager.load_data(read_only=True)
+
+    # Fehlermeldungen in der Sprache der App
+    locale_code = settings.get('selected_locale')
+    if locale_code and locale_code != ts.get_locale():
+        ts.set_locale(locale_code)
+
+    kunden, fehlend = _auswahl(all_customers, args.kunde or [], args.anlage or [])
+    for name in fehlend:
+        print(f"Nicht gefunden: {name}", file=sys.stderr)
+    if not kunden:
+        print("Keine Kunden zum Exportieren.", file=sys.stderr)
+        return 1
+
+    ziel = args.ziel or args.datenpfad / 'Export'
+    formate = set(args.format)
+    ergebnis = exportiere_stapel(
+        kunden, settings, ziel,
+        odt='odt' in formate,
+        ods='ods' in formate,
+        pdf='pdf' in formate,
+        ods_kunde='ods-kunde' in formate,
+        pdf_kunde='pdf-kunde' in formate,
+        max_workers=args.prozesse,
+        force=args.neu,
+    )
+
+    if args.ausfuehrlich:
+        for pfad in ergebnis['dateien']:
+            print(pfad)
+    for beschreibung, meldung in ergebnis['fehler']:
+        print(f"Fehler: {beschreibung}: {meldung}", file=sys.stderr)
+    print(f"{len(ergebnis['dateien'])} von {ergebnis['auftraege']} Dateien in "
+          f"{ergebnis['dauer']:.2f} s ({ergebnis['prozesse']} Prozesse) → {ziel}")
+    return 1 if ergebnis['fehler'] or fehlend else 0
+
+
+def audit(args):
+    """Unterbefehl audit: Argumente gehen unverändert an label_audit."""
+    from label_audit import main as audit_main
+
+    return audit_main(args.argumente)
+
+
+def main(argv=None):
+    """Kommandozeile: verteiler export|audit DATENPFAD ..."""
+    parser = argparse.ArgumentParser(prog='verteiler', description=__doc__.splitlines()[0])
+    unterbefehle = parser.add_subparsers(dest='befehl', required=True)
+
+    p_export = unterbefehle.add_parser('export', help='Kunden und Anlagen exportieren')
+    p_export.add_argument('datenpfad', type=Path, help='Datenverzeichnis der App')
+    p_export.add_argument('--kunde', '--customer', action='append', metavar='NAME',
+                          help='Nur diesen Kunden exportieren (mehrfach möglich, Standard: alle)')
+    anlagen = p_export.add_mutually_exclusive_group()
+    anlagen.add_argument('--anlage', action='append', metavar='ID',
+                         help='Nur diese Anlage (ID oder Beschreibung, mehrfach möglich)')
+    anlagen.add_argument('--alle-anlagen', '--all-anlagen', action='store_true',
+                         help='Alle Anlagen der Kunden (Standard)')
+    p_export.add_argument('--format', type=_formate, default=STANDARD_FORMATE,
+                          help=f'Formate, mit Komma getrennt (Standard: {STANDARD_FORMATE})')
+    p_export.add_argument('--ziel', type=Path,
+                          help='Export-Verzeichnis (Standard: DATENPFAD/Export)')
+    p_export.add_argument('--neu', '--force', action='store_true',
+                          help='Auch unveränderte Dateien neu erzeugen')
+    p_export.add_argument('--prozesse', type=int, metavar='N',
+                          help='Anzahl Prozesse (Standard: CPU-Kerne, 1 = sequentiell)')
+    p_export.add_argument('-v', '--ausfuehrlich', action='store_true',
+                          help='Erzeugte Dateien ausgeben')
+    p_export.set_defaults(ausfuehren=export)
+
+    p_audit = unterbefehle.add_parser('audit', add_help=False,
+                                      help='Beschriftungen aller Anlagen prüfen (label_audit.py)')
+    p_audit.add_argument('argumente', nargs=argparse.REMAINDER)
+    p_audit.set_defaults(ausfuehren=audit)
+
+    args = parser.parse_args(argv)
+    return args.ausfuehren(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Inkrementeller XML-Writer für große ODF-Dokumente.
+
+Statt erst einen ElementTree aufzubauen und ihn mit ET.tostring als ein
+großes bytes-Objekt zu serialisieren, werden Elemente in der Reihenfolge
+ihrer Entstehung direkt in einen binären Stream geschrieben (z.B.
+zipfile.ZipFile.open(name, 'w')). Im Speicher liegt nur ein kleiner
+Puffer, unabhängig von der Dokumentgröße.
+
+Die Ausgabe entspricht der von ET.tostring(..., xml_declaration=True):
+gleiche Deklaration, gleiches Escaping, leere Elemente als "<tag />".
+Tags und Attribute werden mit Präfix angegeben ("table:table-cell").
+"""
+
+from constants import XML_STREAM_PUFFER
+
+
+def _escape_text(text):
+    """Escaping für Zeicheninhalt (wie ElementTree)."""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _escape_attrib(text):
+    """Escaping für Attributwerte (wie ElementTree)."""
+    text = _escape_text(text)
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
+
+
+def _attribute(attrib):
+    return ''.join(f' {key}="{_escape_attrib(wert)}"' for key, wert in attrib.items())
+
+
+class XmlStreamWriter:
+    """Schreibt Elemente nacheinander in einen binären Stream.
+
+    Beispiel:
+        w = XmlStreamWriter(stream)
+        w.declaration()
+        w.start('office:document-content', namespaces=NS)
+        w.element('text:p', text='Hallo')
+        w.end()
+        w.close()
+    """
+
+    def __init__(self, stream, puffer=XML_STREAM_PUFFER):
+        """Initialisiert den Writer.
+
+        Args:
+            stream: Binärer, beschreibbarer Stream
+            puffer (int): Zeichen, ab denen in den Stream geschrieben wird
+        """
+        self._stream = stream
+        self._puffer_max = puffer
+        self._teile = []
+        self._laenge = 0
+        self._offen = []          # Stack der offenen Tags
+        self._start_offen = False  # '>' des letzten start() steht noch aus
+
+    def _schreibe(self, text):
+        self._teile.append(text)
+        self._laenge += len(text)
+        if self._laenge >= self._puffer_max:
+            self.flush()
+
+    def _schliesse_start(self):
+        if self._start_offen:
+            self._schreibe('>')
+            self._start_offen = False
+
+    def declaration(self):
+        """XML-Deklaration wie ET.tostring(..., xml_declaration=True)."""
+        self._schreibe("<?xml version='1.0' encoding='utf-8'?>\n")
+
+    def start(self, tag, attrib=None, namespaces=None):
+        """Öffnet ein Element.
+
+        Args:
+            tag (str): Tag mit Präfix
+            attrib (dict, optional): Attribute in Ausgabereihenfolge
+            namespaces (dict, optional): {präfix: uri}, als xmlns-Deklarationen
+                (nach Präfix sortiert) vor den Attributen
+        """
+        self._schliesse_start()
+        kopf = '<' + tag
+        if namespaces:
+            kopf += ''.join(f' xmlns:{praefix}="{_escape_attrib(uri)}"'
+                            for praefix, uri in sorted(namespaces.items()))
+        if attrib:
+            kopf += _attribute(attrib)
+        self._schreibe(kopf)
+        self._offen.append(tag)
+        self._start_offen = True
+
+    def text(self, text):
+        """Zeicheninhalt im aktuellen Element."""
+        if text:
+            self._schliesse_start()
+            self._schreibe(_escape_text(text))
+
+    def end(self):
+        """Schließt das zuletzt geöffnete Element."""
+        tag = self._offen.pop()
+        if self._start_offen:
+            self._schreibe(' />')
+            self._start_offen = False
+        else:
+            self._schreibe(f'</{tag}>')
+
+    def element(self, tag, attrib=None, text=None):
+        """Element ohne Kindelemente (optional mit Text)."""
+        self._schliesse_start()
+        kopf = '<' + tag + (_attribute(attrib) if attrib else '')
+        if text:
+            self._schreibe(f'{kopf}>{_escape_text(text)}</{tag}>')
+        else:
+            self._schreibe(kopf + ' />')
+
+    def flush(self):
+        """Schreibt den Puffer in den Stream."""
+        if self._teile:
+            self._stream.write(''.join(self._teile).encode('utf-8'))
+            self._teile = []
+            self._laenge = 0
+
+    def detach(self):
+        """Schreibt alles Bisherige und gibt die noch offenen Tags ab.
+
+        Der Writer schließt diese Tags danach nicht mehr – so lässt sich
+        ein Dokumentanfang erzeugen und zwischenspeichern.
+
+        Returns:
+            list: Offene Tags, äußerstes zuerst
+        """
+        self._schliesse_start()
+        self.flush()
+        offen, self._offen = self._offen, []
+        return offen
+
+    def close(self):
+        """Schließt alle offenen Elemente und leert den Puffer (Stream bleibt offen)."""
+        while self._offen:
+            self.end()
+        self.flush()
+
+
+if __name__ == "__main__":
+    pass
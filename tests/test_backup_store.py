@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""BackupStore.gc: beschädigte Manifeste schützen ihre Objekte.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from backup_store import BackupStore  # noqa: E402
+
+
+class BackupStoreGcTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BackupStore(Path(self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _objekte(self):
+        return {pfad.name for pfad in self.store.objekt_dir.glob('*/*')}
+
+    def test_unreferenzierte_objekte_geloescht(self):
+        alt = self.store.create({'A': {'wert': 1}}, 2)
+        self.store.create({'A': {'wert': 2}}, 2)
+        (self.store.manifest_dir / f"{alt['id']}.json").unlink()
+
+        self.assertEqual(self.store.gc(), 1)
+        self.assertEqual(len(self._objekte()), 1)
+
+    def test_beschaedigtes_manifest_behaelt_objekte(self):
+        alt = self.store.create({'A': {'wert': 1}, 'B': {'wert': 1}}, 3)
+        self.store.create({'A': {'wert': 2}}, 3)
+        vorher = self._objekte()
+        pfad = self.store.manifest_dir / f"{alt['id']}.json"
+        pfad.write_text(pfad.read_text(encoding='utf-8')[:-5], encoding='utf-8')
+
+        self.assertEqual(self.store.gc(), 0)
+        self.assertEqual(self._objekte(), vorher)
+
+    def test_strukturell_beschaedigtes_manifest_behaelt_objekte(self):
+        manifest = self.store.create({'A': {'wert': 1}}, 2)
+        vorher = self._objekte()
+        pfad = self.store.manifest_dir / f"{manifest['id']}.json"
+        pfad.write_text('{"kunden": [["A", "%s", "?"]]}' % manifest['kunden'][0][1], encoding='utf-8')
+
+        self.assertEqual(self.store.gc(), 0)
+        self.assertEqual(self._objekte(), vorher)
+
+
+if __name__ == "__main__":
+    unittest.main()
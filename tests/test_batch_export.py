@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Stapel-Export: parallel wie sequentiell, Fehler in der Zusammenfassung.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import concurrent.futures
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import batch_export  # noqa: E402
+
+
+def _kunden():
+    kunden = {}
+    for k in range(3):
+        kunden[f'Kunde {k}'] = {'id': k + 1, 'projekt': 'P', 'anlagen': [{
+            'id': str(k * 10 + i), 'beschreibung': f'UV{i}', 'felder': 1, 'reihen': 1,
+            'text_inhalt': f'{i + 1} Licht\n{i + 2}-{i + 3} Herd',
+        } for i in range(4)]}
+    kunden['Kunde 1']['anlagen'][0]['text_inhalt'] = '1 A\n1 B'  # doppelt belegt
+    return kunden
+
+
+class BatchExportTest(unittest.TestCase):
+
+    def _exportiere(self, max_workers):
+        with tempfile.TemporaryDirectory() as tmp:
+            ergebnis = batch_export.exportiere_stapel(_kunden(), {}, tmp, max_workers=max_workers)
+            # Dateinamen ohne Zeitstempel (_JJJJMMTT_HHMMSS.endung)
+            ergebnis['dateien'] = sorted(
+                (Path(pfad).parent.name, Path(pfad).name.rsplit('_', 2)[0], Path(pfad).suffix)
+                for pfad in ergebnis['dateien']
+            )
+        return ergebnis
+
+    def test_fehler_bricht_stapel_nicht_ab(self):
+        ergebnis = self._exportiere(1)
+        self.assertEqual(ergebnis['auftraege'], 3 + 12)
+        self.assertEqual(len(ergebnis['dateien']), 14)
+        self.assertEqual([beschreibung for beschreibung, _meldung in ergebnis['fehler']],
+                         ['Kunde 1 / UV0'])
+
+    def test_parallel_wie_sequentiell(self):
+        sequentiell = self._exportiere(1)
+        parallel = self._exportiere(2)
+        self.assertEqual(parallel['prozesse'], 2)
+        self.assertEqual(parallel['dateien'], sequentiell['dateien'])
+        self.assertEqual(parallel['fehler'], sequentiell['fehler'])
+
+    def test_worker_nicht_per_fork(self):
+        kontexte = []
+        original = concurrent.futures.ProcessPoolExecutor
+
+        def pool(*args, **kwargs):
+            kontexte.append(kwargs.get('mp_context'))
+            return original(*args, **kwargs)
+
+        with mock.patch.object(concurrent.futures, 'ProcessPoolExecutor', pool):
+            self._exportiere(2)
+        self.assertEqual(len(kontexte), 1)
+        self.assertIn(kontexte[0].get_start_method(), ('forkserver', 'spawn'))
+
+
+if __name__ == "__main__":
+    unittest.main()
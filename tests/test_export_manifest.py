@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Export-Manifest: unveränderte Exporte übernehmen, force erzeugt neu.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from odf_exporter import exportiere_anlage_ods, exportiere_kunde_odt  # noqa: E402
+
+MARKE = b'unveraendert'
+ANLAGE = {'id': '7', 'beschreibung': 'UV1', 'code': 'C1', 'felder': 1, 'reihen': 1,
+          'text_inhalt': '1 Licht\n2-3 Herd'}
+SETTINGS = {'spalten_breite': 1.75, 'zellen_umrandung': True, 'linebreak_char': ';'}
+
+
+class ExportManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _exportiere(self, anlage=ANLAGE, settings=SETTINGS, **kwargs):
+        return exportiere_anlage_ods(anlage, settings, self.base, 'Kunde', 'Projekt', **kwargs)
+
+    def _markieren(self, pfad):
+        # Markierte Datei: bleibt sie erhalten, wurde nicht neu geschrieben
+        pfad.write_bytes(MARKE)
+
+    def test_unveraendert_uebernommen(self):
+        pfad = self._exportiere()
+        self._markieren(pfad)
+        self.assertEqual(self._exportiere(), pfad)
+        self.assertEqual(pfad.read_bytes(), MARKE)
+
+    def test_force_erzeugt_neu(self):
+        pfad = self._exportiere()
+        self._markieren(pfad)
+        neu = self._exportiere(force=True)
+        self.assertNotEqual(neu.read_bytes(), MARKE)
+        # Danach gilt die neue Datei als aktueller Export
+        self.assertEqual(self._exportiere(), neu)
+
+    def test_geaenderte_eingaben_erzeugen_neu(self):
+        for aenderung in ({'anlage': dict(ANLAGE, text_inhalt='1 Bad')},
+                          {'settings': dict(SETTINGS, spalten_breite=2.0)}):
+            with self.subTest(aenderung=list(aenderung)):
+                pfad = self._exportiere()
+                self._markieren(pfad)
+                self.assertNotEqual(self._exportiere(**aenderung).read_bytes(), MARKE)
+
+    def test_geloeschte_datei_neu_erzeugt(self):
+        pfad = self._exportiere()
+        pfad.unlink()
+        self.assertTrue(self._exportiere().is_file())
+
+    def test_kunde_odt(self):
+        kunde = {'id': 1, 'projekt': 'Projekt', 'anlagen': [ANLAGE]}
+        pfad = exportiere_kunde_odt(kunde, 'Kunde', self.base)
+        self._markieren(pfad)
+        self.assertEqual(exportiere_kunde_odt(kunde, 'Kunde', self.base), pfad)
+        self.assertEqual(pfad.read_bytes(), MARKE)
+        neu = exportiere_kunde_odt(kunde, 'Kunde', self.base, force=True)
+        self.assertNotEqual(neu.read_bytes(), MARKE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""label_audit: NumPy- und Python-Statistik stimmen überein, Kommandozeile
+lässt die Datendatei unverändert.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import label_audit  # noqa: E402
+from constants import COLUMNS_PER_UNIT  # noqa: E402
+
+# Schema-Version 0: wird beim Laden migriert
+ALTE_DATEN = {'kunden': {'Kunde A': {'projekt': 'P', 'anlagen': [{
+    'id': 1, 'beschreibung': 'UV1', 'felder': 1, 'reihen': 1, 'text_inhalt': '1 Licht\n1 Bad',
+}]}}, 'next_kunden_id': 2}
+
+
+def _zufallsanlage(rng, nr):
+    felder, reihen = rng.randint(1, 3), rng.randint(1, 3)
+    max_spalten = felder * reihen * COLUMNS_PER_UNIT
+    zeilen = []
+    for _ in range(rng.randint(0, 12)):
+        start = rng.randint(1, max_spalten + 2)
+        art = rng.random()
+        if art < 0.5:
+            spalten = str(start)
+        elif art < 0.85:
+            spalten = f"{start}-{start + rng.randint(0, COLUMNS_PER_UNIT + 2)}"
+        else:
+            spalten = rng.choice(["x", "", "5-3"])
+        zeilen.append(f"{spalten} Z{rng.randint(1, 3)}" if spalten else "")
+    return {'id': str(nr), 'beschreibung': f'UV{nr}', 'felder': felder, 'reihen': reihen,
+            'text_inhalt': "\n".join(zeilen)}
+
+
+@unittest.skipUnless(label_audit.NUMPY_AVAILABLE, "NumPy nicht installiert")
+class LabelAuditNumpyTest(unittest.TestCase):
+
+    def _vergleiche(self, all_customers):
+        self.assertEqual(label_audit.audit_anlagen(all_customers, use_numpy=True),
+                         label_audit.audit_anlagen(all_customers, use_numpy=False))
+
+    def test_randfaelle(self):
+        max_spalten = COLUMNS_PER_UNIT
+        self._vergleiche({'Kunde': {'anlagen': [
+            {'id': '1', 'felder': 1, 'reihen': 1, 'text_inhalt': ''},
+            {'id': '2', 'felder': 1, 'reihen': 1, 'text_inhalt': f'1-{max_spalten} Voll'},
+            {'id': '3', 'felder': 1, 'reihen': 1, 'text_inhalt': f'1 A\n1-2 B\n{max_spalten} C'},
+            {'id': '4', 'felder': 1, 'reihen': 1, 'text_inhalt': f'{max_spalten + 1} Außerhalb'},
+        ]}})
+
+    def test_zufaellige_anlagen(self):
+        for seed in range(200):
+            rng = random.Random(seed)
+            kunden = {f'Kunde {k}': {'anlagen': [_zufallsanlage(rng, nr) for nr in range(rng.randint(0, 5))]}
+                      for k in range(rng.randint(1, 3))}
+            with self.subTest(seed=seed):
+                self._vergleiche(kunden)
+
+
+class LabelAuditMainTest(unittest.TestCase):
+
+    def test_main_migriert_nur_im_speicher(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            datei = Path(tmp) / 'Verteiler_Daten.json'
+            datei.write_text(json.dumps(ALTE_DATEN), encoding='utf-8')
+            vorher = datei.read_bytes()
+            with contextlib.redirect_stdout(io.StringIO()):
+                label_audit.main([tmp])
+            self.assertEqual(datei.read_bytes(), vorher)
+            self.assertEqual(len(list((Path(tmp) / 'Export').glob('*.csv'))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""IncrementalValidator gegen die vollständige Validierung (validiere_eintraege).
+
+Zufällige Bearbeitungsfolgen (Zeilen einfügen, löschen, ändern, Blöcke
+ersetzen) müssen nach jedem Schritt dasselbe Ergebnis liefern wie eine
+komplette Neuberechnung.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from label_validation import IncrementalValidator  # noqa: E402
+from odf_exporter import validiere_eintraege  # noqa: E402
+
+
+def _zufallszeile(rng):
+    start = rng.randint(1, 14)
+    art = rng.random()
+    if art < 0.5:
+        spalten = str(start)
+    elif art < 0.8:
+        spalten = f"{start}-{start + rng.randint(0, 4)}"
+    elif art < 0.9:
+        spalten = f"{start}+{rng.randint(1, 3)}"
+    else:
+        spalten = rng.choice(("x", "", "5-3", "40"))
+    return f"{spalten} L{rng.randint(1, 3)}" if spalten else ""
+
+
+def _vergleichbar(ergebnis):
+    is_valid, gueltige, fehler_anzahl, belegte, max_spalten, fehler_details = ergebnis
+    return (is_valid,
+            [(list(e['spalten_liste']), e['beschreibung']) for e in gueltige],
+            fehler_anzahl, belegte.intervalle(), max_spalten, fehler_details)
+
+
+class IncrementalValidatorTest(unittest.TestCase):
+
+    def pruefe_folge(self, texte, felder=1, reihen=1):
+        validator = IncrementalValidator()
+        for text in texte:
+            self.assertEqual(
+                _vergleichbar(validator.validate(text, felder, reihen)),
+                _vergleichbar(validiere_eintraege(text, felder, reihen)),
+                msg=f"Folge {texte!r}, bei {text!r}",
+            )
+
+    def test_entfernte_zeilen_belegen_nichts(self):
+        self.pruefe_folge(["2\n2", "1"])
+
+    def test_kein_falsches_bereits_belegt(self):
+        self.pruefe_folge(["5-8 Herd\n5-8 Herd", "1 Licht", "6 Bad\n1 Licht"])
+
+    def test_zufaellige_bearbeitungen(self):
+        for seed in range(3000):
+            rng = random.Random(seed)
+            zeilen = [_zufallszeile(rng) for _ in range(rng.randint(0, 6))]
+            texte = []
+            for _ in range(10):
+                aktion = rng.random()
+                if aktion < 0.25 and zeilen:
+                    del zeilen[rng.randrange(len(zeilen))]
+                elif aktion < 0.5:
+                    zeilen.insert(rng.randint(0, len(zeilen)), _zufallszeile(rng))
+                elif aktion < 0.75 and zeilen:
+                    zeilen[rng.randrange(len(zeilen))] = _zufallszeile(rng)
+                else:
+                    von = rng.randint(0, len(zeilen))
+                    bis = rng.randint(von, len(zeilen))
+                    zeilen[von:bis] = [_zufallszeile(rng) for _ in range(rng.randint(0, 3))]
+                texte.append("\n".join(zeilen))
+            self.pruefe_folge(texte)
+
+
+if __name__ == "__main__":
+    unittest.main()
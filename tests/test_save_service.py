@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SaveService: Teil-Snapshots, Zusammensetzen beim Schreiben, Wiederholung.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from kunden_registry import KundenRegistry  # noqa: E402
+from save_service import SaveService  # noqa: E402
+
+
+class _DataManager:
+    """Merkt sich die Schreibvorgänge; schlägt auf Wunsch fehl."""
+
+    def __init__(self):
+        self.gespeichert = []
+        self.fehler = None
+
+    def save_data(self, all_customers, next_customer_id, dirty_keys=None):
+        if self.fehler:
+            return False, self.fehler
+        self.gespeichert.append((dict(all_customers), next_customer_id, dirty_keys))
+        return True, None
+
+
+class SaveServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.kunden = KundenRegistry(raw={name: {'id': nr, 'projekt': name}
+                                         for nr, name in enumerate(('A', 'B', 'C'), 1)})
+        self.next_id = 4
+        self.gelieferte = []  # je mark_dirty: Namen mit Daten im Snapshot
+        self.dm = _DataManager()
+        # Großes Intervall: geschrieben wird nur über flush()
+        self.service = SaveService(self.dm, self._snapshot, intervall=3600)
+
+    def tearDown(self):
+        self.dm.fehler = None
+        self.service.stop()
+
+    def _snapshot(self, dirty_keys, bekannt):
+        all_customers = self.kunden.snapshot(dirty_keys, bekannt)
+        self.gelieferte.append({name for name, daten in all_customers.items() if daten is not None})
+        return all_customers, self.next_id
+
+    def _aendern(self, name, projekt):
+        self.kunden[name] = {'id': ord(name), 'projekt': projekt}
+        self.service.mark_dirty(name)
+
+    def test_nur_geaenderter_kunde_im_snapshot(self):
+        self._aendern('A', 'A1')
+        self._aendern('B', 'B1')
+        self._aendern('A', 'A2')
+        self.assertEqual(self.gelieferte, [{'A', 'B', 'C'}, {'B'}, {'A'}])
+
+        self.assertEqual(self.service.flush(), (True, None))
+        all_customers, next_id, dirty_keys = self.dm.gespeichert[-1]
+        self.assertEqual({name: daten['projekt'] for name, daten in all_customers.items()},
+                         {'A': 'A2', 'B': 'B1', 'C': 'C'})
+        self.assertEqual(next_id, 4)
+        self.assertEqual(dirty_keys, {'A', 'B'})
+
+    def test_umbenennen_und_loeschen(self):
+        self._aendern('A', 'A1')
+        self.service.flush()
+
+        self.kunden['D'] = self.kunden.pop('B')
+        self.service.mark_dirty('D')
+        del self.kunden['C']
+        self.service.mark_dirty('A')
+        self.service.flush()
+
+        all_customers = self.dm.gespeichert[-1][0]
+        self.assertEqual(list(all_customers), ['A', 'D'])
+        self.assertEqual(all_customers['D']['projekt'], 'B')
+
+    def test_wiederholung_nach_fehlgeschlagenem_speichern(self):
+        self.dm.fehler = 'Platte voll'
+        self._aendern('A', 'A1')
+        self.assertEqual(self.service.flush(), (False, 'Platte voll'))
+        self.assertTrue(self.service.is_dirty())
+        self.assertEqual(self.dm.gespeichert, [])
+
+        self.dm.fehler = None
+        self.next_id = 5
+        self._aendern('B', 'B1')
+        self.assertEqual(self.service.flush(), (True, None))
+        self.assertFalse(self.service.is_dirty())
+
+        all_customers, next_id, dirty_keys = self.dm.gespeichert[-1]
+        self.assertEqual(all_customers['A']['projekt'], 'A1')
+        self.assertEqual(all_customers['B']['projekt'], 'B1')
+        self.assertEqual(next_id, 5)
+        self.assertEqual(dirty_keys, {'A', 'B'})
+
+    def test_wiederholung_ohne_neue_aenderung(self):
+        self.dm.fehler = 'Platte voll'
+        self._aendern('A', 'A1')
+        self.service.flush()
+
+        self.dm.fehler = None
+        self.assertEqual(self.service.flush(), (True, None))
+        all_customers, _next_id, dirty_keys = self.dm.gespeichert[-1]
+        self.assertEqual(all_customers['A']['projekt'], 'A1')
+        self.assertEqual(dirty_keys, {'A'})
+
+
+if __name__ == "__main__":
+    unittest.main()
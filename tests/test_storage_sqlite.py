@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SqliteStorage: Werte, die SQLite nicht unverändert speichert.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from storage_sqlite import SqliteStorage  # noqa: E402
+
+
+class SqliteStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = SqliteStorage(Path(self.tmp.name) / 'daten.db')
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def test_int_jenseits_64_bit(self):
+        daten = {'Kunde': {
+            'id': 2 ** 70,
+            'projekt': 'Projekt',
+            'next_anlage_id': -2 ** 63 - 1,
+            'anlagen': [{
+                'id': 2 ** 63,
+                'felder': 3,
+                'reihen': 7,
+                'text_inhalt': '1 Licht',
+            }],
+        }}
+        self.storage.save(daten, 5)
+        self.assertEqual(self.storage.load(), (daten, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
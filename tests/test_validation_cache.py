@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""ValidierungsCache: gemeinsame Instanz für Editor und Export, Sprachwechsel.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from constants import ts  # noqa: E402
+from label_validation import IncrementalValidator  # noqa: E402
+from odf_exporter import _validiere_anlage, validierungs_cache, validiere_eintraege  # noqa: E402
+from validation_cache import ValidierungsCache  # noqa: E402
+
+
+class ValidierungsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.locale = ts.get_locale()
+
+    def tearDown(self):
+        ts.set_locale(self.locale)
+
+    def test_ergebnis_nach_sprachwechsel_nicht_gemerkt(self):
+        andere = 'en_US' if self.locale != 'en_US' else 'de_DE'
+        cache = ValidierungsCache(validiere_eintraege)
+
+        def berechne(text_inhalt, felder, reihen):
+            ergebnis = validiere_eintraege(text_inhalt, felder, reihen)
+            ts.set_locale(andere)  # Wechsel während der Berechnung
+            return ergebnis
+
+        cache.validiere("x Licht", 1, 1, berechne=berechne)
+        self.assertEqual(len(cache), 0)
+
+        cache.validiere("x Licht", 1, 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.fehlgriffe, 2)
+
+    def test_editor_ergebnis_fuer_export_wiederverwendet(self):
+        validierungs_cache.invalidate()
+        validator = IncrementalValidator()
+        for text in ("2 Herd\n2 Licht", "6 Bad\n1 Licht"):
+            validierungs_cache.validiere(text, 1, 1, berechne=validator.validate)
+
+        fehlgriffe = validierungs_cache.fehlgriffe
+        anlage = {'text_inhalt': "6 Bad\n1 Licht", 'felder': 1, 'reihen': 1}
+        is_valid, gueltige = _validiere_anlage(anlage)
+        self.assertEqual(validierungs_cache.fehlgriffe, fehlgriffe)
+        erwartet = validiere_eintraege(anlage['text_inhalt'], 1, 1)
+        self.assertEqual(is_valid, erwartet[0])
+        erwartet_gueltige = sorted(erwartet[1], key=lambda e: e['spalten_liste'][0])
+        self.assertEqual([e['beschreibung'] for e in gueltige],
+                         [e['beschreibung'] for e in erwartet_gueltige])
+
+
+if __name__ == "__main__":
+    unittest.main()
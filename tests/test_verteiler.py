@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kommandozeile verteiler: Exporte lassen die Datendatei unverändert.
+
+Aufruf:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import verteiler  # noqa: E402
+
+# Schema-Version 0: wird beim Laden migriert
+ALTE_DATEN = {'kunden': {'Kunde A': {'projekt': 'P', 'anlagen': [{
+    'id': 1, 'beschreibung': 'UV1', 'felder': 1, 'reihen': 1, 'text_inhalt': '1 Licht',
+}]}}, 'next_kunden_id': 2}
+
+
+class VerteilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pfad = Path(self.tmp.name)
+        self.datei = self.pfad / 'Verteiler_Daten.json'
+        self.datei.write_text(json.dumps(ALTE_DATEN), encoding='utf-8')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_export_migriert_nur_im_speicher(self):
+        vorher = self.datei.read_bytes()
+        with contextlib.redirect_stdout(io.StringIO()):
+            code = verteiler.main(['export', str(self.pfad), '--format', 'ods', '--prozesse', '1'])
+        self.assertEqual(code, 0)
+        self.assertEqual(self.datei.read_bytes(), vorher)
+        self.assertEqual(len(list((self.pfad / 'Export' / 'Kunde A').glob('*.ods'))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()